@@ -0,0 +1,10 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=wrong-import-position
+# pylint: disable=unused-import
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import in3120
@@ -0,0 +1,38 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import argparse
+from timeit import default_timer as timer
+from context import in3120
+
+
+# Writes a synthetic corpus, and optionally query logs to go with it, for load testing. E.g.:
+#
+#   python generate.py synthetic.json --documents 1000000 --vocabulary 100000 --queries 10000
+#
+# The corpus can then be loaded by InMemoryCorpus like any other corpus, and the query logs are
+# written next to it as, e.g., synthetic.boolean.txt with one query per line.
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic corpus with Zipf-distributed terms, and matching query logs.")
+    parser.add_argument("filename", help="where to write the corpus, the extension decides the format (txt, xml, json, csv or tsv)")
+    parser.add_argument("--documents", type=int, default=10000, help="number of documents, default is 10000")
+    parser.add_argument("--vocabulary", type=int, default=10000, help="number of distinct words, default is 10000")
+    parser.add_argument("--exponent", type=float, default=1.0, help="the Zipf exponent, default is 1.0")
+    parser.add_argument("--length", type=int, default=50, help="mean number of words per document, default is 50")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for the random number generator, default is 1234")
+    parser.add_argument("--queries", type=int, default=0, help="number of queries per query log, default is 0 for no query logs")
+    arguments = parser.parse_args()
+    generator = in3120.CorpusGenerator(arguments.vocabulary, arguments.exponent, arguments.length, arguments.seed)
+    start = timer()
+    generator.write(arguments.filename, arguments.documents)
+    print(f"Wrote {arguments.documents} documents to {arguments.filename} in {timer() - start:.1f} seconds.")
+    if arguments.queries > 0:
+        stem = arguments.filename.rsplit(".", 1)[0]
+        for kind in ("boolean", "n_of_m", "wildcard", "fuzzy"):
+            generator.write_queries(f"{stem}.{kind}.txt", kind, arguments.queries)
+            print(f"Wrote {arguments.queries} {kind} queries to {stem}.{kind}.txt.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=line-too-long
+
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from timeit import default_timer as timer
+from urllib.parse import quote, unquote
+from context import in3120
+
+
+# Define a small helper so that we get a full absolute path to the named file.
+def data_path(filename: str) -> str:
+    here = os.path.dirname(__file__)
+    data = os.path.join(here, "..", "data")
+    full = os.path.abspath(os.path.join(data, filename))
+    return full
+
+
+# The baseline, i.e., how tests/repl.py used to serve queries: One thread per request, with
+# the query evaluated inline. The connection is closed after each response.
+def start_baseline(evaluator):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = unquote(self.path.split("=")[1])
+            start = timer()
+            matches = evaluator(query)
+            end = timer()
+            body = json.dumps({"duration": end - start, "matches": matches}, default=lambda o: o.to_dict()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1], server.shutdown
+
+
+# The asyncio-based query server, with its own event loop in a background thread.
+def start_queryserver(evaluator):
+    server = in3120.QueryServer(evaluator)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    port = []
+
+    def run():
+        asyncio.set_event_loop(loop)
+        port.append(loop.run_until_complete(server.start("127.0.0.1", 0)))
+        started.set()
+        loop.run_forever()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        server.close()
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return port[0], stop
+
+
+# A single simulated client: Issues its queries one after the other, reusing the connection if
+# the server allows it. Records the latency of each query, in seconds.
+async def client(port, queries, latencies):
+    reader, writer = None, None
+    for query in queries:
+        start = timer()
+        if writer is None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET /query?q={quote(query)} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        head = (await reader.readuntil(b"\r\n\r\n")).decode().lower()
+        length = int(head.split("content-length:")[1].split("\r\n")[0])
+        await reader.readexactly(length)
+        if "connection: close" in head or "http/1.0" in head:
+            writer.close()
+            reader, writer = None, None
+        latencies.append(timer() - start)
+    if writer:
+        writer.close()
+
+
+# Lets a number of concurrent clients hammer the server, and reports throughput and latency percentiles.
+async def load(port, queries, concurrency):
+    latencies = []
+    start = timer()
+    await asyncio.gather(*(client(port, queries[i::concurrency], latencies) for i in range(concurrency)))
+    end = timer()
+    latencies.sort()
+    percentile = lambda p: 1000.0 * latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+    return len(latencies) / (end - start), percentile(0.5), percentile(0.99)
+
+
+# Compares the old thread-per-request server against the asyncio-based query server, for an
+# increasing number of concurrent clients. Both serve the same preloaded WAND search engine,
+# with queries sampled from the indexed vocabulary.
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "en.txt"
+    corpus = in3120.InMemoryCorpus(data_path(filename))
+    index = in3120.InMemoryInvertedIndex(corpus, ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+    engine = in3120.WandSearchEngine(corpus, index)
+    ranker = in3120.SimpleRanker()
+    options = {"match_threshold": 0.5, "hit_count": 10, "pruning": "none"}
+
+    def evaluator(query):
+        return list(engine.evaluate(query, options, ranker))
+    terms = list(index.get_indexed_terms())
+    weights = [index.get_document_frequency(term) for term in terms]
+    generator = random.Random(1234)
+    queries = [" ".join(generator.choices(terms, weights, k=generator.randint(1, 6))) for _ in range(1000)]
+    print(f"{'server':>12} {'clients':>8} {'queries/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, start in (("threading", start_baseline), ("queryserver", start_queryserver)):
+        port, stop = start(evaluator)
+        for concurrency in (1, 8, 32):
+            throughput, p50, p99 = asyncio.run(load(port, queries, concurrency))
+            print(f"{name:>12} {concurrency:>8} {throughput:>10.1f} {p50:>8.2f} {p99:>8.2f}")
+        stop()
+
+
+if __name__ == "__main__":
+    main()
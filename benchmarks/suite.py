@@ -0,0 +1,523 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import argparse
+import datetime
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tracemalloc
+from timeit import default_timer as timer
+from typing import Any, Callable, Dict, Iterable, List
+from context import in3120
+
+
+# Define a small helper so that we get a full absolute path to the named file.
+def data_path(filename: str) -> str:
+    here = os.path.dirname(__file__)
+    data = os.path.join(here, "..", "data")
+    full = os.path.abspath(os.path.join(data, filename))
+    return full
+
+
+# The benchmarks we have, keyed by name. Each returns a flat dictionary of named measurements. The suffix of a
+# measurement's name tells how to compare it against a baseline, see DIRECTIONS below.
+BENCHMARKS: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+
+# How measurements compare against a baseline, by name suffix. Throughputs and rates are better when higher, while
+# timings and memory use are better when lower. Anything else is a count, e.g., of matches, nodes or entries, and
+# is deterministic: If a count changes, the results have changed, and that's flagged regardless of the tolerance.
+HIGHER, LOWER, EXACT = "higher", "lower", "exact"
+DIRECTIONS = [("_per_second", HIGHER), ("_hit_rate", HIGHER), ("_seconds", LOWER), ("_ms", LOWER), ("_bytes", LOWER)]
+
+
+def direction(metric: str) -> str:
+    return next((how for suffix, how in DIRECTIONS if metric.endswith(suffix)), EXACT)
+
+
+def benchmark(function: Callable[[], Dict[str, float]]) -> Callable[[], Dict[str, float]]:
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+# The corpora that we index, and the fields that we index for each of them.
+CORPORA = {
+    "en.txt": ["body"],
+    "cran.xml": ["body"],
+    "mesh.txt": ["body"],
+    "names.txt": ["body"],
+    "pantheon.tsv": ["name", "occupation", "countryName"],
+    "imdb.csv": ["title", "description"],
+}
+
+
+# Loaded corpora and built indexes are shared between benchmarks, but never timed as part of anything else.
+_cache: Dict[Any, Any] = {}
+
+
+def cached(key: Any, factory: Callable[[], Any]) -> Any:
+    if key not in _cache:
+        _cache[key] = factory()
+    return _cache[key]
+
+
+def corpus(filename: str) -> in3120.Corpus:
+    return cached(filename, lambda: in3120.InMemoryCorpus(data_path(filename)))
+
+
+def index(filename: str, compressed: bool = False) -> in3120.InvertedIndex:
+    return cached((filename, compressed), lambda: in3120.InMemoryInvertedIndex(corpus(filename), CORPORA[filename], in3120.SimpleNormalizer(), in3120.SimpleTokenizer(), compressed))
+
+
+# Samples a fixed set of queries from the given index' vocabulary, weighted by document frequency so that
+# the queries touch lots of postings. The vocabulary is listed in a deterministic order, so the same seed
+# gives the same queries from run to run.
+def sample_queries(inverted_index: in3120.InvertedIndex, count: int, length: int, seed: int = 1234) -> List[str]:
+    terms = list(inverted_index.get_indexed_terms())
+    weights = [inverted_index.get_document_frequency(term) for term in terms]
+    generator = random.Random(seed + length)
+    return [" ".join(generator.choices(terms, weights, k=length)) for _ in range(count)]
+
+
+# Times the given function once per input, and summarizes the latencies in milliseconds.
+def latencies(function: Callable[[Any], Any], inputs: Iterable[Any], prefix: str) -> Dict[str, float]:
+    timings = []
+    for element in inputs:
+        start = timer()
+        function(element)
+        timings.append(1000.0 * (timer() - start))
+    timings.sort()
+    return {
+        f"{prefix}_mean_ms": statistics.fmean(timings),
+        f"{prefix}_p50_ms": timings[len(timings) // 2],
+        f"{prefix}_p99_ms": timings[min(len(timings) - 1, int(0.99 * len(timings)))],
+    }
+
+
+@benchmark
+def index_build() -> Dict[str, float]:
+    results = {}
+    normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+    for filename, fields in CORPORA.items():
+        documents = corpus(filename)
+        for compressed in (False, True):
+            name = f"{filename}_{'compressed' if compressed else 'uncompressed'}"
+            start = timer()
+            in3120.InMemoryInvertedIndex(documents, fields, normalizer, tokenizer, compressed)
+            results[f"{name}_seconds"] = timer() - start
+            gc.collect()
+            tracemalloc.start()
+            built = in3120.InMemoryInvertedIndex(documents, fields, normalizer, tokenizer, compressed)
+            results[f"{name}_retained_bytes"], results[f"{name}_peak_bytes"] = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del built
+    return results
+
+
+@benchmark
+def posting_decode() -> Dict[str, float]:
+    results = {}
+    for compressed in (False, True):
+        inverted_index = index("en.txt", compressed)
+        terms = list(inverted_index.get_indexed_terms())
+        start = timer()
+        postings = sum(1 for term in terms for _ in inverted_index.get_postings_iterator(term))
+        results[f"{'compressed' if compressed else 'uncompressed'}_postings_per_second"] = postings / (timer() - start)
+    return results
+
+
+@benchmark
+def canonicalization() -> Dict[str, float]:
+    results = {}
+    normalizer = in3120.SimpleNormalizer()
+    for filename in ("en.txt", "da.txt"):
+        buffers = [d["body"] for d in corpus(filename)]
+        megabytes = sum(len(buffer.encode("utf-8")) for buffer in buffers) / (1024 * 1024)
+        start = timer()
+        for buffer in buffers:
+            normalizer.canonicalize(buffer)
+        results[f"{filename}_mb_per_second"] = megabytes / (timer() - start)
+    return results
+
+
+@benchmark
+def tokenization() -> Dict[str, float]:
+    results = {}
+    buffers = [d["body"] for d in corpus("en.txt")]
+    megabytes = sum(len(buffer.encode("utf-8")) for buffer in buffers) / (1024 * 1024)
+    tokenizer = in3120.SimpleTokenizer()
+    for name, function in (("spans", tokenizer.spans), ("strings", tokenizer.strings), ("tokens", tokenizer.tokens), ("offsets", tokenizer.offsets)):
+        start = timer()
+        for buffer in buffers:
+            for _ in function(buffer):
+                pass
+        results[f"{name}_mb_per_second"] = megabytes / (timer() - start)
+    return results
+
+
+@benchmark
+def normalization() -> Dict[str, float]:
+    results = {}
+    tokenizer = in3120.SimpleTokenizer()
+    tokens = [t for d in corpus("en.txt") for t in tokenizer.strings(d["body"])]
+    for name, normalizer in (("porter", in3120.PorterNormalizer()), ("porter_cached", in3120.CachingNormalizer(in3120.PorterNormalizer()))):
+        start = timer()
+        for token in tokens:
+            normalizer.normalize(token)
+        results[f"{name}_tokens_per_second"] = len(tokens) / (timer() - start)
+        if isinstance(normalizer, in3120.CachingNormalizer):
+            results[f"{name}_hit_rate"] = normalizer.get_hit_rate()
+    return results
+
+
+@benchmark
+def term_extraction() -> Dict[str, float]:
+    results = {}
+    buffers = [d["body"] for d in corpus("en.txt")]
+    tokens = sum(1 for buffer in buffers for _ in in3120.SimpleTokenizer().strings(buffer))
+    for name, normalizer in (("simple", in3120.SimpleNormalizer()), ("porter", in3120.PorterNormalizer())):
+        inverted_index = in3120.InMemoryInvertedIndex(in3120.InMemoryCorpus(), ["body"], normalizer, in3120.SimpleTokenizer())
+        start = timer()
+        for buffer in buffers:
+            list(inverted_index.get_terms(buffer))
+        results[f"{name}_tokens_per_second"] = tokens / (timer() - start)
+        start = timer()
+        inverted_index.get_terms_many(buffers)
+        results[f"{name}_bulk_tokens_per_second"] = tokens / (timer() - start)
+    return results
+
+
+@benchmark
+def boolean_queries() -> Dict[str, float]:
+    inverted_index = index("cran.xml")
+    engine = in3120.BooleanSearchEngine(corpus("cran.xml"), inverted_index)
+    generator = random.Random(1234)
+    terms = sorted(inverted_index.get_indexed_terms(), key=lambda t: (-inverted_index.get_document_frequency(t), t))[:500]
+    terms = [term for term in terms if term.isalpha()]
+    shapes = ("AND({0}, {1})", "OR({0}, {1}, {2})", "ANDNOT(OR({0}, {1}), {2})", "AND(OR({0}, {1}), OR({2}, {3}))")
+    queries = [generator.choice(shapes).format(*(f'"{term}"' for term in generator.sample(terms, 4))) for _ in range(200)]
+    return latencies(lambda q: list(engine.evaluate(q, {"optimize": True})), queries, "cran")
+
+
+@benchmark
+def n_of_m_queries() -> Dict[str, float]:
+    documents, inverted_index = corpus("en.txt"), index("en.txt")
+    engines = {
+        "simple": lambda: in3120.SimpleSearchEngine(documents, inverted_index),
+        "daat": lambda: in3120.WandSearchEngine(documents, inverted_index),
+        "daat_bmw": lambda: in3120.WandSearchEngine(documents, inverted_index),
+        "taat": lambda: in3120.TermAtATimeSearchEngine(documents, inverted_index),
+    }
+    options = {"simple": {}, "daat": {"pruning": "none"}, "daat_bmw": {"pruning": "bmw"}, "taat": {}}
+    results = {}
+    for name, factory in engines.items():
+        engine = factory()
+        for length in (1, 4, 16):
+            queries = sample_queries(inverted_index, 50, length)
+            settings = dict(options[name], match_threshold=0.5, hit_count=10)
+            try:
+                results.update(latencies(lambda q: list(engine.evaluate(q, settings, in3120.SimpleRanker())), queries, f"{name}_{length}_terms"))  # pylint: disable=cell-var-from-loop
+            except NotImplementedError:
+                break
+    return results
+
+
+@benchmark
+def edit_queries() -> Dict[str, float]:
+    normalizer, tokenizer = in3120.DummyNormalizer(), in3120.SimpleTokenizer()
+    dictionary = in3120.Trie.from_strings((d["body"] for d in corpus("mesh.txt")), normalizer, tokenizer)
+    engine = in3120.EditSearchEngine(dictionary, normalizer, tokenizer)
+    generator = random.Random(1234)
+    strings = [d["body"] for d in corpus("mesh.txt")]
+    queries = []
+    for string in generator.sample(strings, 100):
+        i = generator.randrange(len(string))
+        queries.append(string[:i] + string[i + 1:])  # One deletion.
+    options = {"hit_count": 5, "upper_bound": 2, "first_n": 0, "scoring": "normalized"}
+    return latencies(lambda q: list(engine.evaluate(q, options)), queries, "mesh")
+
+
+@benchmark
+def trie_lookups() -> Dict[str, float]:
+    results = {}
+    normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+    strings = [d["body"] for d in corpus("mesh.txt")]
+    generator = random.Random(1234)
+    keys = generator.sample(list(in3120.FrozenTrie.from_strings(strings, normalizer, tokenizer).strings()), 1000)
+    prefixes = [key[:generator.randint(1, len(key))] for key in keys]
+    for name, factory in (("trie", in3120.Trie.from_strings), ("frozen", in3120.FrozenTrie.from_strings), ("dawg", in3120.Dawg.from_strings)):
+        gc.collect()
+        start = timer()
+        factory(strings, normalizer, tokenizer)
+        results[f"{name}_build_seconds"] = timer() - start
+        gc.collect()
+        tracemalloc.start()
+        trie = factory(strings, normalizer, tokenizer)
+        results[f"{name}_retained_bytes"], results[f"{name}_peak_bytes"] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if hasattr(trie, "get_node_count"):
+            results[f"{name}_node_count"] = trie.get_node_count()
+        results.update(latencies(lambda k: k in trie, keys, f"{name}_contains"))  # pylint: disable=cell-var-from-loop
+        results.update(latencies(lambda p: list(itertools.islice(trie.consume(p).strings(), 10)), prefixes, f"{name}_prefix"))  # pylint: disable=cell-var-from-loop
+    return results
+
+
+@benchmark
+def string_finding() -> Dict[str, float]:
+    normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+    trie = in3120.FrozenTrie.from_strings((d["body"] for d in corpus("mesh.txt")), normalizer, tokenizer)
+    start = timer()
+    finder = in3120.AhoCorasickFinder(trie, normalizer, tokenizer)
+    results = {"mesh_compile_seconds": timer() - start, "mesh_state_count": finder.get_state_count()}
+    buffer = " ".join(d["body"] for d in corpus("cran.xml"))
+    megabytes = len(buffer.encode("utf-8")) / (1024 * 1024)
+    for name, leftmost_longest in (("all", False), ("leftmost_longest", True)):
+        start = timer()
+        matches = sum(1 for _ in finder.scan(buffer, leftmost_longest))
+        results[f"{name}_mb_per_second"] = megabytes / (timer() - start)
+        results[f"{name}_match_count"] = matches
+    return results
+
+
+@benchmark
+def corpus_scanning() -> Dict[str, float]:
+    results = {}
+    normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+    trie = in3120.FrozenTrie.from_strings((d["body"] for d in corpus("mesh.txt")), normalizer, tokenizer)
+    finder = in3120.AhoCorasickFinder(trie, normalizer, tokenizer)
+    documents = list(corpus("cran.xml")) + list(corpus("en.txt"))
+    megabytes = sum(len(d["body"].encode("utf-8")) for d in documents if d["body"]) / (1024 * 1024)
+    for processes in sorted({1, 2, os.cpu_count() or 1}):
+        with in3120.CorpusScanner(finder, processes) as scanner:
+            start = timer()
+            matches = sum(1 for _ in scanner.scan_corpus(documents, ["body"]))
+            results[f"processes_{processes}_mb_per_second"] = megabytes / (timer() - start)
+            results[f"processes_{processes}_match_count"] = matches
+    return results
+
+
+@benchmark
+def fuzzy_lookups() -> Dict[str, float]:
+    results = {}
+    normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+    generator = random.Random(1234)
+    for filename in ("names.txt", "mesh.txt"):
+        root = in3120.FrozenTrie.from_strings((d["body"] for d in corpus(filename)), normalizer, tokenizer)
+        engine = in3120.EditSearchEngine(root, normalizer, tokenizer)
+        queries = [key for key in generator.sample(list(root.strings()), 50)]
+        queries = [query[:i] + query[i + 1:] for query, i in ((q, generator.randrange(len(q))) for q in queries)]  # One deletion each.
+        for upper_bound in (1, 2, 3):
+            name = f"{filename.split('.')[0]}_k{upper_bound}"
+            results.update(latencies(lambda q: list(in3120.LevenshteinAutomaton(q, upper_bound).intersect(root)), queries, name))  # pylint: disable=cell-var-from-loop
+            options = {"upper_bound": upper_bound, "hit_count": 10, "automaton": True}
+            results.update(latencies(lambda q: list(engine.evaluate(q, options)), queries, f"{name}_top10"))  # pylint: disable=cell-var-from-loop
+    return results
+
+
+@benchmark
+def deletion_lookups() -> Dict[str, float]:
+    results = {}
+    normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+    generator = random.Random(1234)
+    terms = list(index("en.txt").get_indexed_terms())
+    root = in3120.FrozenTrie.from_strings(terms, normalizer, tokenizer)
+    queries = [term for term in generator.sample(terms, 100) if len(term) > 2]
+    queries = [query[:i] + generator.choice("etaoin") + query[i + 1:] for query, i in ((q, generator.randrange(len(q))) for q in queries)]  # One substitution each.
+    results["terms"] = len(terms)
+    for upper_bound, prefix_length in ((1, None), (2, None), (2, 7), (3, 7)):
+        name = f"k{upper_bound}" + (f"_prefix{prefix_length}" if prefix_length else "")
+        gc.collect()
+        tracemalloc.start()
+        start = timer()
+        deletions = in3120.DeletionIndex.from_strings(terms, normalizer, tokenizer, upper_bound, prefix_length)
+        results[f"{name}_build_seconds"] = timer() - start
+        results[f"{name}_retained_bytes"], results[f"{name}_peak_bytes"] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"{name}_entries"] = deletions.get_entry_count()
+        results.update(latencies(lambda q: list(deletions.lookup(q)), queries, name))  # pylint: disable=cell-var-from-loop
+        if not prefix_length:
+            results.update(latencies(lambda q: list(in3120.LevenshteinAutomaton(q, upper_bound).intersect(root)), queries, f"{name}_automaton"))  # pylint: disable=cell-var-from-loop
+        del deletions
+    return results
+
+
+@benchmark
+def edit_table_columns() -> Dict[str, float]:
+    results = {}
+    generator = random.Random(1234)
+    for length in (8, 16, 32, 64):
+        query, candidate = ("".join(generator.choice("abcdefghij") for _ in range(length)) for _ in range(2))
+        table = in3120.BitParallelEditTable(query, candidate, False)
+        start = timer()
+        for _ in range(200):
+            for j in range(1, length + 1):
+                table.update(j)
+        results[f"bit_parallel_{length}_columns_per_second"] = 200 * length / (timer() - start)
+    return results
+
+
+@benchmark
+def wildcard_queries() -> Dict[str, float]:
+    start = timer()
+    expander = in3120.WildcardExpander(d["body"] for d in corpus("mesh.txt"))
+    results = {"mesh_build_seconds": timer() - start}
+    patterns = ["hydro*", "*itis", "car*noma", "*vir*", "neuro*y", "a*b*c", "*cell*", "pro*ase", "*ine", "bio*"]
+    results.update(latencies(lambda p: list(expander.expand(p)), patterns * 10, "mesh"))
+    return results
+
+
+@benchmark
+def synthetic_scaling() -> Dict[str, float]:
+    results = {}
+    generator = in3120.CorpusGenerator(vocabulary_size=20000, document_length=100)
+    queries = list(generator.queries("n_of_m", 100))
+    for size in (1000, 4000, 16000):
+        documents = generator.corpus(size)
+        start = timer()
+        inverted_index = in3120.InMemoryInvertedIndex(documents, ["title", "body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+        results[f"{size}_documents_build_seconds"] = timer() - start
+        engine = in3120.WandSearchEngine(documents, inverted_index)
+        options = {"match_threshold": 0.5, "hit_count": 10, "pruning": "bmw"}
+        results.update(latencies(lambda q: list(engine.evaluate(q, options, in3120.SimpleRanker())), queries, f"{size}_documents"))  # pylint: disable=cell-var-from-loop
+    return results
+
+
+@benchmark
+def suffix_queries() -> Dict[str, float]:
+    start = timer()
+    engine = in3120.SuffixArray(corpus("cran.xml"), ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+    results = {"cran_build_seconds": timer() - start}
+    queries = sample_queries(index("cran.xml"), 100, 1) + sample_queries(index("cran.xml"), 100, 2)
+    results.update(latencies(lambda q: list(engine.evaluate(q, {"hit_count": 5})), queries, "cran"))
+    return results
+
+
+@benchmark
+def similarity_queries() -> Dict[str, float]:
+    start = timer()
+    engine = in3120.SimilaritySearchEngine(corpus("imdb.csv"), ["title", "description"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+    results = {"imdb_build_seconds": timer() - start}
+    queries = sample_queries(index("imdb.csv"), 100, 4)
+    results.update(latencies(lambda q: list(engine.evaluate(q, {"hit_count": 5})), queries, "imdb"))
+    return results
+
+
+@benchmark
+def classifiers() -> Dict[str, float]:
+    normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+    movies, fields = corpus("imdb.csv"), ["title", "description"]
+    training_set = movies.split("genre", lambda v: v.split(","))
+    buffers = [f"{d['title']} {d['description']}" for d in movies][:200]
+    stopwords = in3120.Trie.from_strings((d["body"] for d in corpus("stopwords-en.txt")), normalizer, tokenizer)
+    vectorizer = lambda: in3120.Vectorizer(movies, in3120.DummyInMemoryInvertedIndex(movies, fields, normalizer, tokenizer), stopwords)
+    factories = {
+        "rocchio": (lambda: in3120.RocchioClassifier(training_set, fields, vectorizer()), lambda c, b: list(c.classify(b))),
+        "nearest_neighbor": (lambda: in3120.NearestNeighborClassifier(training_set, fields, normalizer, tokenizer), lambda c, b: list(c.classify(b, {}))),
+        "naive_bayes": (lambda: in3120.NaiveBayesClassifier(training_set, fields, normalizer, tokenizer), lambda c, b: list(c.classify(b))),
+    }
+    results, failure = {}, None
+    for name, (train, classify) in factories.items():
+        try:
+            start = timer()
+            classifier = train()
+            results[f"{name}_train_seconds"] = timer() - start
+            start = timer()
+            for buffer in buffers:
+                classify(classifier, buffer)
+            results[f"{name}_classify_per_second"] = len(buffers) / (timer() - start)
+        except (NotImplementedError, ImportError, OSError) as e:
+            results.pop(f"{name}_train_seconds", None)
+            failure = e
+    if failure and not results:
+        raise failure
+    return results
+
+
+# Runs the named benchmarks, and returns the results together with some information about the environment.
+# Benchmarks that exercise functionality that isn't available, e.g., because it hasn't been implemented yet
+# or because some model or library is missing, are reported as skipped.
+def run(names: Iterable[str]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        },
+        "benchmarks": {},
+        "skipped": {},
+    }
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        try:
+            results["benchmarks"][name] = BENCHMARKS[name]()
+        except (NotImplementedError, ImportError, OSError) as e:
+            results["skipped"][name] = f"{e.__class__.__name__}: {e}"
+    return results
+
+
+# Compares the results against a baseline, and returns a line per measurement that both have in common.
+# Flags measurements that have gotten worse by more than the given tolerance, e.g., 0.1 for 10%, as
+# regressions. Counts that differ at all are flagged as changed.
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    lines = []
+    for name, measurements in results["benchmarks"].items():
+        for metric, value in measurements.items():
+            reference = baseline.get("benchmarks", {}).get(name, {}).get(metric)
+            if reference is None:
+                continue
+            how = direction(metric)
+            if how == EXACT:
+                lines.append(f"{'CHANGED' if value != reference else 'ok':>10}  {name}.{metric}: {reference} -> {value}")
+                continue
+            if not reference or not value:
+                continue
+            ratio = value / reference
+            worse = ratio < 1.0 - tolerance if how == HIGHER else ratio > 1.0 + tolerance
+            lines.append(f"{'REGRESSION' if worse else 'ok':>10}  {name}.{metric}: {reference:.4g} -> {value:.4g} ({ratio - 1.0:+.1%})")
+    return lines
+
+
+# Usage, e.g.: python suite.py --output new.json --baseline old.json. Exits with a non-zero status if any
+# measurement has regressed or any count has changed compared to the baseline.
+#
+# The checked-in baseline.json is a reference run, made on the machine described in its "environment" section.
+# Its counts hold everywhere, but its timings are only comparable on similar hardware. Use --tolerance inf to
+# check the counts only. To compare timings, make a baseline of your own on the same machine by running the
+# suite at the reference revision first, e.g., from a checkout made with git worktree. Timings on a busy or
+# single-core machine easily vary by 10-20% from run to run, so consider a larger tolerance there.
+def main():
+    parser = argparse.ArgumentParser(description="Runs benchmarks over the bundled data, and emits the results as JSON.")
+    parser.add_argument("benchmarks", nargs="*", help=f"which benchmarks to run, default is all of {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", help="where to write the results, default is standard output")
+    parser.add_argument("--baseline", help="previously written results to compare against, e.g., baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative change that counts as a regression, default is 0.1")
+    arguments = parser.parse_args()
+    for name in arguments.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark {name}")
+    results = run(arguments.benchmarks or list(BENCHMARKS))
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if arguments.baseline:
+        with open(arguments.baseline, "r", encoding="utf-8") as file:
+            lines = compare(results, json.load(file), arguments.tolerance)
+        print("\n".join(lines), file=sys.stderr)
+        if any(line.split()[0] in ("REGRESSION", "CHANGED") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,34 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=line-too-long
 
-from .normalizer import Normalizer, SimpleNormalizer, DummyNormalizer, SoundexNormalizer, PorterNormalizer
+from .normalizer import Normalizer, SimpleNormalizer, DummyNormalizer, SoundexNormalizer, PorterNormalizer, CachingNormalizer
 from .tokenizer import Tokenizer, SimpleTokenizer, DummyTokenizer, UnigramTokenizer
 from .shinglegenerator import ShingleGenerator, WordShingleGenerator
 from .sieve import Sieve
+from .tracer import Tracer, NullTracer, NULL_TRACER
 from .document import Document, InMemoryDocument
 from .corpus import Corpus, InMemoryCorpus, AccessLoggedCorpus
+from .corpusgenerator import CorpusGenerator
 from .dictionary import Dictionary, InMemoryDictionary
 from .posting import Posting
 from .postinglist import PostingList, InMemoryPostingList, CompressedInMemoryPostingList
-from .invertedindex import InvertedIndex, InMemoryInvertedIndex, DummyInMemoryInvertedIndex, AccessLoggedInvertedIndex
-from .stringfinder import Trie, StringFinder
+from .invertedindex import InvertedIndex, InMemoryInvertedIndex, StaticScoreOrderedInvertedIndex, ImpactOrderedInvertedIndex, DummyInMemoryInvertedIndex, AccessLoggedInvertedIndex
+from .trie import Trie, FrozenTrie
+from .dawg import Dawg
+from .stringfinder import StringFinder
+from .ahocorasickfinder import AhoCorasickFinder
+from .corpusscanner import CorpusScanner
 from .suffixarray import SuffixArray
 from .postingsmerger import PostingsMerger
 from .simplesearchengine import SimpleSearchEngine
+from .wandsearchengine import WandSearchEngine
+from .termatatimesearchengine import TermAtATimeSearchEngine
+from .impactsearchengine import ImpactSearchEngine
+from .shardedsearchengine import ShardedSearchEngine
+from .queryserver import QueryServer
 from .ranker import Ranker, SimpleRanker
 from .betterranker import BetterRanker
+from .impactranker import ImpactRanker
 from .naivebayesclassifier import NaiveBayesClassifier
 from .variablebytecodec import VariableByteCodec
 from .expressioncomposer import ExpressionComposer
@@ -25,7 +37,9 @@ from .documentpipeline import DocumentPipeline
 from .soundex import Soundex
 from .porterstemmer import PorterStemmer
 from .similaritysearchengine import SimilaritySearchEngine
-from .edittable import EditTable
+from .edittable import EditTable, BitParallelEditTable
+from .levenshteinautomaton import LevenshteinAutomaton
+from .deletionindex import DeletionIndex
 from .editsearchengine import EditSearchEngine
 from .booleansearchengine import BooleanSearchEngine
 from .wildcardexpander import WildcardExpander
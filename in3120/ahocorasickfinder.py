@@ -0,0 +1,205 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-locals
+
+from collections import deque
+from typing import Iterator, Dict, Any, List, Tuple, Optional
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+from .trie import Trie
+
+
+class AhoCorasickFinder:
+    """
+    Given a trie encoding a dictionary of strings, finds the subset of strings in the dictionary that are
+    also present in a given text buffer, just like the StringFinder class. But where a plain trie walk has
+    to keep one walk alive per token in the buffer where a match might begin, this class compiles the
+    dictionary into an Aho-Corasick automaton so that a single left-to-right pass over the tokens in the
+    buffer suffices. See https://en.wikipedia.org/wiki/Aho%E2%80%93Corasick_algorithm.
+
+    The automaton operates on the level of tokens rather than characters, so that matches can only begin and
+    end on token boundaries. Each state corresponds to a sequence of tokens that is a prefix of one or more
+    dictionary entries. When we can't extend the current state with the next token, we follow failure links
+    to successively shorter suffixes of the current token sequence until we can. Dictionary links let us
+    enumerate all the dictionary entries that end at the current token without walking the full chain of
+    failure links. The running time is linear in the number of tokens in the buffer plus the number of
+    matches reported, and independent of the length of the longest dictionary entry.
+
+    The trie and its tokenizer determine whether two adjacent tokens are separated by a space or not, cf. the
+    Tokenizer.join method. We mirror that when compiling the automaton, and annotate every transition below
+    the root with the separator that precedes the token. That way, the scan tokenizer can differ from the one
+    used when building the trie, e.g., to find dictionary entries as arbitrary substrings using a tokenizer
+    that emits single characters.
+
+    Any object that offers the strings2 method of the Trie class can be compiled, e.g., a FrozenTrie or a Dawg.
+    """
+
+    def __init__(self, trie: Trie, normalizer: Normalizer, tokenizer: Tokenizer):
+        self.__normalizer = normalizer  # The same as was used for trie building.
+        self.__tokenizer = tokenizer  # Used for scanning, and for chopping up the strings in the trie.
+        self.__compile(trie)
+
+    def __compile(self, trie: Trie) -> None:
+        """
+        Internal helper method, builds the goto, failure and dictionary links from the strings in the trie.
+        State 0 is the root. The transitions out of the root are keyed by the bare token, while the transitions
+        out of any other state are keyed by the separator and the token concatenated.
+        """
+        goto: List[Dict[str, int]] = [{}]                   # The transitions out of each state.
+        tokens: List[Tuple[str, str]] = [("", "")]          # The (separator, token) pair that leads into each state.
+        depths: List[int] = [0]                             # The number of tokens consumed to get to each state.
+        matches: List[Optional[str]] = [None]               # The dictionary entry for final states, None otherwise.
+        metas: List[Optional[Any]] = [None]                 # The meta data for final states.
+
+        # Build a trie over the tokenized dictionary entries.
+        for string, meta in trie.strings2():
+            state, previous_end = 0, -1
+            for token, (begin, end) in self.__tokenizer.tokens(string):
+                separator = "" if begin == previous_end else " "
+                key = separator + token if state else token
+                previous_end = end
+                child = goto[state].get(key)
+                if child is None:
+                    child = len(goto)
+                    goto[state][key] = child
+                    goto.append({})
+                    tokens.append((separator, token))
+                    depths.append(depths[state] + 1)
+                    matches.append(None)
+                    metas.append(None)
+                state = child
+            if state:
+                matches[state], metas[state] = string, meta
+
+        # Compute failure and dictionary links in breadth-first order, so that the links of shorter
+        # token sequences are in place before we need them.
+        fails = [0] * len(goto)
+        links = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for child in goto[state].values():
+                separator, token = tokens[child]
+                fail = fails[state]
+                while True:
+                    target = goto[fail].get(separator + token if fail else token)
+                    if target is not None or not fail:
+                        break
+                    fail = fails[fail]
+                fails[child] = target or 0
+                links[child] = fails[child] if matches[fails[child]] is not None else links[fails[child]]
+                queue.append(child)
+
+        # Share a single empty dictionary among all leaf states.
+        empty: Dict[str, int] = {}
+        self.__goto = [transitions or empty for transitions in goto]
+        self.__fails = fails
+        self.__links = links
+        self.__depths = depths
+        self.__longest = max(depths)
+        self.__matches = matches
+        self.__metas = metas if any(meta is not None for meta in metas) else None
+
+    def get_state_count(self) -> int:
+        """
+        Returns the number of states in the automaton, including the root.
+        """
+        return len(self.__goto)
+
+    def scan(self, buffer: str, leftmost_longest: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Scans the given buffer and finds all dictionary entries that are also present in the buffer. We only
+        consider matches that begin and end on token boundaries.
+
+        The matches, if any, are yielded back to the client as dictionaries having the keys "match" (str),
+        "surface" (str), "meta" (Optional[Any]), and "span" (Tuple[int, int]), with the same meaning as for the
+        StringFinder class.
+
+        By default, all matches are reported, including overlapping ones. Matches are emitted in the order in
+        which they end in the buffer, and longer matches before shorter ones that end at the same place.
+
+        If leftmost-longest matching is requested, only non-overlapping matches are reported: Among all the
+        matches we pick the one that begins first, breaking ties by picking the longest one, and repeat for
+        the part of the buffer that follows. We can't emit a match as soon as we have seen it, since a longer
+        match that begins at the same place might still be under way. But the depth of the current state tells
+        us where the earliest match that we have yet to see can begin, and everything to the left of that can
+        be resolved.
+
+        The implementation assumes that the buffer has been canonicalized beforehand, so that the emitted spans
+        are correctly interpreted.
+        """
+        goto, fails, links, depths, matches, normalize = self.__goto, self.__fails, self.__links, self.__depths, self.__matches, self.__normalizer.normalize
+
+        # The most recent tokens, enough to cover the longest match that we might still have to emit.
+        window = deque(maxlen=self.__longest + 1)
+
+        # For leftmost-longest matching, the longest match seen so far per token position where it begins, for
+        # positions that we can't resolve yet. Everything before the cursor has been resolved.
+        candidates: Dict[int, Tuple[int, int]] = {}
+        cursor = 0
+
+        state, previous_end, position = 0, -1, -1
+        for position, (token, span) in enumerate(self.__tokenizer.tokens(buffer)):
+            window.append((token, span))
+
+            # Advance, falling back to shorter suffixes of the token sequence when we have to.
+            token = normalize(token)
+            key = token if span[0] == previous_end else " " + token
+            previous_end = span[1]
+            while True:
+                target = goto[state].get(key if state else token)
+                if target is not None or not state:
+                    break
+                state = fails[state]
+            state = target or 0
+
+            # Report or record the matches that end here. These are the current state and the states we can
+            # reach via the dictionary links.
+            final = state if matches[state] is not None else links[state]
+            if not leftmost_longest:
+                while final:
+                    yield self.__match(final, position, position, window)
+                    final = links[final]
+                continue
+            while final:
+                begin = position + 1 - depths[final]
+                if begin >= cursor:
+                    candidates[begin] = (position, final)
+                final = links[final]
+
+            # Resolve everything that no future match can compete with.
+            cursor = yield from self.__resolve(candidates, cursor, position + 1 - depths[state], position, window)
+
+        if leftmost_longest:
+            yield from self.__resolve(candidates, cursor, position + 1, position, window)
+
+    def __resolve(self, candidates: Dict[int, Tuple[int, int]], cursor: int, limit: int, last: int, window: deque) -> Iterator[Dict[str, Any]]:
+        """
+        Internal helper method for leftmost-longest matching. Emits the candidate matches that begin before the
+        given limit, moving the cursor past every emitted match so that overlapping candidates are skipped. The
+        window holds the tokens up to and including the given last position. Returns the new position of the cursor.
+        """
+        while cursor < limit:
+            candidate = candidates.pop(cursor, None)
+            if candidate is None:
+                cursor += 1
+                continue
+            end, final = candidate
+            yield self.__match(final, end, last, window)
+            for skipped in range(cursor + 1, end + 1):
+                candidates.pop(skipped, None)
+            cursor = end + 1
+        return cursor
+
+    def __match(self, final: int, end: int, last: int, window: deque) -> Dict[str, Any]:
+        """
+        Internal helper method, creates a match object for the given final state and the position of the token
+        where the match ends. The window holds the tokens up to and including the given last position.
+        """
+        stop = len(window) - (last - end)
+        tokens = [window[i] for i in range(stop - self.__depths[final], stop)]
+        return {"match": self.__matches[final],
+                "surface": self.__tokenizer.join(tokens),
+                "meta": self.__metas[final] if self.__metas is not None else None,
+                "span": (tokens[0][1][0], tokens[-1][1][1])}
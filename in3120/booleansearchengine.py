@@ -7,18 +7,21 @@
 # pylint: disable=invalid-name
 
 import ast
+from itertools import islice
 from typing import Iterator, Dict, Any
 from .corpus import Corpus
 from .posting import Posting
 from .postingsmerger import PostingsMerger
 from .invertedindex import InvertedIndex
+from .tracer import NULL_TRACER
 
 
 class BooleanSearchEngine:
     """
     A simple search engine that does unranked Boolean retrieval. I.e., a document
     either matches the query expression or it does not. All matching documents are
-    yielded back in document identifier order.
+    yielded back in the order of the inverted index' posting lists, i.e., usually in
+    document identifier order.
 
     A query is an arbitrarily complex Boolean expression composed of the operators
     "AND", "OR", and "ANDNOT". Note that all operators must be uppercased. The
@@ -240,28 +243,48 @@ class BooleanSearchEngine:
         """
         Parses and evaluates the given Boolean query expression.
 
-        The matching documents, if any, are unranked and sorted by their document identifiers.
-        Results are yielded back to the client as dictionaries having the key "document" (Document).
-        If an error occurs the client is yielded back a dictionary having the key "error" (str).
+        The matching documents, if any, are unranked and sorted according to the ordering of the
+        posting lists, usually by their document identifiers. Results are yielded back to the client
+        as dictionaries having the key "document" (Document). If an error occurs the client is yielded
+        back a dictionary having the key "error" (str).
 
         The client can supply a dictionary of options that controls the query evaluation process:
-        Optimizations can be enabled or disabled via the "optimize" (bool) option.
+        Optimizations can be enabled or disabled via the "optimize" (bool) option. The maximum number
+        of documents to return to the client can be controlled via the "hit_count" (int) option. Timings
+        and counters for the various evaluation stages are collected if a "tracer" (Tracer) is supplied.
+
+        Since posting lists are merged lazily, evaluation terminates as soon as "hit_count" matches have
+        been found. If the inverted index orders its posting lists by static quality score, as is the
+        case for StaticScoreOrderedInvertedIndex, the emitted documents are then the top K matches by
+        static score, and the cost of evaluation depends on K rather than on the size of the match set.
         """
+        tracer = options.get("tracer") or NULL_TRACER
         try:
 
             # Parse the expression.
-            tree = ast.parse(expression, mode="eval")
+            with tracer.span("parse"):
+                tree = ast.parse(expression, mode="eval")
 
             # Does the AST look kosher? Decorate the AST in-place with terms.
-            self._validate(tree)
+            with tracer.span("normalize"):
+                self._validate(tree)
 
             # Optimize the AST for more efficient evaluation?
             if options.get("optimize", True):
-                tree = self._optimize(tree)
-
-            # Evaluate and emit matching documents.
-            for posting in self._evaluate(tree):
-                yield {"document": self._corpus[posting.document_id]}
+                with tracer.span("plan"):
+                    tree = self._optimize(tree)
+
+            # Set up the lazy evaluation, i.e., open the posting lists.
+            with tracer.span("fetch"):
+                postings = self._evaluate(tree)
+
+            # Evaluate and emit matching documents. Stop early, if we can. Since posting lists are
+            # merged lazily, the time spent merging them is accounted for as we go.
+            if "hit_count" in options:
+                postings = islice(postings, max(0, int(options["hit_count"])))
+            for posting in tracer.iterate("merge", postings):
+                tracer.count("matches")
+                yield {"document": self._corpus[self._inverted_index.get_document_id(posting.document_id)]}
 
         except SyntaxError as e:
             yield {"error": f"Syntax error, {e.msg}."}
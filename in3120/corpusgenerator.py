@@ -0,0 +1,197 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-many-instance-attributes
+
+import csv
+import itertools
+import json
+import random
+from typing import Any, Dict, Iterator, List
+from .corpus import InMemoryCorpus
+from .document import InMemoryDocument
+
+
+class CorpusGenerator:
+    """
+    Generates synthetic corpora of arbitrary size, for load testing and for seeing how things scale.
+    Text is sampled from a vocabulary of made-up words, so that the word frequencies follow Zipf's
+    law: The r-th most frequent word occurs with a probability proportional to 1 / r^s, where s is
+    the given exponent. See Section 5.1.2 in https://nlp.stanford.edu/IR-book/pdf/irbookonlinereading.pdf.
+    Frequent words are also shorter than rare words, as in natural language. Document lengths vary
+    around the given mean according to a lognormal distribution.
+
+    The generator also produces query logs that fit the generated text, for the various kinds of
+    queries that our search engines support. Query terms are sampled from the same distribution as
+    the text, so that popular terms are frequent in queries, too.
+
+    Everything is deterministic, given the seed. Generating the same number of documents twice yields
+    the same documents, and the first N documents are the same regardless of how many we generate.
+    """
+
+    # The building blocks for the made-up words.
+    __onsets = ["", "b", "d", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "br", "dr", "kl", "pr", "st", "tr"]
+    __nuclei = ["a", "e", "i", "o", "u", "y", "ai", "ei", "ou"]
+    __codas = ["", "", "n", "r", "s", "t", "l", "k"]
+
+    def __init__(self, vocabulary_size: int = 10000, exponent: float = 1.0, document_length: int = 50, seed: int = 1234):
+        assert vocabulary_size > 0
+        assert exponent > 0.0
+        assert document_length > 0
+        self.__exponent = exponent
+        self.__document_length = document_length
+        self.__seed = seed
+        self.__vocabulary = self.__make_vocabulary(vocabulary_size, random.Random(seed))
+        self.__cumulative_weights = list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, vocabulary_size + 1)))
+
+    def __make_vocabulary(self, size: int, generator: random.Random) -> List[str]:
+        """
+        Makes up the given number of unique words, sorted by length so that the most frequent words
+        are the shortest.
+        """
+        words = set()
+        syllables = 1
+        while len(words) < size:
+            before = len(words)
+            for _ in range(4 * size):
+                words.add("".join(generator.choice(self.__onsets) + generator.choice(self.__nuclei) + generator.choice(self.__codas) for _ in range(syllables)))
+                if len(words) == size:
+                    break
+            if len(words) - before < size // 100 + 1:
+                syllables += 1  # We're running out of short words.
+        return sorted(words, key=lambda w: (len(w), w))
+
+    def __sample(self, generator: random.Random, k: int) -> List[str]:
+        """
+        Samples k words from the vocabulary, with replacement, according to Zipf's law.
+        """
+        return generator.choices(self.__vocabulary, cum_weights=self.__cumulative_weights, k=k)
+
+    def get_vocabulary(self) -> List[str]:
+        """
+        Returns the vocabulary, ordered from the most to the least likely word.
+        """
+        return self.__vocabulary
+
+    def get_probability(self, word: str) -> float:
+        """
+        Returns the probability that a sampled word is the given word.
+        """
+        rank = self.__vocabulary.index(word) + 1
+        return (1.0 / (rank ** self.__exponent)) / self.__cumulative_weights[-1]
+
+    def documents(self, count: int) -> Iterator[Dict[str, Any]]:
+        """
+        Generates the given number of documents, as dictionaries having the fields "title" (str),
+        "body" (str) and "static_quality_score" (float).
+        """
+        for document_id in range(count):
+            generator = random.Random(f"{self.__seed}:{document_id}")
+            length = max(1, round(self.__document_length * generator.lognormvariate(-0.125, 0.5)))
+            yield {
+                "title": " ".join(self.__sample(generator, generator.randint(1, 5))),
+                "body": " ".join(self.__sample(generator, length)),
+                "static_quality_score": round(generator.random(), 4),
+            }
+
+    def corpus(self, count: int) -> InMemoryCorpus:
+        """
+        Generates a corpus with the given number of documents, in memory.
+        """
+        corpus = InMemoryCorpus()
+        for document_id, fields in enumerate(self.documents(count)):
+            corpus.add_document(InMemoryDocument(document_id, fields))
+        return corpus
+
+    def write(self, filename: str, count: int) -> None:
+        """
+        Generates the given number of documents, and writes them to the named file in a format that
+        InMemoryCorpus can load. The format is inferred from the extension. Plain text files only get
+        the body field and the title as metadata, and XML files only get the body field.
+        """
+        with open(filename, mode="w", encoding="utf-8", newline="") as file:
+            if filename.endswith(".txt"):
+                for document in self.documents(count):
+                    file.write(f"{document['body']}\t{document['title']}\n")
+            elif filename.endswith(".xml"):
+                file.write("<docs>\n")
+                for document in self.documents(count):
+                    file.write(f"<doc>{document['body']}</doc>\n")
+                file.write("</docs>\n")
+            elif filename.endswith(".json"):
+                for document in self.documents(count):
+                    file.write(json.dumps(document) + "\n")
+            elif filename.endswith(".csv") or filename.endswith(".tsv"):
+                writer = csv.DictWriter(file, ["title", "body", "static_quality_score"], delimiter="," if filename.endswith(".csv") else "\t")
+                writer.writeheader()
+                writer.writerows(self.documents(count))
+            else:
+                raise IOError(f"Filename has unsupported extension: {filename}")
+
+    def queries(self, kind: str, count: int) -> Iterator[str]:
+        """
+        Generates the given number of queries of the given kind. Supported kinds are "boolean" for
+        BooleanSearchEngine, "n_of_m" for SimpleSearchEngine and friends, "wildcard" for WildcardExpander
+        and "fuzzy" for EditSearchEngine. Fuzzy queries are words that are one or two edits away from
+        a word in the vocabulary.
+        """
+        makers = {"boolean": self.__boolean, "n_of_m": self.__n_of_m, "wildcard": self.__wildcard, "fuzzy": self.__fuzzy}
+        assert kind in makers
+        generator = random.Random(f"{self.__seed}:{kind}")
+        for _ in range(count):
+            yield makers[kind](generator)
+
+    def write_queries(self, filename: str, kind: str, count: int) -> None:
+        """
+        Generates the given number of queries of the given kind, and writes them to the named file,
+        one query per line.
+        """
+        with open(filename, mode="w", encoding="utf-8") as file:
+            for query in self.queries(kind, count):
+                file.write(query + "\n")
+
+    def __boolean(self, generator: random.Random, depth: int = 0) -> str:
+        """
+        Makes up a random Boolean expression, with operators nested at most two levels deep.
+        """
+        if depth == 2 or (depth > 0 and generator.random() < 0.5):
+            return " ".join(self.__sample(generator, 1 if generator.random() < 0.8 else 2)).join('""')
+        operator = generator.choice(["AND", "AND", "OR", "ANDNOT"])
+        arity = 2 if operator == "ANDNOT" else generator.randint(2, 4)
+        return f"{operator}({', '.join(self.__boolean(generator, depth + 1) for _ in range(arity))})"
+
+    def __n_of_m(self, generator: random.Random) -> str:
+        """
+        Makes up a free text query. Most queries are short, but some are long.
+        """
+        return " ".join(self.__sample(generator, min(32, max(1, round(generator.expovariate(1 / 3.0))))))
+
+    def __wildcard(self, generator: random.Random) -> str:
+        """
+        Makes up a wildcard pattern, by replacing part of a word with a single wildcard.
+        """
+        word = self.__sample(generator, 1)[0]
+        i = generator.randint(0, len(word) - 1)
+        j = generator.randint(i + 1, len(word))
+        if i == 0 and j == len(word):
+            j -= 1  # Keep at least one character, so that the pattern has a literal part.
+        return word[:i] + "*" + word[j:]
+
+    def __fuzzy(self, generator: random.Random) -> str:
+        """
+        Makes up a misspelling, by making one or two random edits to a word.
+        """
+        word = self.__sample(generator, 1)[0]
+        for _ in range(generator.randint(1, 2)):
+            i = generator.randrange(len(word))
+            edit = generator.choice(["insert", "delete", "substitute", "transpose"] if len(word) > 1 else ["insert", "substitute"])
+            letter = generator.choice("abcdefghijklmnopqrstuvwxyz")
+            if edit == "insert":
+                word = word[:i] + letter + word[i:]
+            elif edit == "delete":
+                word = word[:i] + word[i + 1:]
+            elif edit == "substitute":
+                word = word[:i] + letter + word[i + 1:]
+            else:
+                i = min(i, len(word) - 2)
+                word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        return word
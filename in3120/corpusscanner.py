@@ -0,0 +1,141 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=global-statement
+
+import gc
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .document import Document
+
+
+# The finder that a worker process scans buffers with. Set once per worker process.
+_finder: Optional[Any] = None
+
+
+def _initialize(finder: Any) -> None:
+    """
+    Invoked once in each worker process when it starts.
+    """
+    global _finder
+    _finder = finder
+
+
+def _scan(batch: List[Tuple[int, str, str]], finder: Optional[Any] = None) -> List[Tuple[int, str, List[Dict[str, Any]]]]:
+    """
+    Scans a batch of (document identifier, field name, buffer) triples, and returns the matches per triple. Runs
+    in a worker, unless a finder is explicitly given.
+    """
+    scan = (finder or _finder).scan
+    return [(document_id, field, list(scan(buffer))) for document_id, field, buffer in batch]
+
+
+class CorpusScanner:
+    """
+    Scans all the documents in a corpus for dictionary entries, using a StringFinder or anything else that
+    offers the same scan method, e.g., an AhoCorasickFinder. Useful for tagging, say, MeSH terms in every
+    document of a large corpus.
+
+    Scanning is CPU-bound, so the buffers are farmed out in batches to a pool of worker processes. That way
+    scanning isn't serialized by the GIL. Worker processes are forked when the scanner is created, so that they
+    inherit the compiled finder copy-on-write without any need for pickling. Since the garbage collector writes
+    to the headers of the objects that it tracks, we move everything into the permanent generation while forking
+    so that the pages holding the finder stay shared for longer. Reference counting still causes some pages to
+    be copied, though. On platforms that can't fork, or if only a single process is asked for, the buffers are
+    scanned in the calling process instead.
+
+    The matches are emitted as they are produced, in corpus order. Only a bounded number of batches are in flight
+    at any time, so arbitrarily large corpora can be streamed through the scanner.
+    """
+
+    def __init__(self, finder: Any, processes: Optional[int] = None, batch_size: int = 64):
+        assert batch_size > 0
+        self.__finder = finder
+        self.__batch_size = batch_size
+        self.__executor: Optional[Executor] = None
+        processes = processes or os.cpu_count() or 1
+        self.__window = 2 * processes
+        if processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+            gc.freeze()
+            try:
+                self.__executor = ProcessPoolExecutor(processes, context, _initialize, (finder,))
+                for future in [self.__executor.submit(int) for _ in range(processes)]:
+                    future.result()  # Fork the workers now, while the heap is frozen.
+            finally:
+                gc.unfreeze()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the pool of workers, if any.
+        """
+        if self.__executor:
+            self.__executor.shutdown()
+
+    def scan_corpus(self, corpus: Iterable[Document], fields: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Scans the named fields of all the documents in the given corpus, and yields back all the matches. The
+        matches are dictionaries as emitted by the finder's scan method, with the additional keys "document_id"
+        (int) and "field" (str) to identify where the match was found. Fields that are missing or empty are
+        skipped.
+        """
+        batches = self.__batches(corpus, list(fields))
+        if not self.__executor:
+            for batch in batches:
+                yield from self.__emit(_scan(batch, self.__finder))
+            return
+        pending = deque()
+        for batch in batches:
+            pending.append(self.__executor.submit(_scan, batch))
+            if len(pending) >= self.__window:
+                yield from self.__emit(pending.popleft().result())
+        while pending:
+            yield from self.__emit(pending.popleft().result())
+
+    def __batches(self, corpus: Iterable[Document], fields: List[str]) -> Iterator[List[Tuple[int, str, str]]]:
+        """
+        Internal helper method, groups the non-empty buffers in the given corpus into batches.
+        """
+        batch = []
+        for document in corpus:
+            for field in fields:
+                buffer = document.get_field(field, None)
+                if buffer:
+                    batch.append((document.get_document_id(), field, buffer))
+            if len(batch) >= self.__batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def __emit(results: List[Tuple[int, str, List[Dict[str, Any]]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Internal helper method, annotates the matches in the scanned batch with where they were found.
+        """
+        for document_id, field, matches in results:
+            for match in matches:
+                match["document_id"] = document_id
+                match["field"] = field
+                yield match
+
+    def processor(self, field: str, target: str) -> Callable[[Document], Document]:
+        """
+        Returns a processor that can be used in a DocumentPipeline, e.g., for tagging documents at the same time
+        as they are loaded into an in-memory corpus. The processor scans the named field of the document, and
+        sets the target field to the list of matches found, if any. Documents are processed one at a time as they
+        arrive in the pipeline, so the processor scans in the calling process.
+        """
+        def tag(document: Document) -> Document:
+            buffer = document.get_field(field, None)
+            document[target] = list(self.__finder.scan(buffer)) if buffer else []
+            return document
+        return tag
@@ -0,0 +1,279 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=protected-access
+
+from __future__ import annotations
+from array import array
+from itertools import repeat
+from typing import Dict, List, Any, Tuple, Optional, Iterable, Iterator
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+from .trie import Trie
+
+
+class Dawg:
+    """
+    A directed acyclic word graph (DAWG), i.e., a minimal deterministic finite automaton that accepts
+    a given set of strings. Where a trie only shares common prefixes, a DAWG also shares common suffixes.
+    For a dictionary like MeSH, where thousands of entries end in, e.g., "-itis", "-osis" or "disease",
+    that shrinks the automaton considerably. Offers the same lookup and traversal API as the Trie class,
+    but is immutable once it has been built.
+
+    The automaton is built incrementally from sorted input, as described by Daciuk, Mihov, Watson and
+    Watson in "Incremental Construction of Minimal Acyclic Finite-State Automata". Since the input is
+    sorted, the states that are not on the path of the most recently added string will never change
+    again, and can thus be replaced by an equivalent state that we have already seen, if any. That
+    way the automaton is kept minimal at all times, and we never have to build the full trie.
+
+    Since states are shared, we can't associate meta data with a final state directly. Instead, we
+    annotate each transition with the number of strings in the language that precede the strings
+    reachable via the transition, i.e., we turn the automaton into a finite-state transducer that
+    maps each string to its rank among all the strings. This is a minimal perfect hash function,
+    and the meta data values are stored in a list indexed by rank. See, e.g., Lucca and Nagl, or the
+    FST implementation in Lucene, for similar ideas. A node handle hence consists of a state and the
+    rank accumulated along the path that led to it.
+
+    The states are compiled into flat arrays, similar to the FrozenTrie class. The outgoing transitions
+    of a state form a contiguous range of entries, sorted by transition symbol. For each transition we
+    store the symbol, the target state, and the rank increment.
+    """
+
+    __slots__ = ("__labels", "__first", "__targets", "__increments", "__finals", "__metas", "__state", "__rank")
+
+    def __init__(self, labels: str, first: array, targets: array, increments: array, finals: bytearray, metas: Optional[List[Any]], state: int = 0, rank: int = 0):
+        self.__labels = labels          # The transition symbols, grouped by source state.
+        self.__first = first            # The first transition per state, plus a sentinel at the end.
+        self.__targets = targets        # The target state per transition.
+        self.__increments = increments  # How much taking the transition adds to the rank.
+        self.__finals = finals          # One for final states, zero for other states.
+        self.__metas = metas            # The meta data per string by rank, or None if there's no meta data at all.
+        self.__state = state            # Which state this handle refers to.
+        self.__rank = rank              # The number of strings that precede the strings that go through this handle.
+
+    def __repr__(self):
+        return repr(list(self.strings()))
+
+    def __eq__(self, other: Any):
+        return isinstance(other, Dawg) and self.__labels is other.__labels and self.__state == other.__state and self.__rank == other.__rank
+
+    def __hash__(self):
+        return hash((id(self.__labels), self.__state, self.__rank))
+
+    def __contains__(self, string: str):
+        descendant = self.consume(string)
+        return descendant is not None and descendant.is_final()
+
+    def __iter__(self):
+        return self.strings()
+
+    def __getitem__(self, prefix: str):
+        return self.consume(prefix)
+
+    @staticmethod
+    def from_strings(strings: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer) -> Dawg:
+        """
+        Constructor-like convenience method. Creates and returns a new DAWG containing
+        all the given strings.
+        """
+        return Dawg.from_strings2(zip(strings, repeat(None)), normalizer, tokenizer)
+
+    @staticmethod
+    def from_strings2(strings: Iterable[Tuple[str, Optional[Any]]], normalizer: Normalizer, tokenizer: Tokenizer) -> Dawg:
+        """
+        Constructor-like convenience method. Creates and returns a new DAWG containing
+        all the given (string, meta) pairs. The strings are normalized the same way as for
+        the Trie class.
+
+        Adding the same string more than once is benign, as long as their associated meta data
+        values do not differ.
+        """
+        return Dawg.__compile((Trie._prepare(string, normalizer, tokenizer), meta) for string, meta in strings)
+
+    @staticmethod
+    def from_trie(trie: Trie) -> Dawg:
+        """
+        Constructor-like convenience method. Creates and returns a new DAWG containing the
+        same strings and meta data as the given trie.
+        """
+        return Dawg.__compile(trie.strings2())
+
+    @staticmethod
+    def __compile(pairs: Iterable[Tuple[str, Optional[Any]]]) -> Dawg:
+        """
+        Internal helper method, builds the arrays from the given (string, meta) pairs. The strings
+        are assumed already properly normalized at this point.
+        """
+        strings, metas = Trie._sort(pairs)
+
+        # The states under construction. A state is a final flag and a dictionary of outgoing
+        # transitions. State 0 is the root. The register maps the signature of every state that
+        # we have frozen to the state itself, so that we can detect equivalent states.
+        finals: List[bool] = [False]
+        transitions: List[Dict[str, int]] = [{}]
+        register: Dict[Tuple[bool, Tuple[Tuple[str, int], ...]], int] = {}
+
+        # The path of the most recently added string, as (state, symbol, child) triples. These
+        # are the only states that have not been frozen yet.
+        path: List[Tuple[int, str, int]] = []
+
+        def freeze(length: int) -> None:
+            # Replace or register the unfrozen states below the given depth, bottom up.
+            while len(path) > length:
+                state, symbol, child = path.pop()
+                signature = (finals[child], tuple(transitions[child].items()))
+                equivalent = register.setdefault(signature, child)
+                if equivalent != child:
+                    transitions[state][symbol] = equivalent
+                    finals.pop()
+                    transitions.pop()
+
+        previous = ""
+        for string in strings:
+            common = 0
+            for a, b in zip(previous, string):
+                if a != b:
+                    break
+                common += 1
+            freeze(common)
+            state = path[-1][2] if path else 0
+            for symbol in string[common:]:
+                child = len(finals)
+                finals.append(False)
+                transitions.append({})
+                transitions[state][symbol] = child
+                path.append((state, symbol, child))
+                state = child
+            finals[state] = True
+            previous = string
+        freeze(0)
+
+        # Since the strings are added in sorted order, states that are still under construction are
+        # always the most recently created ones. So discarding an equivalent state pops it off the end,
+        # and the surviving states are numbered consecutively. We need the number of strings reachable
+        # from each state to compute the rank increments. States are registered bottom up, so the
+        # register lists every state after all the states that it has transitions to. The root comes last.
+        counts = [0] * len(finals)
+        for state in (*register.values(), 0):
+            counts[state] = finals[state] + sum(counts[child] for child in transitions[state].values())
+
+        # Flatten. The transitions are already sorted by symbol, since we added them in sorted order.
+        labels, first, targets, increments = [], array("I"), array("I"), array("I")
+        for state, outgoing in enumerate(transitions):
+            first.append(len(labels))
+            increment = int(finals[state])
+            for symbol, child in outgoing.items():
+                labels.append(symbol)
+                targets.append(child)
+                increments.append(increment)
+                increment += counts[child]
+        first.append(len(labels))
+        labels.append("\0")  # Padding, so that we can always peek at the first transition of a state.
+        has_metas = any(meta is not None for meta in metas)
+        return Dawg("".join(labels), first, targets, increments, bytearray(finals), metas if has_metas else None)
+
+    def __handle(self, state: int, rank: int) -> Dawg:
+        """
+        Internal helper method, returns a handle to the given state in the same automaton.
+        """
+        return Dawg(self.__labels, self.__first, self.__targets, self.__increments, self.__finals, self.__metas, state, rank)
+
+    def consume(self, prefix: str) -> Optional[Dawg]:
+        """
+        Consumes the given prefix verbatim and returns the resulting descendant node,
+        if any. Otherwise, None is returned.
+
+        Assumes that the prefix is already normalized.
+        """
+        labels, first, targets, increments = self.__labels, self.__first, self.__targets, self.__increments
+        state, rank = self.__state, self.__rank
+        for symbol in prefix:
+            # Try the first transition before we search among the state's transitions.
+            begin, end = first[state], first[state + 1]
+            if labels[begin] == symbol and begin < end:
+                transition = begin
+            else:
+                transition = labels.find(symbol, begin + 1, end)
+                if transition < 0:
+                    return None
+            state = targets[transition]
+            rank += increments[transition]
+        return self if not prefix else self.__handle(state, rank)
+
+    def child(self, transition: str) -> Optional[Dawg]:
+        """
+        Returns the immediate child node, given a transition symbol. Returns None if the transition
+        symbol is invalid.
+
+        Assumes that the transition symbol is already normalized.
+        """
+        return self.consume(transition) if len(transition) == 1 else None
+
+    def strings(self) -> Iterator[str]:
+        """
+        Yields all strings that are found in or below this node. The returned strings are emitted
+        back in lexicographical order.
+        """
+        return (string for string, _ in self.__traverse(False))
+
+    def strings2(self) -> Iterator[Tuple[str, Optional[Any]]]:
+        """
+        Yields all (string, meta) pairs that are found in or below this node. The returned pairs are
+        emitted back in lexicographical order.
+        """
+        return self.__traverse(self.__metas is not None)
+
+    def __traverse(self, with_metas: bool) -> Iterator[Tuple[str, Optional[Any]]]:
+        """
+        Internal helper method, does a depth-first traversal below this node and yields the (string, meta)
+        pairs found. Looking up the meta data values is optional.
+        """
+        labels, first, targets, increments, finals, metas = self.__labels, self.__first, self.__targets, self.__increments, self.__finals, self.__metas
+        stack = [(self.__state, self.__rank, "")]
+        while stack:
+            state, rank, prefix = stack.pop()
+            if finals[state]:
+                yield (prefix, metas[rank] if with_metas else None)
+            for transition in reversed(range(first[state], first[state + 1])):
+                stack.append((targets[transition], rank + increments[transition], prefix + labels[transition]))
+
+    def transitions(self) -> List[str]:
+        """
+        Returns the set of symbols that are valid outgoing transitions. The returned transitions
+        are emitted back in lexicographical order.
+        """
+        return list(self.__labels[self.__first[self.__state]:self.__first[self.__state + 1]])
+
+    def is_final(self) -> bool:
+        """
+        Returns True iff the current node is a final/terminal state in the automaton.
+        """
+        return self.__finals[self.__state] != 0
+
+    def has_meta(self) -> bool:
+        """
+        Returns True iff the current node is a final/terminal state that has meta data associated
+        with it.
+        """
+        return self.get_meta() is not None
+
+    def get_meta(self) -> Optional[Any]:
+        """
+        Returns the meta data associated with the final/terminal state, or None if no such meta
+        data exists. The meta data is associated with the string that was consumed to get here,
+        not with the state itself.
+        """
+        if self.__metas is None or not self.__finals[self.__state]:
+            return None
+        return self.__metas[self.__rank]
+
+    def get_node_count(self) -> int:
+        """
+        Returns the number of states in the automaton, including the root.
+        """
+        return len(self.__finals)
+
+    def get_edge_count(self) -> int:
+        """
+        Returns the number of transitions in the automaton.
+        """
+        return len(self.__targets)
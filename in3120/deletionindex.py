@@ -0,0 +1,157 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from typing import List, Any, Tuple, Optional, Iterable, Iterator, Set
+from .levenshteinautomaton import LevenshteinAutomaton
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+from .trie import Trie
+
+
+class DeletionIndex:
+    """
+    A precomputed index for approximate string lookups, as popularized by the SymSpell spelling corrector.
+    See https://github.com/wolfgarbe/SymSpell, and "Fast Similarity Search in Large Dictionaries" by Bocek,
+    Hunt and Stiller. Offers an alternative to traversing a trie with the EditSearchEngine class, trading
+    memory for lookup speed.
+
+    If two strings are within edit distance K of each other, deleting at most K symbols from each of them
+    yields the same string: A substitution or a transposition is undone by deleting from both strings,
+    and an insertion by deleting from the other string. At build time we hence generate all strings that
+    can be obtained by deleting up to K symbols from each dictionary string, and map each such variant back
+    to the dictionary strings that it was derived from. At lookup time we do the same for the query string,
+    and a handful of probes into the index give us a small set of candidates. A candidate need not be within
+    the upper bound, so we verify each of them by computing the actual edit distance. The distance is the
+    same optimal string alignment distance as computed by the EditTable class.
+
+    The number of variants grows quickly with the string length. Optionally, only the first N symbols of each
+    string are considered: If two strings are within edit distance K, deleting at most K symbols from each of
+    their prefixes of length N also yields the same string. Shorter prefixes mean a smaller index but more
+    candidates to verify.
+
+    To keep the index compact we don't store the variants themselves, only their hash values. The hash values
+    and the identifiers of the strings they were derived from are kept in a pair of parallel flat arrays,
+    sorted by hash value, so that a probe is a binary search. Hash collisions can only give rise to spurious
+    candidates, and these are weeded out when verifying. Since string hashing is randomized per process, the
+    index is only valid in the process where it was built, and in processes forked from it.
+    """
+
+    def __init__(self, strings: List[str], metas: Optional[List[Any]], keys: array, identifiers: array, upper_bound: int, prefix_length: Optional[int]):
+        self.__strings = strings              # The dictionary strings, sorted.
+        self.__metas = metas                  # The meta data per string, or None if there's no meta data at all.
+        self.__keys = keys                    # The hash values of the variants, sorted.
+        self.__identifiers = identifiers      # Which string each variant was derived from.
+        self.__upper_bound = upper_bound      # The largest edit distance that lookups are supported for.
+        self.__prefix_length = prefix_length  # How many leading symbols the variants are derived from, if limited.
+
+    def __len__(self):
+        return len(self.__strings)
+
+    @staticmethod
+    def from_strings(strings: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, upper_bound: int, prefix_length: Optional[int] = None) -> DeletionIndex:
+        """
+        Constructor-like convenience method. Creates and returns a new index containing all the given
+        strings, e.g., the terms in an inverted index, that supports lookups up to the given edit distance.
+        """
+        return DeletionIndex.from_strings2(zip(strings, repeat(None)), normalizer, tokenizer, upper_bound, prefix_length)
+
+    @staticmethod
+    def from_strings2(strings: Iterable[Tuple[str, Optional[Any]]], normalizer: Normalizer, tokenizer: Tokenizer, upper_bound: int, prefix_length: Optional[int] = None) -> DeletionIndex:
+        """
+        Constructor-like convenience method. Creates and returns a new index containing all the given
+        (string, meta) pairs. The strings are normalized the same way as for the Trie class.
+
+        Adding the same string more than once is benign, as long as their associated meta data
+        values do not differ.
+        """
+        return DeletionIndex.__compile(((Trie._prepare(string, normalizer, tokenizer), meta) for string, meta in strings), upper_bound, prefix_length)
+
+    @staticmethod
+    def from_trie(trie: Trie, upper_bound: int, prefix_length: Optional[int] = None) -> DeletionIndex:
+        """
+        Constructor-like convenience method. Creates and returns a new index containing the same
+        strings and meta data as the given trie.
+        """
+        return DeletionIndex.__compile(trie.strings2(), upper_bound, prefix_length)
+
+    @staticmethod
+    def __compile(pairs: Iterable[Tuple[str, Optional[Any]]], upper_bound: int, prefix_length: Optional[int]) -> DeletionIndex:
+        """
+        Internal helper method, builds the arrays from the given (string, meta) pairs. The strings
+        are assumed already properly normalized at this point.
+        """
+        assert upper_bound >= 0
+        assert prefix_length is None or prefix_length > upper_bound
+        strings, metas = Trie._sort(pairs)
+        entries = sorted((hash(variant), identifier) for identifier, string in enumerate(strings)
+                         for variant in DeletionIndex.__variants(string[:prefix_length], upper_bound))
+        keys, identifiers = array("q", (key for key, _ in entries)), array("I", (identifier for _, identifier in entries))
+        has_metas = any(meta is not None for meta in metas)
+        return DeletionIndex(strings, metas if has_metas else None, keys, identifiers, upper_bound, prefix_length)
+
+    @staticmethod
+    def __variants(string: str, upper_bound: int) -> Set[str]:
+        """
+        Internal helper method, returns all the distinct strings that can be obtained by deleting no more
+        than the given number of symbols from the given string. This includes the string itself.
+        """
+        variants = frontier = {string}
+        for _ in range(upper_bound):
+            frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+            variants = variants | frontier
+        return variants
+
+    def get_upper_bound(self) -> int:
+        """
+        Returns the largest edit distance that lookups are supported for.
+        """
+        return self.__upper_bound
+
+    def get_entry_count(self) -> int:
+        """
+        Returns the number of (variant, string) entries in the index.
+        """
+        return len(self.__keys)
+
+    def get_memory_size(self) -> int:
+        """
+        Returns the approximate number of bytes occupied by the arrays that make up the index proper,
+        i.e., not counting the dictionary strings and their meta data.
+        """
+        return self.__keys.itemsize * len(self.__keys) + self.__identifiers.itemsize * len(self.__identifiers)
+
+    def lookup(self, query: str, upper_bound: Optional[int] = None) -> Iterator[Tuple[int, str, Any]]:
+        """
+        Finds all strings in the index that are within the given edit distance of the query string,
+        and yields back (distance, string, meta) triples. The strings are emitted in lexicographical order.
+        If no upper bound is given, the one that the index was built for is used. A larger upper bound
+        than that is not supported.
+
+        Assumes that the query string is already normalized.
+        """
+        upper_bound = self.__upper_bound if upper_bound is None else upper_bound
+        assert 0 <= upper_bound <= self.__upper_bound
+        strings, metas, keys, identifiers = self.__strings, self.__metas, self.__keys, self.__identifiers
+
+        # Probe the index for all variants of the query string.
+        candidates = set()
+        for variant in self.__variants(query[:self.__prefix_length], upper_bound):
+            key = hash(variant)
+            i = bisect_left(keys, key)
+            while i < len(keys) and keys[i] == key:
+                candidates.add(identifiers[i])
+                i += 1
+
+        # Verify the candidates. The lengths of two strings differ by at most their edit distance, so that
+        # gives us a cheap filter. The automaton memoizes the columns it computes across the candidates.
+        automaton = LevenshteinAutomaton(query, upper_bound)
+        for identifier in sorted(candidates):
+            string = strings[identifier]
+            if abs(len(string) - len(query)) <= upper_bound:
+                distance = automaton.match(string)
+                if distance <= upper_bound:
+                    yield (distance, string, metas[identifier] if metas is not None else None)
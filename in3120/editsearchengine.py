@@ -6,11 +6,15 @@
 # pylint: disable=too-many-arguments
 
 import math
-from typing import Iterator, Dict, Any, Callable
+from itertools import islice
+from typing import Iterator, Dict, Any, Callable, Optional
+from .deletionindex import DeletionIndex
 from .edittable import EditTable
+from .levenshteinautomaton import LevenshteinAutomaton
 from .normalizer import Normalizer
 from .sieve import Sieve
 from .tokenizer import Tokenizer
+from .tracer import NULL_TRACER
 from .trie import Trie
 
 
@@ -25,10 +29,19 @@ class EditSearchEngine:
     above this bound as infinity and non-retrievable), and that this upper bound is relatively small.
     Imposing a small upper bound allows us to prune the search space and make the search reasonably
     efficient.
+
+    Optionally, the query string can instead be compiled into a Levenshtein automaton that is intersected
+    with the trie. That replaces the computation of an edit table column per visited trie node with a
+    memoized automaton transition.
+
+    If the engine is given a DeletionIndex that holds the same strings as the trie, lookups can optionally
+    be served by probing the index instead of traversing the trie. That's typically much faster, at the
+    expense of the memory needed to hold the index.
     """
 
-    def __init__(self, trie: Trie, normalizer: Normalizer, tokenizer: Tokenizer):
+    def __init__(self, trie: Trie, normalizer: Normalizer, tokenizer: Tokenizer, deletions: Optional[DeletionIndex] = None):
         self.__trie = trie
+        self.__deletions = deletions  # Holds the same strings as the trie, if given.
         self.__normalizer = normalizer  # The same as was used for trie building.
         self.__tokenizer = tokenizer  # The same as was used for trie building.
 
@@ -42,12 +55,18 @@ class EditSearchEngine:
 
         The client can supply a dictionary of options that controls the query evaluation process:
         Supported dictionary keys include "upper_bound" (int), "candidate_count" (int),
-        "hit_count" (int), "first_n" (int), and "scoring" (str).
+        "hit_count" (int), "first_n" (int), "scoring" (str), "automaton" (bool),
+        "deletions" (bool), and "tracer" (Tracer). Using the deletion index requires that the engine has one,
+        and that the upper bound doesn't exceed the one that the index was built for.
         """
+        # Collect timings and counters for the various evaluation stages?
+        tracer = options.get("tracer") or NULL_TRACER
+
         # Tokenize and join to be robust to nuances in whitespace.
-        tokens = self.__tokenizer.tokens(self.__normalizer.canonicalize(query))
-        tokens = ((self.__normalizer.normalize(t), _) for t, _ in tokens)
-        query = self.__tokenizer.join(tokens)
+        with tracer.span("normalize"):
+            tokens = self.__tokenizer.tokens(self.__normalizer.canonicalize(query))
+            tokens = ((self.__normalizer.normalize(t), _) for t, _ in tokens)
+            query = self.__tokenizer.join(tokens)
 
         # The upper bound for the edit distance we accept between the query and a match. Assumed to be
         # a small number, e.g., 1, 2, or 3. The lower we set the upper bound, the more we can prune
@@ -96,12 +115,45 @@ class EditSearchEngine:
         def callback(distance: int, candidate: str, meta: Any) -> bool:
             raise NotImplementedError("You need to implement this as part of the obligatory assignment.")
 
-        # Search! We receive and sift results via the callback.
-        if root:
-            self.__dfs(root, 0, table, upper_bound, callback)
+        # Can we probe the deletion index instead of traversing the trie?
+        deletions = self.__deletions if options.get("deletions", False) else None
+        deletions = deletions if deletions and upper_bound <= deletions.get_upper_bound() else None
+
+        # Search! We receive and sift results via the callback, or directly if we use an automaton or
+        # the deletion index.
+        if root and deletions:
+            with tracer.span("search"):
+                # The index doesn't know about the first N characters, so we look up the full query string. A
+                # string that starts with the head can't be closer to the query than its tail is to the tail,
+                # so we don't miss anything. But we have to filter and recompute the distances ourselves.
+                automaton = LevenshteinAutomaton(tail, upper_bound) if first_n else None
+                candidates = deletions.lookup(query, upper_bound)
+                if automaton:
+                    candidates = ((automaton.match(c[first_n:]), c[first_n:], m) for _, c, m in candidates if c.startswith(head))
+                for distance, candidate, meta in islice((c for c in candidates if c[0] <= upper_bound), candidate_count):
+                    sieve.sift(scorer(distance, tail, candidate), (distance, candidate, meta))
+                    tracer.count("candidates")
+        elif root and options.get("automaton", False):
+            with tracer.span("search"):
+                automaton = LevenshteinAutomaton(tail, upper_bound)
+                for distance, candidate, meta in islice(automaton.search(root), candidate_count):
+                    sieve.sift(scorer(distance, tail, candidate), (distance, candidate, meta))
+                    tracer.count("candidates")
+
+                    # Candidates arrive in order of increasing distance. All the scoring functions decrease with
+                    # distance and increase with candidate length, and a candidate can't be longer than the query
+                    # plus its distance. Stop once none of the remaining candidates can make the cut.
+                    threshold = sieve.threshold()
+                    if threshold is not None and scorer(distance, tail, "?" * (len(tail) + distance)) <= threshold:
+                        break
+                tracer.count("automaton_states", automaton.get_state_count())
+        elif root:
+            with tracer.span("search"):
+                self.__dfs(root, 0, table, upper_bound, callback)
 
         # Emit the best matches!
         for score, (distance, match, meta) in sieve.winners():
+            tracer.count("matches")
             yield {"score": score, "distance": distance, "match": head + match, "meta": meta}
 
     def __dfs(self, node: Trie, level: int, table: EditTable,
@@ -1,6 +1,9 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=line-too-long
 
+from typing import List
+
+
 class EditTable:
     """
     A simple representation of an edit table with unit edit costs, using Damerau-Levenshtein
@@ -127,3 +130,157 @@ class EditTable:
         returns candidate[0:j].
         """
         return "".join(self._candidate[0:j])
+
+
+class BitParallelEditTable:
+    """
+    A bit-parallel alternative to the EditTable class, offering the same interface. Computes the same
+    Damerau-Levenshtein distance (optimal string alignment distance) with unit edit costs, but instead
+    of computing one cell at a time, a whole table column is computed using a handful of bitwise and
+    arithmetic operations on bit vectors. See "A Bit-Vector Algorithm for Computing Levenshtein and
+    Damerau Edit Distances" by Hyyrö, which extends the algorithm in "A Fast Bit-Vector Algorithm for
+    Approximate String Matching Based on Dynamic Programming" by Myers.
+
+    Adjacent cells in a column differ by at most one. A column is therefore fully described by the
+    value of its topmost cell, and two bit vectors VP and VN that flag which cells are one larger or
+    one smaller than the cell above. Bit i corresponds to row i + 1, i.e., to query[i]. Python integers
+    serve as bit vectors. For queries of up to 64 symbols these fit in a machine word, but longer queries
+    work too, at a modest additional cost.
+
+    Like the EditTable class, the table keeps all its columns around so that it is usable together with
+    the trie-based algorithm by Shang and Merrett, where we repeatedly backtrack and overwrite the tail
+    end of the candidate string. The per-column state is just a few integers, though.
+    """
+
+    # For every combination of four VP bits and four VN bits, the sum of the encoded deltas and the
+    # smallest partial sum. Lets us locate the minimum value in a column a nibble at a time.
+    _nibbles = [(bin(p).count("1") - bin(n).count("1"), min(0, *(bin(p & ((2 << i) - 1)).count("1") - bin(n & ((2 << i) - 1)).count("1") for i in range(4))))
+                for p in range(16) for n in range(16)]
+
+    def __init__(self, query: str, candidate: str, compute: bool = True):
+
+        # Logical row/column labels. The query string is immutable, but we offer clients the
+        # capability to mutate the candidate string on a per symbol basis.
+        self._query = query
+        self._candidate = list(candidate)
+
+        # Which query positions each symbol occurs in.
+        self._masks = {}
+        for i, symbol in enumerate(query):
+            self._masks[symbol] = self._masks.get(symbol, 0) | (1 << i)
+        self._all = (1 << len(query)) - 1
+        self._top = (1 << (len(query) - 1)) if query else 0
+
+        # The per-column state. Column 0 represents the empty candidate prefix, where every cell is
+        # one larger than the cell above it. We also keep the diagonal zero-delta vector D0 per column,
+        # since it's needed for detecting transpositions in the column that follows.
+        columns = len(self._candidate) + 1
+        self._vp = [self._all] * columns
+        self._vn = [0] * columns
+        self._d0 = [0] * columns
+        self._scores = [len(query)] + [-1] * (columns - 1)
+
+        # Populate the table, unless otherwise instructed.
+        if compute:
+            for j in range(1, columns):
+                self.update(j)
+
+    def __extend(self, extra: int) -> None:
+        """
+        Appends a few extra columns to the table.
+        """
+        self._candidate.extend("?" for _ in range(extra))
+        self._vp.extend(self._all for _ in range(extra))
+        self._vn.extend(0 for _ in range(extra))
+        self._d0.extend(0 for _ in range(extra))
+        self._scores.extend(-1 for _ in range(extra))
+
+    def __column(self, j: int) -> List[int]:
+        """
+        Internal helper method, decodes all the cell values in the given column.
+        """
+        values = [j]
+        vp, vn = self._vp[j], self._vn[j]
+        for i in range(len(self._query)):
+            values.append(values[-1] + ((vp >> i) & 1) - ((vn >> i) & 1))
+        return values
+
+    def stringify(self) -> str:
+        """
+        Creates a readable version of the edit table, for manual inspection and debugging.
+        """
+        width = 3
+        columns = [self.__column(j) for j in range(len(self._candidate) + 1)]
+        header = " " + (" " * width) + "".join(f"{s:>{width}}" for s in self._candidate)
+        row0 = " " + "".join(f"{str(column[0]):>{width}}" for column in columns)
+        rows = [f"{self._query[i]}" + "".join(f"{str(column[i + 1]):>{width}}" for column in columns) for i in range(len(self._query))]
+        return "\n".join(["", header, row0] + rows)
+
+    def update(self, j: int) -> int:
+        """
+        Updates all cells in the given table column, according to the Damerau-Levenshtein rule.
+        Assumes that all columns to the left have already been computed.
+
+        Returns the minimum value in the updated table column, same as for the EditTable class.
+        """
+        masks, everything = self._masks, self._all
+        vp, vn, d0 = self._vp[j - 1], self._vn[j - 1], self._d0[j - 1]
+        x = masks.get(self._candidate[j - 1], 0)
+        y = masks.get(self._candidate[j - 2], 0) if j > 1 else 0
+
+        # Diagonal zero-deltas, due to matches, deletions, or transpositions.
+        d0 = ((((~d0) & x) << 1) & y) | (((x & vp) + vp) ^ vp) | x | vn
+        d0 &= everything
+
+        # Horizontal deltas, which give us the bottom cell. Then shift in the deltas for the
+        # topmost cell, which always increases by one, and derive the vertical deltas.
+        hp = vn | (~(d0 | vp) & everything)
+        hn = vp & d0
+        score = self._scores[j - 1] + (1 if hp & self._top else -1 if hn & self._top else 0)
+        hp = ((hp << 1) | 1) & everything
+        hn = (hn << 1) & everything
+        self._vp[j] = hn | (~(hp | d0) & everything)
+        self._vn[j] = hp & d0
+        self._d0[j] = d0
+        self._scores[j] = score if self._query else j
+
+        # Walk the vertical deltas a nibble at a time to locate the minimum cell value.
+        vp, vn, nibbles = self._vp[j], self._vn[j], self._nibbles
+        running = smallest = j
+        while vp | vn:
+            total, lowest = nibbles[((vp & 15) << 4) | (vn & 15)]
+            smallest = min(smallest, running + lowest)
+            running += total
+            vp >>= 4
+            vn >>= 4
+        return smallest
+
+    def update2(self, j: int, symbol: str) -> int:
+        """
+        Similar to update/1 above, but simultaneously allows you to update a single symbol
+        in the candidate string, namely the symbol corresponding to the given column.
+
+        Additionally, this method appends additional columns to the table if the supplied
+        column index is just out of range.
+        """
+        if j == len(self._candidate) + 1:
+            self.__extend(10)
+        self._candidate[j - 1] = symbol
+        return self.update(j)
+
+    def distance(self, j: int = -1) -> int:
+        """
+        Returns the edit distance between the query string and the candidate string.
+        Defaults to looking at the SE-most cell in the table, i.e., the edit distance
+        between the complete strings.
+
+        Only a prefix of the candidate string can be considered, if specified.
+        """
+        return self._scores[j]
+
+    def prefix(self, j: int) -> str:
+        """
+        Returns the prefix of the candidate string, up to the given index. I.e.,
+        returns candidate[0:j].
+        """
+        return "".join(self._candidate[0:j])
@@ -0,0 +1,55 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from .corpus import Corpus
+from .posting import Posting
+from .betterranker import BetterRanker
+from .invertedindex import ImpactOrderedInvertedIndex
+
+
+class ImpactRanker(BetterRanker):
+    """
+    A ranker that does the same kind of TF-IDF ranking as BetterRanker, combined with a static document
+    score, but where everything that can be computed at indexing time has been. The TF-IDF weights are
+    looked up as precomputed quantized impacts, and the static document scores are looked up in a dense
+    array instead of being fetched from the corpus. Ranking a posting is thus a table lookup plus an add.
+
+    Impacts are integers, and these are summed exactly. Because of the quantization, the resulting scores
+    are approximations of the unquantized TF-IDF scores. Finer quantization gives better approximations.
+
+    Works with the ordinals found in the postings of an ImpactOrderedInvertedIndex, and not with document
+    identifiers.
+    """
+
+    def __init__(self, corpus: Corpus, inverted_index: ImpactOrderedInvertedIndex):
+        super().__init__(corpus, inverted_index)
+        self._impact = 0
+        self._impact_scale = inverted_index.get_impact_scale()
+        self._static_scores = inverted_index.get_static_scores()
+        self._static_scores_list = self._static_scores.tolist()  # Faster to index than the array, one element at a time.
+
+    def reset(self, document_id: int) -> None:
+        self._document_id = document_id
+        self._impact = 0
+
+    def update(self, term: str, multiplicity: int, posting: Posting) -> None:
+        assert self._document_id == posting.document_id
+        self._impact += multiplicity * self._inverted_index.get_impact(term, posting.term_frequency)
+
+    def evaluate(self) -> float:
+        return self._dynamic_score_weight * self._impact_scale * self._impact + self._static_score_weight * self._static_scores_list[self._document_id]
+
+    def score_block(self, terms: Sequence[Tuple[str, int]], document_ids: np.ndarray, term_frequencies: np.ndarray) -> Optional[np.ndarray]:
+        impacts = np.zeros(len(document_ids), dtype=np.int64)
+        for (term, multiplicity), row in zip(terms, term_frequencies):
+            impacts += multiplicity * self._inverted_index.get_impacts(term, row)
+        return self.score_impacts(document_ids, impacts)
+
+    def score_impacts(self, document_ids: np.ndarray, impacts: np.ndarray) -> np.ndarray:
+        """
+        Returns the scores of the given documents, given their summed impacts. Computes the same
+        scores as evaluate would, but for many documents at once.
+        """
+        return self._dynamic_score_weight * self._impact_scale * impacts + self._static_score_weight * self._static_scores[document_ids]
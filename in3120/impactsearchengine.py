@@ -0,0 +1,81 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-locals
+
+from collections import Counter
+from typing import Iterator, Dict, Any
+import numpy as np
+from .sieve import Sieve
+from .corpus import Corpus
+from .impactranker import ImpactRanker
+from .invertedindex import ImpactOrderedInvertedIndex
+
+
+class ImpactSearchEngine:
+    """
+    Realizes the same N-of-M matching as SimpleSearchEngine, with the same options and output, but uses
+    score-at-a-time traversal over impact-ordered posting lists. See "Pruned Query Evaluation Using
+    Pre-Computed Impacts" by Anh and Moffat, and "Anytime Ranking for Impact-Ordered Indexes" by Lin and
+    Trotman.
+
+    The impact-ordered segments of all the query terms' posting lists are processed in order of decreasing
+    contribution, i.e., the segment's impact times the query term's multiplicity. Each segment is added
+    into a dense array of integer accumulators, in one vectorized operation. Since the postings that matter
+    the most are processed first, query evaluation can be stopped early while still producing a good
+    approximation of the final ranking. The "postings_budget" (int) option caps how many postings to process.
+    Without it, evaluation is exhaustive and the results are identical to what document-at-a-time evaluation
+    using an ImpactRanker would yield, also with respect to how ties are resolved.
+    """
+
+    def __init__(self, corpus: Corpus, inverted_index: ImpactOrderedInvertedIndex):
+        self.__corpus = corpus
+        self.__inverted_index = inverted_index
+        self.__size = len(inverted_index.get_static_scores())  # How many accumulators we need.
+
+    def evaluate(self, query: str, options: Dict[str, Any], ranker: ImpactRanker) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluates the given query, doing N-out-of-M ranked retrieval using score-at-a-time traversal.
+
+        The matching documents, if any, are ranked by the supplied ranker, and only the "best" matches are yielded
+        back to the client as dictionaries having the keys "score" (float) and "document" (Document).
+
+        The client can supply a dictionary of options that controls the query evaluation process: The value of
+        N is inferred from the query via the "match_threshold" (float) option, and the maximum number of documents
+        to return to the client is controlled via the "hit_count" (int) option. The maximum number of postings to
+        process is controlled via the "postings_budget" (int) option. The default is no limit.
+        """
+        # Unique query terms, in order of first appearance, and their multiplicities.
+        multiplicities = Counter(self.__inverted_index.get_terms(query))
+        m = len(multiplicities)
+        if m == 0:
+            return
+        n = max(1, min(m, int(options.get("match_threshold", 0.5) * m)))
+        hit_count = max(1, options.get("hit_count", 10))
+        budget = options.get("postings_budget", None)
+
+        # Gather the segments for all query terms, and order them so that we process the largest contributions
+        # first. The sort is stable, so ties are processed in query term order.
+        segments = [(multiplicity * impact, ordinals) for term, multiplicity in multiplicities.items() for impact, ordinals in self.__inverted_index.get_impact_segments(term)]
+        segments.sort(key=lambda s: -s[0])
+
+        # Accumulate, one segment at a time. A document appears in at most one segment per term, so the
+        # fancy-indexed increments are safe. Stop early if we run out of budget.
+        impacts = np.zeros(self.__size, dtype=np.int64)
+        counts = np.zeros(self.__size, dtype=np.int32)
+        remaining = None if budget is None else max(0, budget)
+        for contribution, ordinals in segments:
+            if remaining is not None:
+                if remaining == 0:
+                    break
+                ordinals = ordinals[:remaining]
+                remaining -= len(ordinals)
+            impacts[ordinals] += contribution
+            counts[ordinals] += 1
+
+        # Apply the N-of-M criterion, and emit the best matches!
+        candidates = np.flatnonzero(counts >= n)
+        sieve = Sieve(hit_count)
+        sieve.sift_array(ranker.score_impacts(candidates, impacts[candidates]), candidates)
+        for score, ordinal in sieve.winners():
+            yield {"score": score, "document": self.__corpus[self.__inverted_index.get_document_id(int(ordinal))]}
@@ -4,10 +4,15 @@
 # pylint: disable=unused-argument
 
 import itertools
+import math
+import operator
 from abc import ABC, abstractmethod
+from array import array
 from collections import Counter
 from typing import Iterable, Iterator, List, Tuple, Dict
+import numpy as np
 from .dictionary import InMemoryDictionary
+from .document import Document
 from .normalizer import Normalizer
 from .tokenizer import Tokenizer
 from .corpus import Corpus
@@ -36,6 +41,14 @@ class InvertedIndex(ABC):
         """
         pass
 
+    def get_terms_many(self, buffers: Iterable[str]) -> List[List[str]]:
+        """
+        Bulk version of get_terms/1. Returns, for each of the given buffers, the normalized terms
+        in that buffer. Implementations can override this to process large batches of buffers
+        more efficiently than one by one.
+        """
+        return [list(self.get_terms(buffer)) for buffer in buffers]
+
     @abstractmethod
     def get_indexed_terms(self) -> Iterator[str]:
         """
@@ -69,6 +82,43 @@ class InvertedIndex(ABC):
         """
         return sum(p.term_frequency for p in self.get_postings_iterator(term))
 
+    def get_max_term_frequency(self, term: str) -> int:
+        """
+        Returns the largest term frequency found in the term's posting list. Rankers whose scores
+        increase monotonically with the term frequency can derive an upper bound on how much a term
+        can contribute to a document's score from this. Dynamic pruning schemes such as WAND rely on
+        such upper bounds. Implementations would typically precompute this number at indexing time.
+        """
+        return max((p.term_frequency for p in self.get_postings_iterator(term)), default=0)
+
+    def get_block_maxima(self, term: str) -> List[Tuple[int, int]]:
+        """
+        Divides the term's posting list into fixed-size blocks of consecutive postings, and returns a
+        (<last document identifier>, <largest term frequency>) pair per block. These are finer-grained
+        versions of get_max_term_frequency, and enable Block-Max WAND to prune the search space even
+        further. Implementations would typically precompute these numbers at indexing time.
+        """
+        return PostingList.compute_block_maxima(self.get_postings_iterator(term))
+
+    def get_document_id(self, ordinal: int) -> int:
+        """
+        Maps the document reference held by a posting to an actual document identifier. Most
+        implementations store document identifiers verbatim in the postings, and then this is
+        just the identity function. Implementations that renumber the documents, e.g., so that
+        the posting lists become ordered by some static document score, need to override this.
+        """
+        return ordinal
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Returns counters that tell how much work clients have made the inverted index do so far, e.g.,
+        how many posting lists have been opened and how many postings have been decoded. The counters
+        are cumulative. To find out how much work a single query caused, take the difference between
+        the counters before and after the query has been evaluated. Implementations that don't keep
+        such counters return an empty dictionary.
+        """
+        return {}
+
 
 class InMemoryInvertedIndex(InvertedIndex):
     """
@@ -79,9 +129,17 @@ class InMemoryInvertedIndex(InvertedIndex):
 
     If index compression is enabled, only the posting lists are compressed. Dictionary
     compression is currently not supported.
+
+    Keeps counters that are cheap enough to always be on, see get_statistics: The number of dictionary
+    lookups done to locate posting lists ("lookups"), the number of posting lists opened ("lists"), and
+    the number of postings ("postings") and bytes of compressed posting data ("bytes") decoded. Decoding
+    work is tallied up in bulk when an iterator is exhausted or discarded, and not one posting at a time.
+    Since our posting iterators can't skip ahead, there are no seeks within posting lists to count. For
+    an index on disk, the lookups would be where the seeks happen.
     """
 
     def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: bool = False):
+        self._statistics = Counter({"lookups": 0, "lists": 0, "postings": 0, "bytes": 0})
         self._corpus = corpus
         self._normalizer = normalizer
         self._tokenizer = tokenizer
@@ -110,14 +168,26 @@ class InMemoryInvertedIndex(InvertedIndex):
         ranking. See https://nlp.stanford.edu/IR-book/html/htmledition/positional-indexes-1.html for
         further details.
         """
-        for document in self._corpus:
-            all_terms = itertools.chain.from_iterable(self.get_terms(document.get_field(f, "")) for f in fields)
-            term_frequencies = Counter(all_terms)
-            for term, term_frequency in term_frequencies.items():
-                term_id = self._add_to_dictionary(term)
-                self._append_to_posting_list(term_id, document.document_id, term_frequency, compressed)
+        self._index_documents(self._corpus, (document.document_id for document in self._corpus), fields, compressed)
         self._finalize_index()
 
+    def _index_documents(self, documents: Iterable[Document], ordinals: Iterable[int], fields: Iterable[str], compressed: bool, batch_size: int = 1000) -> None:
+        """
+        Processes the named fields of the given documents, and appends postings for all their terms.
+        The postings refer to each document via the corresponding ordinal, which normally is the
+        document's own identifier. Documents are processed in batches, so that we can use the bulk
+        APIs of the tokenizer and normalizer.
+        """
+        fields = list(fields)
+        documents, ordinals = iter(documents), iter(ordinals)
+        while batch := list(itertools.islice(documents, batch_size)):
+            terms = iter(self.get_terms_many(document.get_field(f, "") for document in batch for f in fields))
+            for ordinal in itertools.islice(ordinals, len(batch)):
+                term_frequencies = Counter(itertools.chain.from_iterable(itertools.islice(terms, len(fields))))
+                for term, term_frequency in term_frequencies.items():
+                    term_id = self._add_to_dictionary(term)
+                    self._append_to_posting_list(term_id, ordinal, term_frequency, compressed)
+
     def _add_to_dictionary(self, term: str) -> int:
         """
         Adds the given term to the dictionary, if it's not already present. If it's already present,
@@ -159,6 +229,13 @@ class InMemoryInvertedIndex(InvertedIndex):
         tokens = self._tokenizer.strings(self._normalizer.canonicalize(buffer))
         return (self._normalizer.normalize(t) for t in tokens)
 
+    def get_terms_many(self, buffers: Iterable[str]) -> List[List[str]]:
+        # Normalize the tokens from all the buffers in one go, and then carve up the result.
+        tokens = self._tokenizer.tokenize_many([self._normalizer.canonicalize(buffer) for buffer in buffers])
+        terms = self._normalizer.normalize_many(list(itertools.chain.from_iterable(tokens)))
+        offsets = itertools.accumulate((len(t) for t in tokens), initial=0)
+        return [terms[begin:end] for begin, end in itertools.pairwise(offsets)]
+
     def get_indexed_terms(self) -> Iterator[str]:
         # Assume that everything fits in memory. This would not be the case in a serious
         # large-scale application, even with compression.
@@ -168,7 +245,28 @@ class InMemoryInvertedIndex(InvertedIndex):
         # Assume that everything fits in memory. This would not be the case in a serious
         # large-scale application, even with compression.
         term_id = self._dictionary.get_term_id(term)
-        return iter([]) if term_id is None else iter(self._posting_lists[term_id])
+        self._statistics["lookups"] += 1
+        if term_id is None:
+            return iter([])
+        self._statistics["lists"] += 1
+        return self.__count(self._posting_lists[term_id])
+
+    def __count(self, posting_list: PostingList) -> Iterator[Posting]:
+        """
+        Wraps an iterator over the given posting list, and updates the counters once the iterator is
+        exhausted or discarded. The delegation is done by the interpreter, which keeps the overhead per
+        posting low. How many postings were consumed is inferred from how many remain.
+        """
+        iterator = iter(posting_list)
+        try:
+            yield from iterator
+        finally:
+            self._statistics["postings"] += len(posting_list) - operator.length_hint(iterator)
+            if isinstance(iterator, CompressedInMemoryPostingList.CompressedInMemoryPostingListIterator):
+                self._statistics["bytes"] += iterator.get_bytes_decoded()
+
+    def get_statistics(self) -> Dict[str, int]:
+        return dict(self._statistics)
 
     def get_document_frequency(self, term: str) -> int:
         # In a serious large-scale application we'd store this number explicitly, e.g., as part of the dictionary.
@@ -177,6 +275,163 @@ class InMemoryInvertedIndex(InvertedIndex):
         term_id = self._dictionary.get_term_id(term)
         return 0 if term_id is None else self._posting_lists[term_id].get_length()
 
+    def get_max_term_frequency(self, term: str) -> int:
+        term_id = self._dictionary.get_term_id(term)
+        return 0 if term_id is None else max(m for _, m in self._posting_lists[term_id].get_block_maxima())
+
+    def get_block_maxima(self, term: str) -> List[Tuple[int, int]]:
+        term_id = self._dictionary.get_term_id(term)
+        return [] if term_id is None else self._posting_lists[term_id].get_block_maxima()
+
+
+class StaticScoreOrderedInvertedIndex(InMemoryInvertedIndex):
+    """
+    An in-memory inverted index where all posting lists are ordered by a static document quality
+    score g(d), highest scores first, instead of by document identifier. See Section 7.1.4 in
+    https://nlp.stanford.edu/IR-book/pdf/irbookonlinereading.pdf.
+
+    The documents are renumbered at indexing time, so that a document's ordinal is its rank when
+    sorted by static score. Ties are resolved by document identifier. Postings refer to documents
+    via these ordinals instead of via their identifiers, so the posting lists are still sorted in
+    increasing order and can be merged the usual way. But since all posting lists share the same
+    global ordering, any merged result is emitted in order of decreasing static score, too. A client
+    that only needs the K best matches can thus stop consuming postings as soon as it has K matches.
+
+    Clients need to use get_document_id to map the ordinals in the postings back to document
+    identifiers.
+
+    The static document score is assumed accessible in a document field named "static_quality_score",
+    same as for BetterRanker. If the field is missing or doesn't have a numeric value, a default value
+    of 0.0 is assumed for the static document score.
+    """
+
+    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: bool = False,
+                 field_name: str = "static_quality_score", default_value: float = 0.0):
+        self._field_name = field_name
+        self._default_value = default_value
+        self._document_ids: List[int] = []  # Maps an ordinal to a document identifier.
+        super().__init__(corpus, fields, normalizer, tokenizer, compressed)
+
+    def _build_index(self, fields: Iterable[str], compressed: bool) -> None:
+        ranked = sorted(self._corpus, key=lambda d: (-self.get_static_score(d), d.document_id))
+        self._document_ids = [document.document_id for document in ranked]
+        self._index_documents(ranked, itertools.count(), fields, compressed)
+        self._finalize_index()
+
+    def get_static_score(self, document: Document) -> float:
+        """
+        Returns the given document's static quality score, or the default value if the
+        document has no such score. Field values are allowed to be strings, since that's
+        what we get when loading CSV or TSV files.
+        """
+        value = document.get_field(self._field_name, None)
+        try:
+            return self._default_value if value in (None, "") else float(value)
+        except (TypeError, ValueError):
+            return self._default_value
+
+    def get_document_id(self, ordinal: int) -> int:
+        return self._document_ids[ordinal]
+
+
+class ImpactOrderedInvertedIndex(StaticScoreOrderedInvertedIndex):
+    """
+    A static-score ordered inverted index that additionally precomputes, at indexing time, everything
+    that BetterRanker-style TF-IDF ranking needs at query time. See Sections 6.2.2 and 7.1.5 in
+    https://nlp.stanford.edu/IR-book/pdf/irbookonlinereading.pdf.
+
+    Each posting's TF-IDF weight (1 + log10(tf)) * log10(N / df) is quantized into a small integer
+    "impact" using a global uniform scale, so that impacts for different terms can be added and the sum
+    multiplied by get_impact_scale to get back (approximately) the sum of the TF-IDF weights. Since the
+    weight only depends on the term frequency and the document frequency, the impacts for a term are
+    kept in a small table indexed by term frequency. Ranking a posting is then a table lookup plus an add.
+    The static document scores are kept in a dense array indexed by ordinal, so that they can be looked
+    up without touching the corpus.
+
+    In addition, each posting list is also available in impact order: As a sequence of segments with
+    decreasing impacts, where each segment holds the ordinals of all documents in which the term has
+    that impact. This enables score-at-a-time query evaluation, where the postings that contribute the
+    most are processed first. See "Pruned Query Evaluation Using Pre-Computed Impacts" by Anh and Moffat.
+    """
+
+    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer, compressed: bool = False,
+                 field_name: str = "static_quality_score", default_value: float = 0.0, bits: int = 8):
+        assert 1 <= bits <= 16
+        self._levels = (1 << bits) - 1  # The largest impact.
+        self._impact_scale = 0.0
+        self._impact_tables: List[array] = []  # Maps a term identifier to a table that maps a term frequency to an impact.
+        self._impact_segments: List[List[Tuple[int, np.ndarray]]] = []  # Maps a term identifier to its impact-ordered posting list.
+        self._static_scores = np.zeros(0, dtype=np.float64)  # Maps an ordinal to a static score.
+        super().__init__(corpus, fields, normalizer, tokenizer, compressed, field_name, default_value)
+
+    def _finalize_index(self):
+        super()._finalize_index()
+        self._static_scores = np.array([self.get_static_score(self._corpus[i]) for i in self._document_ids], dtype=np.float64)
+
+        # Use a single global scale for all terms, so that impacts can be added across terms.
+        size = self._corpus.size()
+
+        def weight(tf: int, df: int) -> float:
+            return (1.0 + math.log10(tf)) * math.log10(size / df)
+
+        def quantize(tf: int, df: int) -> int:
+            return int(weight(tf, df) / self._impact_scale + 0.5) if tf > 0 and self._impact_scale > 0.0 else 0
+
+        terms = [(term_id, posting_list.get_length(), max(m for _, m in posting_list.get_block_maxima())) for term_id, posting_list in enumerate(self._posting_lists)]
+        self._impact_scale = max((weight(tf, df) for _, df, tf in terms), default=0.0) / self._levels
+
+        # Group each posting list by impact. Ordinals stay sorted within each segment.
+        for term_id, df, max_tf in terms:
+            table = array("H", (quantize(tf, df) for tf in range(max_tf + 1)))
+            segments: Dict[int, List[int]] = {}
+            for posting in self._posting_lists[term_id]:
+                segments.setdefault(table[posting.term_frequency], []).append(posting.document_id)
+            self._impact_tables.append(table)
+            self._impact_segments.append([(impact, np.array(segments[impact], dtype=np.int32)) for impact in sorted(segments, reverse=True)])
+
+    def get_impact(self, term: str, term_frequency: int) -> int:
+        """
+        Returns the quantized TF-IDF weight of the given term, for a document where the term
+        occurs the given number of times. Returns 0 if the term is not indexed.
+        """
+        term_id = self._dictionary.get_term_id(term)
+        if term_id is None:
+            return 0
+        table = self._impact_tables[term_id]
+        return table[min(term_frequency, len(table) - 1)]
+
+    def get_impacts(self, term: str, term_frequencies: np.ndarray) -> np.ndarray:
+        """
+        Same as get_impact, but looks up the impacts for a whole array of term frequencies at once.
+        A zero term frequency gives a zero impact.
+        """
+        term_id = self._dictionary.get_term_id(term)
+        if term_id is None:
+            return np.zeros(len(term_frequencies), dtype=np.int64)
+        table = np.frombuffer(self._impact_tables[term_id], dtype=np.uint16)
+        return table[np.minimum(term_frequencies, len(table) - 1)].astype(np.int64)
+
+    def get_impact_scale(self) -> float:
+        """
+        Returns the factor that converts a sum of impacts back into (approximately) a sum of
+        TF-IDF weights.
+        """
+        return self._impact_scale
+
+    def get_impact_segments(self, term: str) -> List[Tuple[int, np.ndarray]]:
+        """
+        Returns the term's posting list in impact order, as a list of (impact, ordinals) pairs sorted
+        by decreasing impact. The ordinals in each segment are sorted in increasing order.
+        """
+        term_id = self._dictionary.get_term_id(term)
+        return [] if term_id is None else self._impact_segments[term_id]
+
+    def get_static_scores(self) -> np.ndarray:
+        """
+        Returns the static quality scores of all documents, as a dense array indexed by ordinal.
+        """
+        return self._static_scores
+
 
 class DummyInMemoryInvertedIndex(InMemoryInvertedIndex):
     """
@@ -205,6 +460,14 @@ class DummyInMemoryInvertedIndex(InMemoryInvertedIndex):
         # No posting lists!
         return iter([])
 
+    def get_max_term_frequency(self, term: str) -> int:
+        # No posting lists!
+        return 0
+
+    def get_block_maxima(self, term: str) -> List[Tuple[int, int]]:
+        # No posting lists!
+        return []
+
     def get_document_frequency(self, term: str) -> int:
         return self._document_frequencies.get(self._dictionary.get_term_id(term), 0)
 
@@ -238,6 +501,9 @@ class AccessLoggedInvertedIndex(InvertedIndex):
     def get_terms(self, buffer: str) -> Iterator[str]:
         return self._wrapped.get_terms(buffer)
 
+    def get_terms_many(self, buffers: Iterable[str]) -> List[List[str]]:
+        return self._wrapped.get_terms_many(buffers)
+
     def get_indexed_terms(self) -> Iterator[str]:
         return self._wrapped.get_indexed_terms()
 
@@ -247,6 +513,18 @@ class AccessLoggedInvertedIndex(InvertedIndex):
     def get_document_frequency(self, term: str) -> int:
         return self._wrapped.get_document_frequency(term)
 
+    def get_max_term_frequency(self, term: str) -> int:
+        return self._wrapped.get_max_term_frequency(term)
+
+    def get_block_maxima(self, term: str) -> List[Tuple[int, int]]:
+        return self._wrapped.get_block_maxima(term)
+
+    def get_document_id(self, ordinal: int) -> int:
+        return self._wrapped.get_document_id(ordinal)
+
+    def get_statistics(self) -> Dict[str, int]:
+        return self._wrapped.get_statistics()
+
     def get_history(self) -> List[Tuple[str, int]]:
         """
         Returns the list of postings that clients have accessed so far.
@@ -0,0 +1,186 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+from typing import Any, Dict, Iterator, List, Tuple
+from .trie import Trie
+
+
+class LevenshteinAutomaton:
+    """
+    A deterministic finite automaton that accepts exactly the strings that are within a given edit distance
+    of a query string. Intersecting the automaton with a trie yields all strings in the trie that are close to
+    the query string, in a single traversal of the trie. See "Fast String Correction with Levenshtein-Automata"
+    by Schulz and Mihov, and https://julesjacobs.com/2015/06/17/disqus-levenshtein-simple-and-fast.html.
+
+    Assumes unit edit costs, and uses the same Damerau-Levenshtein distance as the EditTable class, i.e., the
+    optimal string alignment distance where adjacent transpositions count as a single edit. Transpositions can
+    be disabled, yielding plain Levenshtein distance.
+
+    A state is a column in the edit table, as we would compute it for the candidate prefix consumed so far.
+    Every cell is computed from earlier cells by adding non-negative costs, so a cell that exceeds the upper bound
+    can only give rise to cells that also exceed it. We can thus cap the cells at the upper bound plus one, which
+    then behaves like infinity, and the number of distinct columns that we can encounter becomes finite. To also account for
+    transpositions, the state additionally holds the costs of transposing the last consumed symbol with the next
+    one, for those cells where that is possible. Schulz and Mihov derive a universal automaton that is independent
+    of the query string, but with a small upper bound the query-specific automaton is small too, so we determinize
+    it lazily instead: Every transition is computed the first time it is needed, and memoized. After a few
+    lookups, stepping the automaton is a single dictionary lookup rather than the computation of a full edit
+    table column, independent of the length of the query string.
+
+    The transitions out of a state only depend on which symbols in the query string the consumed symbol equals.
+    All symbols that are not in the query string hence lead to the same state, which we exploit when computing
+    transitions the first time.
+    """
+
+    def __init__(self, query: str, upper_bound: int, transpositions: bool = True):
+        assert upper_bound >= 0
+        self.__query = query
+        self.__upper_bound = upper_bound
+        self.__transpositions = transpositions
+        self.__states: List[Tuple[Tuple[int, ...], Tuple[int, ...]]] = []  # The (column, transposed) pair per state.
+        self.__distances: List[int] = []                                  # The edit distance to the query, per state.
+        self.__bounds: List[int] = []                                     # A lower bound on the distance of any continuation, per state.
+        self.__transitions: List[Dict[str, int]] = []                     # The memoized transitions, per state.
+        self.__ids: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], int] = {}
+        infinity = upper_bound + 1
+        self.__start = self.__intern(tuple(min(i, infinity) for i in range(len(query) + 1)), (infinity,) * (len(query) + 1))
+
+    def __intern(self, column: Tuple[int, ...], transposed: Tuple[int, ...]) -> int:
+        """
+        Internal helper method, returns the identifier of the state with the given column and transposition costs.
+        Creates the state if we haven't seen it before. Returns -1 for the dead state, i.e., if no continuation
+        can bring the distance within the upper bound.
+        """
+        bound = min(min(column), min(transposed))
+        if bound > self.__upper_bound:
+            return -1
+        key = (column, transposed)
+        state = self.__ids.get(key)
+        if state is None:
+            state = self.__ids[key] = len(self.__states)
+            self.__states.append(key)
+            self.__distances.append(column[-1])
+            self.__bounds.append(bound)
+            self.__transitions.append({})
+        return state
+
+    def __compute(self, state: int, symbol: str) -> int:
+        """
+        Internal helper method, computes the state that we transition to from the given state when consuming the
+        given symbol. Applies the Damerau-Levenshtein rule to compute the next column, and caps the cell values.
+        """
+        query, infinity = self.__query, self.__upper_bound + 1
+        column, transposed = self.__states[state]
+        following = [min(column[0] + 1, infinity)]
+        for i in range(1, len(query) + 1):
+            cost = min(column[i - 1] + (query[i - 1] != symbol), column[i] + 1, following[i - 1] + 1)
+            if i > 1 and query[i - 2] == symbol:
+                cost = min(cost, transposed[i])
+            following.append(min(cost, infinity))
+        if self.__transpositions:
+            transposing = tuple(min(column[i - 2] + 1, infinity) if i > 1 and query[i - 1] == symbol else infinity for i in range(len(query) + 1))
+        else:
+            transposing = (infinity,) * (len(query) + 1)
+        return self.__intern(tuple(following), transposing)
+
+    def get_start(self) -> int:
+        """
+        Returns the start state of the automaton.
+        """
+        return self.__start
+
+    def get_state_count(self) -> int:
+        """
+        Returns the number of live states that have been determinized so far.
+        """
+        return len(self.__states)
+
+    def step(self, state: int, symbol: str) -> int:
+        """
+        Returns the state that we transition to from the given state when consuming the given symbol, or -1
+        if we can't possibly end up within the upper bound anymore.
+        """
+        transitions = self.__transitions[state]
+        following = transitions.get(symbol)
+        if following is None:
+            if symbol in self.__query:
+                following = self.__compute(state, symbol)
+            else:
+                # All symbols not in the query string behave the same, and share an entry keyed by the empty string.
+                following = transitions.get("")
+                if following is None:
+                    following = transitions[""] = self.__compute(state, symbol)
+            transitions[symbol] = following
+        return following
+
+    def distance(self, state: int) -> int:
+        """
+        Returns the edit distance between the query string and the strings that lead to the given state. If the
+        edit distance exceeds the upper bound, the upper bound plus one is returned.
+        """
+        return self.__distances[state]
+
+    def match(self, candidate: str) -> int:
+        """
+        Returns the edit distance between the query string and the given candidate string. If the edit distance
+        exceeds the upper bound, the upper bound plus one is returned.
+        """
+        state = self.__start
+        for symbol in candidate:
+            state = self.step(state, symbol)
+            if state < 0:
+                return self.__upper_bound + 1
+        return self.__distances[state]
+
+    def intersect(self, root: Trie) -> Iterator[Tuple[int, str, Any]]:
+        """
+        Traverses the given trie in lockstep with the automaton, and yields back (distance, string, meta) triples
+        for all strings in or below the given node that are within the upper bound of the query string. The
+        strings are emitted in lexicographical order, relative to the given node.
+
+        Works with anything that offers the same traversal API as the Trie class, e.g., a FrozenTrie or a Dawg.
+        The traversal is iterative, so deep tries can't blow the call stack.
+        """
+        upper_bound, distances, step = self.__upper_bound, self.__distances, self.step
+        stack = [(root, self.__start, "")]
+        while stack:
+            node, state, prefix = stack.pop()
+            if distances[state] <= upper_bound and node.is_final():
+                yield (distances[state], prefix, node.get_meta())
+            for symbol in reversed(node.transitions()):
+                following = step(state, symbol)
+                if following >= 0:
+                    stack.append((node.child(symbol), following, prefix + symbol))
+
+    def search(self, root: Trie) -> Iterator[Tuple[int, str, Any]]:
+        """
+        Similar to intersect/1 above, but yields back the (distance, string, meta) triples in order of increasing
+        edit distance. Useful if the client only needs the best few matches, since the traversal can then be
+        abandoned early without having to visit all the parts of the trie that are within the upper bound.
+
+        The traversal is best-first. No string below a node can be closer to the query string than the smallest
+        cell in the node's state, counting transpositions, and this lower bound never decreases as we go deeper.
+        Since the lower bounds are small integers, a bucket queue serves as our priority queue: We have one stack
+        of nodes per lower bound, and drain the stacks in order. Within a stack the traversal is depth-first. A
+        match is emitted once we have drained all the stacks for lower bounds smaller than its distance.
+        """
+        upper_bound, distances, bounds, step = self.__upper_bound, self.__distances, self.__bounds, self.step
+        stacks: List[List[Tuple[Trie, int, str]]] = [[] for _ in range(upper_bound + 1)]
+        matches: List[List[Tuple[int, str, Any]]] = [[] for _ in range(upper_bound + 1)]
+        if self.__start >= 0:
+            stacks[bounds[self.__start]].append((root, self.__start, ""))
+        for level in range(upper_bound + 1):
+            yield from matches[level]
+            stack = stacks[level]
+            while stack:
+                node, state, prefix = stack.pop()
+                distance = distances[state]
+                if distance <= upper_bound and node.is_final():
+                    if distance == level:
+                        yield (distance, prefix, node.get_meta())
+                    else:
+                        matches[distance].append((distance, prefix, node.get_meta()))
+                for symbol in reversed(node.transitions()):
+                    following = step(state, symbol)
+                    if following >= 0:
+                        stacks[bounds[following]].append((node.child(symbol), following, prefix + symbol))
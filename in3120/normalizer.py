@@ -2,8 +2,10 @@
 # pylint: disable=line-too-long
 # pylint: disable=unnecessary-pass
 
+import functools
 import unicodedata
 from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
 from .soundex import Soundex
 from .porterstemmer import PorterStemmer
 
@@ -34,6 +36,14 @@ class Normalizer(ABC):
         #
         # Unicode canonicalization is especially important for some languages. E.g., for Chinese,
         # Japanese and Korean we'd want to properly support both full-width and half-width forms.
+        #
+        # Pure ASCII text is invariant under all the normalization forms, and the vast majority of
+        # the text in our English corpora is pure ASCII. Whether a string is pure ASCII is known up
+        # front without having to scan it, so we can skip the normalization machinery altogether.
+        # For other text, the normalization machinery does a quick check and hands back the buffer
+        # itself without copying it if the buffer is already normalized.
+        if buffer.isascii():
+            return buffer
         return unicodedata.normalize("NFKC", buffer)
 
     @abstractmethod
@@ -46,6 +56,14 @@ class Normalizer(ABC):
         """
         pass
 
+    def normalize_many(self, tokens: Iterable[str]) -> List[str]:
+        """
+        Bulk version of normalize/1. Normalizes all the given tokens, e.g., all the tokens in a
+        batch of documents, in one go. Subclasses can override this if they can do better than
+        normalizing the tokens one by one.
+        """
+        return list(map(self.normalize, tokens))
+
 
 class SimpleNormalizer(Normalizer):
     """
@@ -59,6 +77,9 @@ class SimpleNormalizer(Normalizer):
     def normalize(self, token: str) -> str:
         return token.casefold()
 
+    def normalize_many(self, tokens: Iterable[str]) -> List[str]:
+        return [token.casefold() for token in tokens]
+
 
 class DummyNormalizer(Normalizer):
     """
@@ -76,6 +97,9 @@ class DummyNormalizer(Normalizer):
     def normalize(self, token: str) -> str:
         return token
 
+    def normalize_many(self, tokens: Iterable[str]) -> List[str]:
+        return list(tokens)
+
 
 class SoundexNormalizer(Normalizer):
     """
@@ -99,3 +123,51 @@ class PorterNormalizer(Normalizer):
 
     def normalize(self, token: str) -> str:
         return self._stemmer.stem(token)
+
+
+class CachingNormalizer(Normalizer):
+    """
+    Wraps another normalizer, and memoizes the token normalizations. Any normalizer can opt into this
+    by being wrapped. Natural language text is Zipfian, so a small number of distinct tokens make up most
+    of the tokens we see. With an expensive normalizer like the PorterNormalizer, the cost of normalizing
+    a large buffer hence collapses to the cost of normalizing its unique tokens.
+
+    The cache is bounded, and the least recently used token is evicted when it's full. A capacity of
+    None makes the cache unbounded. Canonicalization of buffers is passed straight through, as buffers
+    are rarely repeated.
+    """
+
+    def __init__(self, wrapped: Normalizer, capacity: Optional[int] = 65536):
+        assert capacity is None or capacity > 0
+        self.__wrapped = wrapped
+        self.__normalize = functools.lru_cache(maxsize=capacity)(wrapped.normalize)
+
+    def canonicalize(self, buffer: str) -> str:
+        return self.__wrapped.canonicalize(buffer)
+
+    def normalize(self, token: str) -> str:
+        return self.__normalize(token)
+
+    def normalize_many(self, tokens: Iterable[str]) -> List[str]:
+        return list(map(self.__normalize, tokens))
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Returns the number of cache hits and misses so far, and the current and maximum number of
+        cached tokens. The maximum is zero if the cache is unbounded.
+        """
+        info = self.__normalize.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "capacity": info.maxsize or 0}
+
+    def get_hit_rate(self) -> float:
+        """
+        Returns the fraction of normalizations that were served from the cache.
+        """
+        info = self.__normalize.cache_info()
+        return info.hits / max(1, info.hits + info.misses)
+
+    def clear(self) -> None:
+        """
+        Empties the cache, and resets the statistics.
+        """
+        self.__normalize.cache_clear()
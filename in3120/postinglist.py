@@ -2,7 +2,8 @@
 # pylint: disable=unnecessary-pass
 
 from abc import ABC, abstractmethod
-from typing import Iterator, List
+from array import array
+from typing import Iterable, Iterator, List, MutableSequence, Tuple
 from .posting import Posting
 from .variablebytecodec import VariableByteCodec
 
@@ -12,6 +13,9 @@ class PostingList(ABC):
     Abstract base class for a simple posting list.
     """
 
+    # The number of consecutive postings that get_block_maxima summarizes per block.
+    _block_size = 64
+
     def __iter__(self):
         return self.get_iterator()
 
@@ -51,6 +55,38 @@ class PostingList(ABC):
         """
         pass
 
+    def get_block_maxima(self) -> List[Tuple[int, int]]:
+        """
+        Divides the posting list into fixed-size blocks of consecutive postings, and returns a
+        (<last document identifier>, <largest term frequency>) pair per block. Useful for
+        computing score upper bounds, e.g., for Block-Max WAND. Implementations would
+        typically maintain these numbers as postings get appended.
+        """
+        return self.compute_block_maxima(self.get_iterator())
+
+    @staticmethod
+    def compute_block_maxima(postings: Iterable[Posting]) -> List[Tuple[int, int]]:
+        """
+        Computes the block maxima for the given sequence of postings. See get_block_maxima.
+        """
+        blocks = []
+        for i, posting in enumerate(postings):
+            PostingList._update_block_maxima(i, posting, blocks)
+        return list(zip(blocks[0::2], blocks[1::2]))
+
+    @staticmethod
+    def _update_block_maxima(position: int, posting: Posting, blocks: MutableSequence[int]) -> None:
+        """
+        Updates the block maxima, given a posting that is at the given position in the posting list.
+        The block maxima are kept as a flattened sequence of (<last document identifier>, <largest
+        term frequency>) pairs.
+        """
+        if position % PostingList._block_size == 0:
+            blocks.extend((posting.document_id, posting.term_frequency))
+        else:
+            blocks[-2] = posting.document_id
+            blocks[-1] = max(blocks[-1], posting.term_frequency)
+
 
 class InMemoryPostingList(PostingList):
     """
@@ -65,6 +101,7 @@ class InMemoryPostingList(PostingList):
 
     def __init__(self):
         self.__postings: List[Posting] = []
+        self.__blocks = array("L")  # The flattened (<last document identifier>, <largest term frequency>) pairs.
 
     def get_length(self) -> int:
         return len(self.__postings)
@@ -74,11 +111,15 @@ class InMemoryPostingList(PostingList):
 
     def append_posting(self, posting: Posting) -> None:
         assert len(self.__postings) == 0 or self.__postings[-1].document_id < posting.document_id
+        self._update_block_maxima(len(self.__postings), posting, self.__blocks)
         self.__postings.append(posting)
 
     def finalize_postings(self) -> None:
         pass
 
+    def get_block_maxima(self) -> List[Tuple[int, int]]:
+        return list(zip(self.__blocks[0::2], self.__blocks[1::2]))
+
 
 class CompressedInMemoryPostingList(PostingList):
     """
@@ -93,10 +134,11 @@ class CompressedInMemoryPostingList(PostingList):
         appended to the byte array.
         """
 
-        def __init__(self, data: bytearray):
+        def __init__(self, data: bytearray, length: int):
             self.__data = data  # The buffer holding all the compressed posting data.
             self.__where = 0  # Our current position in the buffer.
             self.__document_id = 0  # We encoded the gaps, so accumulate them when decoding.
+            self.__remaining = length  # How many postings we have yet to decode.
 
         def __next__(self) -> Posting:
             if self.__where < len(self.__data):
@@ -105,28 +147,43 @@ class CompressedInMemoryPostingList(PostingList):
                 self.__document_id += gap
                 (term_frequency, increment) = VariableByteCodec.decode(self.__data, self.__where)
                 self.__where += increment
+                self.__remaining -= 1
                 return Posting(self.__document_id, term_frequency)
             else:
                 raise StopIteration
 
+        def __length_hint__(self) -> int:
+            return self.__remaining
+
+        def get_bytes_decoded(self) -> int:
+            """
+            Returns how many bytes of compressed posting data we have decoded so far.
+            """
+            return self.__where
+
     def __init__(self):
         self.__logical_length = 0  # The number of posting entries encoded in the byte array.
         self.__previous_document_id = 0  # So that we can gap encode.
         self.__data = bytearray()  # All posting entries, compressed.
+        self.__blocks = array("L")  # The flattened (<last document identifier>, <largest term frequency>) pairs, uncompressed.
 
     def get_length(self) -> int:
         return self.__logical_length
 
     def get_iterator(self) -> Iterator[Posting]:
-        return __class__.CompressedInMemoryPostingListIterator(self.__data)
+        return __class__.CompressedInMemoryPostingListIterator(self.__data, self.__logical_length)
 
     def append_posting(self, posting: Posting) -> None:
         assert self.__logical_length == 0 or posting.document_id > self.__previous_document_id
         gap = posting.document_id - self.__previous_document_id
         VariableByteCodec.encode(gap, self.__data)
         VariableByteCodec.encode(posting.term_frequency, self.__data)
+        self._update_block_maxima(self.__logical_length, posting, self.__blocks)
         self.__logical_length += 1
         self.__previous_document_id = posting.document_id
 
     def finalize_postings(self) -> None:
         pass
+
+    def get_block_maxima(self) -> List[Tuple[int, int]]:
+        return list(zip(self.__blocks[0::2], self.__blocks[1::2]))
@@ -0,0 +1,223 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=global-statement
+# pylint: disable=broad-exception-caught
+
+import asyncio
+import contextlib
+import json
+import mimetypes
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from timeit import default_timer as timer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+# The evaluator that a worker process serves queries with. Set once per worker process.
+_evaluator: Optional[Callable[[str], Any]] = None
+
+
+def _initialize(evaluator: Callable[[str], Any]) -> None:
+    """
+    Invoked once in each worker process when it starts.
+    """
+    global _evaluator
+    _evaluator = evaluator
+
+
+def _default(o: Any) -> Any:
+    """
+    Makes custom IN3120 objects JSON serializable, if they can be represented as dictionaries.
+    """
+    if hasattr(o, "to_dict") and callable(getattr(o, "to_dict")):
+        return o.to_dict()
+    raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+
+def _evaluate(query: str, evaluator: Optional[Callable[[str], Any]] = None) -> Tuple[int, bytes]:
+    """
+    Evaluates the given query, and serializes the results as JSON. Runs in a worker, so that the
+    serialization work doesn't burden the event loop either. Returns an HTTP status code and the
+    response body.
+    """
+    try:
+        start = timer()
+        matches = (evaluator or _evaluator)(query)
+        end = timer()
+        return 200, json.dumps({"duration": end - start, "matches": matches}, default=_default).encode()
+    except Exception as e:
+        return 500, json.dumps({"error": f"{e.__class__.__name__}: {e}"}).encode()
+
+
+class QueryServer:
+    """
+    A small HTTP server for serving queries, built on asyncio. A single event loop handles all the
+    connections, while the CPU-bound query evaluation is done by a pool of worker processes. That way
+    evaluation isn't serialized by the GIL, and slow queries don't hold up the handling of other
+    connections.
+
+    The evaluator is any callable that maps a query string to something JSON serializable. The engines
+    it needs are expected to be preloaded, i.e., built before the server is created. Worker processes
+    are forked, so that they inherit the preloaded engines without any need for pickling. On platforms
+    that can't fork, queries are evaluated by a pool of threads in the server process instead.
+
+    Queries are served as GET /query?q=<query>, and the response is a JSON object having the keys
+    "duration" (float) and "matches". If several clients issue the same query while it's being evaluated,
+    the query is only evaluated once and they all get the same response. Connections are kept alive
+    between requests, as per HTTP/1.1. Other paths are served as static files from a given directory,
+    if any, with index.html as the default.
+    """
+
+    def __init__(self, evaluator: Callable[[str], Any], processes: Optional[int] = None, root: Optional[str] = None):
+        self.__root = os.path.abspath(root) if root else None
+        self.__in_flight: Dict[str, asyncio.Future] = {}
+        self.__statistics = {"requests": 0, "evaluations": 0, "coalesced": 0, "connections": 0}
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.__evaluator = None
+        processes = processes or os.cpu_count() or 1
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+            self.__executor: Executor = ProcessPoolExecutor(processes, context, _initialize, (evaluator,))
+            self.__executor.submit(int).result()  # Fork the workers now, before they can inherit any client connections.
+        else:
+            self.__evaluator = evaluator
+            self.__executor = ThreadPoolExecutor(processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the pool of workers.
+        """
+        self.__executor.shutdown()
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Returns how many requests, query evaluations, coalesced queries and connections that
+        the server has seen.
+        """
+        return dict(self.__statistics)
+
+    async def start(self, host: str = "", port: int = 8000) -> int:
+        """
+        Starts accepting connections, and returns the port that the server listens on. Passing
+        port 0 lets the operating system pick a free port.
+        """
+        self.__server = await asyncio.start_server(self.__handle, host or None, port)
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stops accepting connections, and closes the connections that are still open.
+        """
+        if self.__server:
+            self.__server.close()
+            for writer in self.__connections.values():
+                writer.close()
+            await asyncio.gather(*self.__connections, return_exceptions=True)
+            await self.__server.wait_closed()
+            self.__server = None
+
+    def run(self, host: str = "", port: int = 8000, started: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Serves requests until interrupted. An optional callback gets notified of the port once the
+        server is up and running.
+        """
+        async def serve():
+            bound = await self.start(host, port)
+            if started:
+                started(bound)
+            async with self.__server:
+                await self.__server.serve_forever()
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(serve())
+
+    async def __evaluate(self, query: str) -> Tuple[int, bytes]:
+        """
+        Evaluates the given query in a worker, unless an identical query is already being evaluated.
+        In that case we just wait for that evaluation to complete.
+        """
+        future = self.__in_flight.get(query)
+        if future is None:
+            self.__statistics["evaluations"] += 1
+            future = asyncio.get_running_loop().run_in_executor(self.__executor, _evaluate, query, self.__evaluator)
+            self.__in_flight[query] = future
+            future.add_done_callback(lambda _: self.__in_flight.pop(query, None))
+        else:
+            self.__statistics["coalesced"] += 1
+        return await asyncio.shield(future)
+
+    async def __dispatch(self, method: str, target: str) -> Tuple[int, str, bytes]:
+        """
+        Produces a response to the given request. Returns the status code, the content type and
+        the response body.
+        """
+        if method != "GET":
+            return 405, "text/plain", b"Method not allowed"
+        url = urlsplit(target)
+        if url.path == "/query":
+            status, body = await self.__evaluate(parse_qs(url.query).get("q", [""])[0])
+            return status, "application/json", body
+        if self.__root:
+            path = os.path.abspath(os.path.join(self.__root, url.path.lstrip("/") or "index.html"))
+            if path.startswith(self.__root + os.sep) and os.path.isfile(path):
+                with open(path, "rb") as file:
+                    return 200, mimetypes.guess_type(path)[0] or "application/octet-stream", file.read()
+        return 404, "text/plain", b"Not found"
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests arriving over a single connection, until the client closes the connection
+        or doesn't want it kept alive.
+        """
+        self.__statistics["connections"] += 1
+        handler = asyncio.current_task()
+        self.__connections[handler] = writer
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+        try:
+            while True:
+                try:
+                    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                self.__statistics["requests"] += 1
+                headers = dict((k.strip().lower(), v.strip().lower()) for k, v in (line.split(":", 1) for line in head if ":" in line and " " not in line.split(":", 1)[0]))
+                request = next((line for line in head if line), "").split(" ")  # Be lenient with empty lines preceding the request line.
+                try:
+                    length = int(headers.get("content-length", "0") or "0")
+                except ValueError:
+                    length = -1
+                if len(request) != 3 or length < 0:
+                    # We can't tell where the next request begins, so the connection can't be kept alive.
+                    status, content_type, body, keep_alive = 400, "text/plain", b"Bad request", False
+                else:
+                    method, target, version = request
+                    keep_alive = headers.get("connection", "keep-alive" if version == "HTTP/1.1" else "close") == "keep-alive"
+                    if length > 0:
+                        await reader.readexactly(length)
+                    try:
+                        status, content_type, body = await self.__dispatch(method, target)
+                    except Exception as e:
+                        # E.g., a broken worker pool. Report it like _evaluate does, and don't trust the connection.
+                        status, content_type, body, keep_alive = 500, "application/json", json.dumps({"error": f"{e.__class__.__name__}: {e}"}).encode(), False
+                writer.write((f"HTTP/1.1 {status} {reasons[status]}\r\n"
+                              f"Content-Type: {content_type}\r\n"
+                              f"Content-Length: {len(body)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.__connections.pop(handler, None)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
@@ -2,6 +2,8 @@
 # pylint: disable=unnecessary-pass
 
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple
+import numpy as np
 from .posting import Posting
 
 
@@ -36,6 +38,51 @@ class Ranker(ABC):
         """
         pass
 
+    def get_upper_bound(self, term: str, multiplicity: int, term_frequency: int) -> Optional[float]:
+        """
+        Returns an upper bound on how much a single update invocation for the given query term can
+        contribute to a document's score, if the posting's term frequency is no larger than the given
+        term frequency. Dynamic pruning schemes like WAND use this to skip documents that cannot
+        possibly make it into the result set.
+
+        Such bounds only make sense if a document's score is the sum of independent per-term
+        contributions that never decrease as the term frequency increases. Rankers that cannot
+        guarantee this, or that simply don't know, return None. That disables pruning.
+        """
+        return None
+
+    def score_term(self, term: str, multiplicity: int, document_ids: np.ndarray, term_frequencies: np.ndarray) -> np.ndarray:
+        """
+        Returns, for a whole posting list at once, how much the given query term contributes to the
+        score of each document in the posting list. The posting list is given as two aligned arrays of
+        document identifiers and term frequencies. Enables term-at-a-time evaluation, where scores are
+        accumulated one query term at a time instead of one document at a time.
+
+        Like for get_upper_bound, this only makes sense if a document's score is the sum of independent
+        per-term contributions. The default implementation goes via reset/update/evaluate for each
+        posting. Rankers are encouraged to override this with a vectorized implementation.
+        """
+        contributions = np.empty(len(document_ids), dtype=np.float64)
+        for i, (document_id, term_frequency) in enumerate(zip(document_ids.tolist(), term_frequencies.tolist())):
+            self.reset(document_id)
+            self.update(term, multiplicity, Posting(document_id, term_frequency))
+            contributions[i] = self.evaluate()
+        return contributions
+
+    def score_block(self, terms: Sequence[Tuple[str, int]], document_ids: np.ndarray, term_frequencies: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Returns the relevancy scores for a whole block of candidate documents at once, i.e., does what
+        reset/update/evaluate would do for each document but in a single invocation. The query terms are
+        given as (term, multiplicity) pairs. The term frequencies are given as a matrix with one row per
+        query term and one column per document, where a zero means that the document doesn't contain the
+        term. The updates are to be applied in the order the query terms are listed.
+
+        The scores must be identical to what reset/update/evaluate would produce. Rankers that cannot offer
+        a vectorized implementation return None, and search engines then fall back to scoring one document
+        at a time.
+        """
+        return None
+
 
 class SimpleRanker(Ranker):
     """
@@ -56,3 +103,16 @@ class SimpleRanker(Ranker):
 
     def evaluate(self) -> float:
         return self.__score
+
+    def get_upper_bound(self, term: str, multiplicity: int, term_frequency: int) -> Optional[float]:
+        return multiplicity * term_frequency
+
+    def score_term(self, term: str, multiplicity: int, document_ids: np.ndarray, term_frequencies: np.ndarray) -> np.ndarray:
+        return multiplicity * term_frequencies.astype(np.float64)
+
+    def score_block(self, terms: Sequence[Tuple[str, int]], document_ids: np.ndarray, term_frequencies: np.ndarray) -> Optional[np.ndarray]:
+        # Add up row by row, in query order, so that the floating point arithmetic is the same as for evaluate.
+        scores = np.zeros(len(document_ids), dtype=np.float64)
+        for (_, multiplicity), row in zip(terms, term_frequencies):
+            scores += multiplicity * row
+        return scores
@@ -0,0 +1,337 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-arguments
+# pylint: disable=broad-exception-caught
+
+import multiprocessing
+from collections import Counter
+from operator import itemgetter
+from typing import Iterator, Dict, Any, List, Tuple, Callable, Iterable, Optional
+from .sieve import Sieve
+from .ranker import Ranker
+from .corpus import Corpus
+from .document import Document
+from .posting import Posting
+from .normalizer import Normalizer
+from .tokenizer import Tokenizer
+from .invertedindex import InvertedIndex, InMemoryInvertedIndex
+from .wandsearchengine import WandSearchEngine
+
+
+class ShardedSearchEngine:
+    """
+    A front-end that realizes the same N-of-M matching as SimpleSearchEngine, but over a corpus that
+    has been partitioned by document identifier range into N independent shards. Each shard has its
+    own inverted index and its own search engine. A query is scattered to all shards, each shard
+    computes its own top K, and the partial results are gathered and merged into the global top K.
+    See Section 20.3 in https://nlp.stanford.edu/IR-book/pdf/irbookonlinereading.pdf.
+
+    Rankers typically depend on collection-wide statistics, e.g., the number of documents N and the
+    document frequency df of each term. If each shard used its local statistics, then documents from
+    different shards would be scored on different scales. To prevent this, the document frequencies
+    and collection frequencies are aggregated across all shards up front and distributed back to every shard, and rankers get
+    a view of the corpus that reports the global corpus size. The scores are then identical to what
+    an unsharded index would give.
+
+    The shards can either live in the same process as the front-end, or in separate worker processes
+    that the front-end talks to over a local socket, as a stand-in for shards living on remote nodes.
+    In the latter case the shards evaluate queries in parallel. Call close when done, or use the engine
+    as a context manager.
+    """
+
+    class Partition(Corpus):
+        """
+        Exposes a range of documents from another corpus, keeping their document identifiers. Reports
+        the size of the whole corpus and not just of the range, so that rankers compute collection-wide
+        statistics correctly. Iteration only visits the documents in the range, so that only these get
+        indexed.
+        """
+
+        def __init__(self, corpus: Corpus, begin: int, end: int):
+            self.__begin = begin
+            self.__documents = [corpus[document_id] for document_id in range(begin, end)]
+            self.__size = corpus.size()
+
+        def __iter__(self):
+            return iter(self.__documents)
+
+        def size(self) -> int:
+            return self.__size
+
+        def get_document(self, document_id: int) -> Document:
+            assert self.__begin <= document_id < self.__begin + len(self.__documents)
+            return self.__documents[document_id - self.__begin]
+
+    class GlobalStatisticsInvertedIndex(InvertedIndex):
+        """
+        Wraps the inverted index of a single shard, but reports document and collection frequencies
+        for the whole corpus instead of for just the shard.
+        """
+
+        def __init__(self, wrapped: InvertedIndex):
+            self._wrapped = wrapped
+            self._document_frequencies: Dict[str, int] = {}
+            self._collection_frequencies: Dict[str, int] = {}
+
+        def set_frequencies(self, document_frequencies: Dict[str, int], collection_frequencies: Dict[str, int]) -> None:
+            """
+            Sets the document and collection frequencies aggregated over all shards.
+            """
+            self._document_frequencies = document_frequencies
+            self._collection_frequencies = collection_frequencies
+
+        def get_terms(self, buffer: str) -> Iterator[str]:
+            return self._wrapped.get_terms(buffer)
+
+        def get_terms_many(self, buffers: Iterable[str]) -> List[List[str]]:
+            return self._wrapped.get_terms_many(buffers)
+
+        def get_indexed_terms(self) -> Iterator[str]:
+            return self._wrapped.get_indexed_terms()
+
+        def get_postings_iterator(self, term: str) -> Iterator[Posting]:
+            return self._wrapped.get_postings_iterator(term)
+
+        def get_document_frequency(self, term: str) -> int:
+            return self._document_frequencies.get(term, 0)
+
+        def get_collection_frequency(self, term: str) -> int:
+            return self._collection_frequencies.get(term, 0)
+
+        def get_max_term_frequency(self, term: str) -> int:
+            return self._wrapped.get_max_term_frequency(term)
+
+        def get_block_maxima(self, term: str) -> List[Tuple[int, int]]:
+            return self._wrapped.get_block_maxima(term)
+
+        def get_document_id(self, ordinal: int) -> int:
+            return self._wrapped.get_document_id(ordinal)
+
+        def get_statistics(self) -> Dict[str, int]:
+            return self._wrapped.get_statistics()
+
+    class Shard:
+        """
+        A single shard, i.e., an inverted index over a range of the corpus and a search engine on
+        top of that, plus a ranker that sees the collection-wide statistics.
+        """
+
+        def __init__(self, corpus: Corpus, begin: int, end: int, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer,
+                     ranker: Callable[[Corpus, InvertedIndex], Ranker], compressed: bool):
+            partition = ShardedSearchEngine.Partition(corpus, begin, end)
+            local = InMemoryInvertedIndex(partition, fields, normalizer, tokenizer, compressed)
+            self.__document_frequencies = {term: local.get_document_frequency(term) for term in local.get_indexed_terms()}
+            self.__collection_frequencies = {term: local.get_collection_frequency(term) for term in local.get_indexed_terms()}
+            self.__baseline = Counter(local.get_statistics())
+            self.__inverted_index = ShardedSearchEngine.GlobalStatisticsInvertedIndex(local)
+            self.__engine = WandSearchEngine(partition, self.__inverted_index)
+            self.__ranker = ranker(partition, self.__inverted_index)
+
+        def get_frequencies(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+            """
+            Returns the document and collection frequencies of all terms in this shard.
+            """
+            return self.__document_frequencies, self.__collection_frequencies
+
+        def set_frequencies(self, document_frequencies: Dict[str, int], collection_frequencies: Dict[str, int]) -> None:
+            """
+            Sets the document and collection frequencies aggregated over all shards.
+            """
+            self.__inverted_index.set_frequencies(document_frequencies, collection_frequencies)
+
+        def get_statistics(self) -> Dict[str, int]:
+            """
+            Returns the counters kept by this shard's inverted index, not counting the posting list
+            traversals done up front when computing the collection frequencies.
+            """
+            statistics = Counter(self.__inverted_index.get_statistics())
+            statistics.subtract(self.__baseline)
+            return dict(statistics)
+
+        def evaluate(self, query: str, options: Dict[str, Any]) -> List[Tuple[float, int]]:
+            """
+            Returns this shard's best matches, as (score, document identifier) pairs.
+            """
+            return [(match["score"], match["document"].document_id) for match in self.__engine.evaluate(query, options, self.__ranker)]
+
+    class LocalNode:
+        """
+        Hosts a shard in the same process as the front-end. Requests are served right away, but
+        exceptions are held back until the response is asked for, like for a remote node.
+        """
+
+        def __init__(self, *args):
+            self.__shard = ShardedSearchEngine.Shard(*args)
+            self.__response: Tuple[bool, Any] = (True, None)
+
+        def send(self, method: str, *args) -> None:
+            """
+            Sends a request to the shard, i.e., asks it to invoke the named method.
+            """
+            try:
+                self.__response = (True, getattr(self.__shard, method)(*args))
+            except Exception as e:
+                self.__response = (False, e)
+
+        def receive(self) -> Any:
+            """
+            Waits for and returns the shard's response to the previous request. Re-raises the exception
+            that the request raised, if any.
+            """
+            succeeded, result = self.__response
+            if not succeeded:
+                raise result
+            return result
+
+        def close(self) -> None:
+            """
+            Shuts the node down.
+            """
+            self.__shard = None
+
+    class RemoteNode:
+        """
+        Hosts a shard in a separate worker process. Requests and responses are passed over a
+        local socket, so sending a request doesn't block and several nodes can work in parallel.
+        The shard is built in the worker process, too.
+        """
+
+        def __init__(self, *args):
+            self.__connection, child = multiprocessing.Pipe()
+            self.__process = multiprocessing.Process(target=__class__.serve, args=(child, args), daemon=True)
+            self.__process.start()
+            child.close()
+
+        @staticmethod
+        def serve(connection, args) -> None:
+            """
+            The worker process' main loop. Serves requests until asked to stop. A request that raises
+            an exception doesn't bring the worker down, the exception is sent back as the response.
+            """
+            shard = ShardedSearchEngine.Shard(*args)
+            while True:
+                request = connection.recv()
+                if request is None:
+                    break
+                method, arguments = request
+                try:
+                    response = (True, getattr(shard, method)(*arguments))
+                except Exception as e:
+                    response = (False, e)
+                connection.send(response)
+            connection.close()
+
+        def send(self, method: str, *args) -> None:
+            """
+            Sends a request to the shard, i.e., asks it to invoke the named method.
+            """
+            self.__connection.send((method, args))
+
+        def receive(self) -> Any:
+            """
+            Waits for and returns the shard's response to the previous request. Re-raises the exception
+            that the request raised in the worker process, if any.
+            """
+            succeeded, result = self.__connection.recv()
+            if not succeeded:
+                raise result
+            return result
+
+        def close(self) -> None:
+            """
+            Shuts the node down, and waits for the worker process to exit.
+            """
+            if self.__process.is_alive():
+                self.__connection.send(None)
+                self.__process.join()
+            self.__connection.close()
+
+    def __init__(self, corpus: Corpus, fields: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer,
+                 ranker: Callable[[Corpus, InvertedIndex], Ranker], shards: int, processes: bool = False, compressed: bool = False):
+        """
+        Partitions the corpus into the given number of shards, and indexes each shard. The ranker is
+        given as a factory, e.g., a ranker class, since each shard needs its own ranker instance. If
+        worker processes are used, the ranker factory, the normalizer and the tokenizer must be picklable
+        on platforms where new processes aren't forked.
+        """
+        assert shards > 0
+        self.__corpus = corpus
+        boundaries = [i * corpus.size() // shards for i in range(shards + 1)]
+        node = __class__.RemoteNode if processes else __class__.LocalNode
+        self.__nodes: Optional[List[Any]] = [node(corpus, begin, end, fields, normalizer, tokenizer, ranker, compressed) for begin, end in zip(boundaries, boundaries[1:])]
+        document_frequencies, collection_frequencies = Counter(), Counter()
+        for partial_document_frequencies, partial_collection_frequencies in self.__broadcast("get_frequencies"):
+            document_frequencies.update(partial_document_frequencies)
+            collection_frequencies.update(partial_collection_frequencies)
+        self.__broadcast("set_frequencies", dict(document_frequencies), dict(collection_frequencies))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __broadcast(self, method: str, *args) -> List[Any]:
+        """
+        Scatters a request to all shards, and gathers their responses. If any shard fails, the first
+        exception is re-raised, but only after all responses have been gathered so that the nodes are
+        ready for the next request.
+        """
+        assert self.__nodes is not None
+        for node in self.__nodes:
+            node.send(method, *args)
+        responses, failure = [], None
+        for node in self.__nodes:
+            try:
+                responses.append(node.receive())
+            except Exception as e:
+                failure = failure or e
+        if failure is not None:
+            raise failure
+        return responses
+
+    def close(self) -> None:
+        """
+        Shuts down all shards. The engine can not be used afterwards.
+        """
+        for node in self.__nodes or []:
+            node.close()
+        self.__nodes = None
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Returns the counters kept by the shards' inverted indexes, summed across all shards. See
+        InvertedIndex.get_statistics.
+        """
+        statistics = Counter()
+        for partial in self.__broadcast("get_statistics"):
+            statistics.update(partial)
+        return dict(statistics)
+
+    def evaluate(self, query: str, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluates the given query, doing N-out-of-M ranked retrieval across all shards.
+
+        The matching documents, if any, are ranked by the ranker supplied at construction time, and only the "best"
+        matches are yielded back to the client as dictionaries having the keys "score" (float) and "document" (Document).
+
+        The client can supply a dictionary of options that controls the query evaluation process: The value of
+        N is inferred from the query via the "match_threshold" (float) option, and the maximum number of documents
+        to return to the client is controlled via the "hit_count" (int) option. Other options are passed on as-is
+        to the search engine that each shard runs. See WandSearchEngine.
+
+        The results are identical to what we would get from a single, unsharded index, including which of the
+        documents that tie at the cut are returned: A search engine sifts the documents in order of increasing
+        document identifier, so ties are resolved in favor of the lowest identifiers. The shards partition the
+        corpus into consecutive ranges, so we get the same if we sift each shard's matches in order of increasing
+        document identifier and merge the shards in order.
+        """
+        hit_count = max(1, options.get("hit_count", 10))
+        sieve = Sieve(hit_count)
+        for matches in self.__broadcast("evaluate", query, options):
+            partial = Sieve(hit_count)
+            partial.sift2(sorted(matches, key=itemgetter(1)))
+            sieve.merge(partial)
+        for score, document_id in sieve.winners():
+            yield {"score": score, "document": self.__corpus[document_id]}
@@ -1,7 +1,8 @@
 # pylint: disable=missing-module-docstring
 
 import heapq
-from typing import Iterator, Iterable, Any, Union, Tuple
+from typing import Iterator, Iterable, Any, Union, Tuple, Optional, Sequence
+import numpy as np
 
 # Not strictly needed, but left for clarity. PEP 484 explicitly specifies that
 # "when an argument is annotated as having type float, an argument of type int
@@ -13,31 +14,49 @@ class Sieve:
     """
     Implements a "sieve", i.e., a heap-based data structure through which
     we can "sift" N scored items, and be left with the up to K (item, score)
-    pairs having the largest scores. Ties are resolved arbitrarily.
+    pairs having the largest scores. Ties are resolved in favor of the items that
+    were sifted through first.
 
     A sieve is an efficient way of selecting the "best" K items from a set of N
     items, where K << N. An internal heap keeps track of "the worst of the best",
     so that we immediately know if a candidate item makes the cut.
 
     Candidate items can be of any type, as long as that type has an "<" operator
-    defined.
+    defined. Internally, every item is tagged with its position in the order of arrival.
+    The heap is ordered by score and then by arrival, with late arrivals considered
+    smaller, so that items never have to be compared to each other while sifting.
+
+    Large batches of scored items can be sifted through the sieve in bulk using a
+    partial sort, and sieves that have been filled independently of each other, e.g.,
+    one per shard or per thread, can be merged.
     """
 
     def __init__(self, size: int):
         assert size > 0
         self.__size = size
-        self.__heap = []
+        self.__heap = []   # Holds (score, -arrival, item) triples.
+        self.__count = 0   # How many items have arrived so far.
 
     def sift(self, score: Number, item: Any) -> None:
         """
         Sifts a scored item through the sieve.
         """
+        arrival = self.__count
+        self.__count += 1
         if len(self.__heap) < self.__size:
-            heapq.heappush(self.__heap, (score, item))
+            heapq.heappush(self.__heap, (score, -arrival, item))
         else:
             root_score = self.__heap[0][0]
             if root_score < score:
-                heapq.heapreplace(self.__heap, (score, item))
+                heapq.heapreplace(self.__heap, (score, -arrival, item))
+
+    def threshold(self) -> Optional[Number]:
+        """
+        Returns the score that a candidate item has to exceed in order to make the cut, i.e., the
+        score of "the worst of the best". Returns None if the sieve is not yet full, in which case
+        any candidate item makes the cut.
+        """
+        return self.__heap[0][0] if len(self.__heap) >= self.__size else None
 
     def sift2(self, pairs: Iterable[Tuple[Number, Any]]) -> None:
         """
@@ -46,13 +65,67 @@ class Sieve:
         for score, item in pairs:
             self.sift(score, item)
 
+    def sift_array(self, scores: np.ndarray, items: Sequence[Any]) -> None:
+        """
+        Sifts a batch of scored items through the sieve. Has the same effect as sifting the items
+        through one at a time in the given order, but selects the best items using a partial sort.
+        The items can be given as a list or as an array, and have to be aligned with the scores.
+        """
+        assert len(scores) == len(items)
+        scores = np.asarray(scores)
+        first = self.__count
+        self.__count += len(scores)
+
+        # If the sieve is full, only items that beat "the worst of the best" have a chance.
+        indices = np.arange(len(scores))
+        if len(self.__heap) >= self.__size:
+            indices = np.flatnonzero(scores > self.__heap[0][0])
+        if len(indices) == 0:
+            return
+        if len(self.__heap) + len(indices) <= self.__size:
+            self.__heap.extend(zip(scores[indices].tolist(), (-first - i for i in indices.tolist()), (items[i] for i in indices.tolist())))
+            heapq.heapify(self.__heap)
+            return
+
+        # Locate the K-th best score overall. Everything that scores better than that makes it.
+        combined = np.concatenate((np.array([score for score, _, _ in self.__heap]), scores[indices]))
+        kth = combined[np.argpartition(-combined, self.__size - 1)[self.__size - 1]].item()
+        above = indices[scores[indices] > kth]
+        kept = [entry for entry in self.__heap if entry[0] > kth]
+        kept.extend(zip(scores[above].tolist(), (-first - i for i in above.tolist()), (items[i] for i in above.tolist())))
+
+        # Fill up with the items that tie with the K-th best score, in order of arrival. The items already
+        # in the sieve arrived before the ones in the batch.
+        tied = sorted((entry for entry in self.__heap if entry[0] == kth), key=lambda entry: -entry[1])
+        tied.extend((kth, -first - i, items[i]) for i in indices[scores[indices] == kth].tolist())
+        kept.extend(tied[:self.__size - len(kept)])
+        heapq.heapify(kept)
+        self.__heap = kept
+
+    def merge(self, other: "Sieve") -> None:
+        """
+        Merges the contents of another sieve into this sieve, so that this sieve ends up holding the
+        up to K highest-scoring items that have been sifted through either of the two sieves. Useful
+        for combining partial results computed independently of each other, e.g., per shard or per
+        thread. The other sieve is left unchanged.
+
+        The result is exactly the same as if all the items that were sifted through the other sieve
+        had been sifted through this sieve afterwards, in the same order. That holds for the tied items
+        too, since the K best items with respect to a total order are among the K best of either part.
+        """
+        offset = self.__count
+        arrived = ((score, negated - offset, item) for score, negated, item in other.__heap)
+        self.__heap = heapq.nlargest(self.__size, self.__heap + list(arrived))
+        heapq.heapify(self.__heap)
+        self.__count += other.__count
+
     def winners(self) -> Iterator[Tuple[Number, Any]]:
         """
         Returns the highest-scoring items that have been sifted through the sieve, sorted
         in descending order. The returned list iterator yields (score, item) tuples.
 
-        This implementation is currently not idempotent. Invoke only once.
+        The sieve is left unchanged, so this can be invoked as many times as desired.
         """
         # Since the internal heap tracks "the worst of the best" and we want the
         # list sorted as "the best of the best", we reverse the internal heap ordering.
-        return reversed([heapq.heappop(self.__heap) for _ in range(len(self.__heap))])
+        return iter(sorted(((score, item) for score, _, item in self.__heap), reverse=True))
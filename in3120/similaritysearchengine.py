@@ -8,6 +8,7 @@ import numpy as np
 from .corpus import Corpus
 from .normalizer import Normalizer
 from .tokenizer import Tokenizer
+from .tracer import NULL_TRACER
 
 
 class SimilaritySearchEngine:
@@ -119,19 +120,26 @@ class SimilaritySearchEngine:
 
         The client can supply a dictionary of options that controls the query evaluation
         process: The maximum number of documents to return to the client is controlled via
-        the "hit_count" (int) option.
+        the "hit_count" (int) option. Timings for the various evaluation stages are collected
+        if a "tracer" (Tracer) is supplied.
         """
+        # Collect timings for the various evaluation stages?
+        tracer = options.get("tracer") or NULL_TRACER
+
         # Empty query?
-        query = self.__normalize(query or "")
+        with tracer.span("normalize"):
+            query = self.__normalize(query or "")
         if not query:
             return
 
         # Place the normalized query string in embedding space. Normalize the embedding.
-        embedding = np.array([self.__embed(query)], dtype=np.float32, copy=False)
-        faiss.normalize_L2(embedding)
+        with tracer.span("embed"):
+            embedding = np.array([self.__embed(query)], dtype=np.float32, copy=False)
+            faiss.normalize_L2(embedding)
 
         # Lookup! See, e.g., https://github.com/facebookresearch/faiss/wiki/Faster-search for options.
-        distances, indices = self.__index.search(embedding, min(100, max(1, int(options.get("hit_count", 5)))))
+        with tracer.span("search"):
+            distances, indices = self.__index.search(embedding, min(100, max(1, int(options.get("hit_count", 5)))))
 
         # With METRIC_INNER_PRODUCT as our metric and normalized vectors, the emitted scores are cosine
         # similarity scores and are emitted back in descending order. With another metric where scores
@@ -139,4 +147,5 @@ class SimilaritySearchEngine:
         # before emitting them in order to keep to the convention that "<" for scores means "ranks below".
         # See, e.g., https://github.com/facebookresearch/faiss/wiki/MetricType-and-distances for more.
         for i in range(len(indices[0])):
+            tracer.count("matches")
             yield {"score": distances[0][i], "document": self.__corpus[self.__mappings[indices[0][i]]]}
@@ -44,6 +44,8 @@ class SimpleSearchEngine:
 
         The client can supply a dictionary of options that controls the query evaluation process: The value of
         N is inferred from the query via the "match_threshold" (float) option, and the maximum number of documents
-        to return to the client is controlled via the "hit_count" (int) option.
+        to return to the client is controlled via the "hit_count" (int) option. If the client supplies a "tracer"
+        (Tracer) option, timings and counters for the various evaluation stages should be recorded there, e.g., for
+        tokenization and normalization, posting list traversal, ranking and top-K selection.
         """
         raise NotImplementedError("You need to implement this as part of the obligatory assignment.")
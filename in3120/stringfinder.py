@@ -43,6 +43,7 @@ class StringFinder:
         string using the emitted "span" value.
 
         In a serious application we'd add more lookup/evaluation features, e.g., support for prefix matching,
-        support for leftmost-longest matching (instead of reporting all matches), and more.
+        support for leftmost-longest matching (instead of reporting all matches), and more. The AhoCorasickFinder
+        class compiles the trie into an automaton with failure links and offers leftmost-longest matching.
         """
         raise NotImplementedError("You need to implement this as part of the obligatory assignment.")
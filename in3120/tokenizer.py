@@ -3,7 +3,9 @@
 
 import re
 from abc import ABC, abstractmethod
-from typing import Iterator, Tuple
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator, List, Tuple
 
 
 class Tokenizer(ABC):
@@ -31,6 +33,25 @@ class Tokenizer(ABC):
         """
         return ((buffer[r[0]:r[1]], r) for r in self.spans(buffer))
 
+    def offsets(self, buffer: str) -> array:
+        """
+        Returns the positional spans (ranges) of the tokens in the given buffer as a compact array
+        of flattened (begin, end) pairs. I.e., the i-th token spans the range given by the elements at
+        indices 2 * i and 2 * i + 1. Useful for clients that need to hold on to the positions of many
+        tokens, or that only need to look up a few positions after the fact, in which case the offsets
+        can be computed lazily, if and when needed.
+        """
+        return array("L", chain.from_iterable(self.spans(buffer)))
+
+    def tokenize_many(self, buffers: Iterable[str]) -> List[List[str]]:
+        """
+        Bulk version of strings/1. Returns, for each of the given buffers, the strings that make up
+        the tokens in that buffer. Saves us from setting up a generator per buffer when processing a
+        large batch of buffers, e.g., when indexing a corpus. Subclasses can override this if they can
+        do even better.
+        """
+        return [list(self.strings(buffer)) for buffer in buffers]
+
     @staticmethod
     def join(tokens: Iterator[Tuple[str, Tuple[int, int]]]) -> str:
         """
@@ -61,7 +82,22 @@ class SimpleTokenizer(Tokenizer):
         pass
 
     def spans(self, buffer: str) -> Iterator[Tuple[int, int]]:
-        return ((m.start(), m.end()) for m in self.__pattern.finditer(buffer))
+        return (m.span() for m in self.__pattern.finditer(buffer))
+
+    def strings(self, buffer: str) -> Iterator[str]:
+        # Avoid creating spans only to slice the buffer with them afterwards.
+        yield from self.__pattern.findall(buffer)
+
+    def tokens(self, buffer: str) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        return ((m.group(), m.span()) for m in self.__pattern.finditer(buffer))
+
+    def offsets(self, buffer: str) -> array:
+        return array("L", chain.from_iterable(map(re.Match.span, self.__pattern.finditer(buffer))))
+
+    def tokenize_many(self, buffers: Iterable[str]) -> List[List[str]]:
+        # Let the regular expression engine produce the token strings directly, without creating
+        # match objects or slicing the buffer ourselves.
+        return [self.__pattern.findall(buffer) for buffer in buffers]
 
 
 class DummyTokenizer(Tokenizer):
@@ -85,6 +121,12 @@ class DummyTokenizer(Tokenizer):
         if buffer:
             yield (0, len(buffer))
 
+    def offsets(self, buffer: str) -> array:
+        return array("L", (0, len(buffer)) if buffer else ())
+
+    def tokenize_many(self, buffers: Iterable[str]) -> List[List[str]]:
+        return [[buffer] if buffer else [] for buffer in buffers]
+
 
 class UnigramTokenizer(Tokenizer):
     """
@@ -105,3 +147,13 @@ class UnigramTokenizer(Tokenizer):
     def spans(self, buffer: str):
         if buffer:
             yield from ((i, i + 1) for i in range(len(buffer)))
+
+    def offsets(self, buffer: str) -> array:
+        length = len(buffer or "")
+        offsets = array("L", [0]) * (2 * length)
+        offsets[0::2] = array("L", range(length))
+        offsets[1::2] = array("L", range(1, length + 1))
+        return offsets
+
+    def tokenize_many(self, buffers: Iterable[str]) -> List[List[str]]:
+        return [list(buffer or "") for buffer in buffers]
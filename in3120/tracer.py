@@ -0,0 +1,222 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+
+import contextlib
+import math
+from collections import Counter
+from timeit import default_timer as timer
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Tuple
+
+
+class Tracer:
+    """
+    Collects timings and counters from the various stages of query evaluation, e.g., tokenization and
+    normalization, parsing, planning, posting list traversal, ranking and top-K selection. Enables us to
+    see where the time goes, and not just how much time a query takes in total. In particular, since
+    the timings are aggregated across queries, we can see which stages dominate in the slow tail.
+
+    Tracing is opt-in: Search engines that support it look for a tracer among the options the client
+    passes in with each query, i.e., as the "tracer" (Tracer) option. If there is none, the shared NULL_TRACER
+    is used, which does nothing and costs next to nothing.
+
+    Each timed span is recorded in a histogram with logarithmically sized buckets, four per power of two.
+    Memory use is thus bounded regardless of how many queries we trace, and percentiles can be estimated
+    with a relative error of at most 25%. Counters are simply summed.
+    """
+
+    def __init__(self):
+        self.__histograms: Dict[str, Counter] = {}
+        self.__totals: Dict[str, List[float]] = {}  # Per span: Count, sum, minimum and maximum.
+        self.__counters: Counter = Counter()
+
+    def span(self, name: str) -> ContextManager:
+        """
+        Returns a context manager that times the enclosed block of code, and records the
+        duration under the given name.
+        """
+        return self.__Span(self, name)
+
+    def iterate(self, name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+        """
+        Wraps the given iterable, and records the time spent producing its elements under the given
+        name. Useful for timing lazy evaluation, e.g., merging of posting lists, without also timing
+        whatever the consumer does with the elements in between.
+        """
+        iterator = iter(iterable)
+        elapsed = 0.0
+        try:
+            while True:
+                start = timer()
+                try:
+                    element = next(iterator)
+                except StopIteration:
+                    elapsed += timer() - start
+                    break
+                elapsed += timer() - start
+                yield element
+        finally:
+            self.record(name, elapsed)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Adds the given value to the named counter.
+        """
+        self.__counters[name] += value
+
+    def record(self, name: str, duration: float) -> None:
+        """
+        Records a duration, in seconds, under the given name. Typically invoked via span or iterate.
+        """
+        totals = self.__totals.get(name)
+        if totals is None:
+            self.__totals[name] = [1, duration, duration, duration]
+            self.__histograms[name] = Counter()
+        else:
+            totals[0] += 1
+            totals[1] += duration
+            totals[2] = min(totals[2], duration)
+            totals[3] = max(totals[3], duration)
+        self.__histograms[name][self.__bucket(duration)] += 1
+
+    def reset(self) -> None:
+        """
+        Forgets everything recorded so far.
+        """
+        self.__histograms.clear()
+        self.__totals.clear()
+        self.__counters.clear()
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Returns the current values of all counters.
+        """
+        return dict(self.__counters)
+
+    def get_histogram(self, name: str) -> List[Tuple[float, int]]:
+        """
+        Returns the histogram of the durations recorded under the given name, as a list of
+        (upper bound, count) pairs sorted by upper bound. Empty buckets are omitted. Durations
+        are in seconds.
+        """
+        return [(self.__upper_bound(bucket), count) for bucket, count in sorted(self.__histograms.get(name, {}).items())]
+
+    def get_percentile(self, name: str, percentile: float) -> float:
+        """
+        Estimates the given percentile, e.g., 0.99, of the durations recorded under the given name.
+        The estimate is the upper bound of the bucket where the percentile falls, but never larger
+        than the largest duration observed. Returns zero if nothing has been recorded.
+        """
+        totals = self.__totals.get(name)
+        if totals is None:
+            return 0.0
+        rank = max(1, math.ceil(percentile * totals[0]))
+        seen = 0
+        for upper_bound, count in self.get_histogram(name):
+            seen += count
+            if seen >= rank:
+                return min(upper_bound, totals[3])
+        return totals[3]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Exports a summary of everything recorded so far, suitable for, e.g., JSON serialization.
+        """
+        spans = {}
+        for name, (count, total, minimum, maximum) in self.__totals.items():
+            spans[name] = {
+                "count": count,
+                "total": total,
+                "mean": total / count,
+                "min": minimum,
+                "max": maximum,
+                "p50": self.get_percentile(name, 0.5),
+                "p90": self.get_percentile(name, 0.9),
+                "p99": self.get_percentile(name, 0.99),
+                "histogram": self.get_histogram(name),
+            }
+        return {"spans": spans, "counters": self.get_counters()}
+
+    @staticmethod
+    def __bucket(duration: float) -> int:
+        """
+        Maps a duration to its histogram bucket. The mantissa returned by frexp is in [0.5, 1), and
+        we split that range into four equally wide buckets.
+        """
+        if duration <= 0.0:
+            return -1 << 20
+        mantissa, exponent = math.frexp(duration)
+        return 4 * exponent + int(8 * mantissa) - 4
+
+    @staticmethod
+    def __upper_bound(bucket: int) -> float:
+        """
+        The inverse of __bucket, i.e., returns the largest duration that maps to the given bucket.
+        """
+        if bucket == -1 << 20:
+            return 0.0
+        exponent, offset = divmod(bucket, 4)
+        return math.ldexp(0.5 + (offset + 1) / 8, exponent)
+
+    class __Span:
+        """
+        Times a block of code. Used as a context manager.
+        """
+
+        __slots__ = ("__tracer", "__name", "__start")
+
+        def __init__(self, tracer: "Tracer", name: str):
+            self.__tracer = tracer
+            self.__name = name
+            self.__start = 0.0
+
+        def __enter__(self):
+            self.__start = timer()
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            self.__tracer.record(self.__name, timer() - self.__start)
+
+
+class NullTracer(Tracer):
+    """
+    A tracer that does nothing. Used when the client doesn't ask for tracing, so that search engines
+    can be instrumented unconditionally at close to zero cost. Keeps no state, so a single instance
+    can be shared by everyone, see NULL_TRACER.
+    """
+
+    # Stateless and reentrant, and can hence be shared.
+    __nothing = contextlib.nullcontext()
+
+    def __init__(self):  # pylint: disable=super-init-not-called
+        pass
+
+    def span(self, name: str) -> ContextManager:
+        return NullTracer.__nothing
+
+    def iterate(self, name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+        return iter(iterable)
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def record(self, name: str, duration: float) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+    def get_counters(self) -> Dict[str, int]:
+        return {}
+
+    def get_histogram(self, name: str) -> List[Tuple[float, int]]:
+        return []
+
+    def get_percentile(self, name: str, percentile: float) -> float:
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"spans": {}, "counters": {}}
+
+
+# The tracer that search engines use when the client doesn't ask for tracing.
+NULL_TRACER = NullTracer()
@@ -3,7 +3,11 @@
 # pylint: disable=protected-access
 
 from __future__ import annotations
-from itertools import repeat
+from array import array
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate, repeat
+from operator import itemgetter
 from typing import Dict, List, Any, Tuple, Optional, Iterable, Iterator
 from .normalizer import Normalizer
 from .tokenizer import Tokenizer
@@ -21,7 +25,8 @@ class Trie:
 
     Using, e.g., Marisa (https://github.com/pytries/marisa-trie), or DAWG (https://dawg.readthedocs.io/en/latest/),
     or datrie (https://pypi.org/project/datrie/), or hat-trie (https://github.com/pytries/hat-trie)
-    would have plausible open source alternatives.
+    would have plausible open source alternatives. See also the FrozenTrie class below, which
+    trades mutability for a much more compact representation.
 
     We can, optionally, associate a meta data value of some kind with each final/terminal state
     the trie/automaton. Some applications might benefit from this, if we need to keep rich meta data
@@ -109,8 +114,37 @@ class Trie:
         normalization.
         """
         for string, meta in strings:
-            tokens = tokenizer.tokens(normalizer.canonicalize(string))
-            self.__add(tokenizer.join((normalizer.normalize(t), _) for t, _ in tokens), meta)
+            self.__add(Trie._prepare(string, normalizer, tokenizer), meta)
+
+    @staticmethod
+    def _prepare(string: str, normalizer: Normalizer, tokenizer: Tokenizer) -> str:
+        """
+        Internal helper method, normalizes the given string so that it can be added to
+        a trie. The tokenizer is used so that we're robust to nuances in whitespace and
+        punctuation.
+        """
+        tokens = tokenizer.tokens(normalizer.canonicalize(string))
+        return tokenizer.join((normalizer.normalize(t), _) for t, _ in tokens)
+
+    @staticmethod
+    def _sort(pairs: Iterable[Tuple[str, Optional[Any]]]) -> Tuple[List[str], List[Optional[Any]]]:
+        """
+        Internal helper method, sorts the given (string, meta) pairs and eliminates duplicates.
+        Returns the sorted strings and their associated meta data values as parallel lists. The
+        strings are assumed already properly normalized at this point.
+
+        Adding the same string more than once is benign and idempotent, as long as their associated
+        meta data values do not differ.
+        """
+        strings, metas = [], []
+        for string, meta in sorted(pairs, key=itemgetter(0)):
+            assert 0 < len(string)
+            if strings and strings[-1] == string:
+                assert metas[-1] == meta
+                continue
+            strings.append(string)
+            metas.append(meta)
+        return strings, metas
 
     def consume(self, prefix: str) -> Optional[Trie]:
         """
@@ -152,6 +186,14 @@ class Trie:
                 if symbol and child:
                     stack.append((child, prefix + symbol))
 
+    def strings2(self) -> Iterator[Tuple[str, Optional[Any]]]:
+        """
+        Yields all (string, meta) pairs that are found in or below this node. Saves us from consuming
+        the strings again to get at their associated meta data values. The returned pairs are emitted
+        back in lexicographical order.
+        """
+        return ((string, self.consume(string).get_meta()) for string in self.strings())
+
     def transitions(self) -> List[str]:
         """
         Returns the set of symbols that are valid outgoing transitions, i.e., the set of symbols that
@@ -180,3 +222,243 @@ class Trie:
         data exists.
         """
         return self.__children[""] if self.is_final() else None
+
+
+class FrozenTrie:
+    """
+    An immutable trie, compiled into a handful of flat arrays instead of being a graph of Python
+    objects. Offers the same lookup and traversal API as the Trie class, but nothing can be added
+    to it once it has been built. For large dictionaries, e.g., the MeSH vocabulary or the permuterm
+    rotations of a large vocabulary, the difference in memory consumption is dramatic.
+
+    The nodes are numbered in level order, i.e., breadth first. That way, the children of a node
+    are numbered consecutively and the representation is similar to LOUDS (see, e.g., Jacobson,
+    "Space-efficient Static Trees and Graphs") except that we store an explicit offset per node
+    instead of a bit vector with rank and select support, since bit-level operations are costly in
+    Python. For each node we store:
+
+      * The transition symbol leading into the node, as a single character in a string. The
+        transition symbols out of a node thus form a contiguous and sorted substring, and we can
+        find the right child using the string search machinery.
+
+      * The number of the node's first child, as an entry in a flat array. The children of node i
+        are numbered from first[i] up to but not including first[i + 1].
+
+      * Whether the node is final, as a byte in a byte array.
+
+      * The meta data associated with the node, if it's final. The meta data values are stored in
+        a list with one entry per final node, so we need to compute the rank of a final node among
+        all the final nodes to locate its meta data. For that we keep a rank directory with the number
+        of final nodes that precede every 64th node, and count the rest on the fly. If no meta data is
+        associated with any of the strings, we don't store anything at all.
+
+    A node is represented as a lightweight handle to the shared arrays and the node's number. As
+    such, the handles returned by, e.g., consume/1 are created on the fly and two handles compare
+    equal if they refer to the same node in the same trie.
+
+    A double-array trie (see, e.g., Aoe, "An Efficient Digital Search Algorithm by Using a Double-Array
+    Structure") would give us constant time transitions, but needs a dense mapping of the alphabet to
+    small integers and a costly search for a free slot per node when building it.
+    """
+
+    __slots__ = ("__labels", "__first", "__finals", "__ranks", "__metas", "__node")
+
+    def __init__(self, labels: str, first: array, finals: bytearray, ranks: array, metas: Optional[List[Any]], node: int = 0):
+        self.__labels = labels  # The transition symbols leading into each node, the root has a dummy.
+        self.__first = first    # The number of the first child per node, plus a sentinel at the end.
+        self.__finals = finals  # One for final nodes, zero for other nodes.
+        self.__ranks = ranks    # The number of final nodes that precede every 64th node.
+        self.__metas = metas    # The meta data per final node, or None if there's no meta data at all.
+        self.__node = node      # Which node this handle refers to.
+
+    def __repr__(self):
+        return repr(list(self.strings()))
+
+    def __eq__(self, other: Any):
+        return isinstance(other, FrozenTrie) and self.__labels is other.__labels and self.__node == other.__node
+
+    def __hash__(self):
+        return hash((id(self.__labels), self.__node))
+
+    def __contains__(self, string: str):
+        descendant = self.consume(string)
+        return descendant is not None and descendant.is_final()
+
+    def __iter__(self):
+        return self.strings()
+
+    def __getitem__(self, prefix: str):
+        return self.consume(prefix)
+
+    @staticmethod
+    def from_strings(strings: Iterable[str], normalizer: Normalizer, tokenizer: Tokenizer) -> FrozenTrie:
+        """
+        Constructor-like convenience method. Creates and returns a new frozen trie containing
+        all the given strings.
+        """
+        return FrozenTrie.from_strings2(zip(strings, repeat(None)), normalizer, tokenizer)
+
+    @staticmethod
+    def from_strings2(strings: Iterable[Tuple[str, Optional[Any]]], normalizer: Normalizer, tokenizer: Tokenizer) -> FrozenTrie:
+        """
+        Constructor-like convenience method. Creates and returns a new frozen trie containing
+        all the given (string, meta) pairs. The strings are normalized the same way as for the
+        Trie class.
+
+        Adding the same string more than once is benign, as long as their associated meta data
+        values do not differ.
+        """
+        return FrozenTrie.__compile((Trie._prepare(string, normalizer, tokenizer), meta) for string, meta in strings)
+
+    @staticmethod
+    def from_trie(trie: Trie) -> FrozenTrie:
+        """
+        Constructor-like convenience method. Creates and returns a new frozen trie containing
+        the same strings and meta data as the given trie.
+        """
+        return FrozenTrie.__compile(trie.strings2())
+
+    @staticmethod
+    def __compile(pairs: Iterable[Tuple[str, Optional[Any]]]) -> FrozenTrie:
+        """
+        Internal helper method, builds the arrays from the given (string, meta) pairs. The strings
+        are assumed already properly normalized at this point.
+
+        If we sort the strings, the strings below any given node form a contiguous range in the
+        sorted list, and a node's children split the node's range into consecutive subranges. So
+        we can build the trie level by level using a queue of ranges, without ever creating the
+        individual nodes as objects.
+        """
+        # Sort, and eliminate duplicates.
+        strings, metas = Trie._sort(pairs)
+
+        # Build it breadth first. The nodes are numbered in the order they are discovered, and
+        # since the queue is first in first out they are also processed in that order.
+        labels = ["\0"]
+        first = array("I")
+        finals = bytearray()
+        final_metas = []
+        queue = deque([(0, len(strings), 0)])
+        while queue:
+            begin, end, depth = queue.popleft()
+            first.append(len(labels))
+            if begin < end and len(strings[begin]) == depth:
+                finals.append(1)
+                final_metas.append(metas[begin])
+                begin += 1
+            else:
+                finals.append(0)
+            symbol_at = itemgetter(depth)
+            while begin < end:
+                symbol = strings[begin][depth]
+                boundary = bisect_right(strings, symbol, begin, end, key=symbol_at)
+                labels.append(symbol)
+                queue.append((begin, boundary, depth + 1))
+                begin = boundary
+        first.append(len(labels))
+        labels.append("\0")  # Padding, so that we can always peek at the first child of a node.
+        ranks = array("I", accumulate((finals.count(1, i, i + 64) for i in range(0, len(finals), 64)), initial=0))
+        has_metas = any(meta is not None for meta in final_metas)
+        return FrozenTrie("".join(labels), first, finals, ranks, final_metas if has_metas else None)
+
+    def __handle(self, node: int) -> FrozenTrie:
+        """
+        Internal helper method, returns a handle to the given node in the same trie.
+        """
+        return FrozenTrie(self.__labels, self.__first, self.__finals, self.__ranks, self.__metas, node)
+
+    def consume(self, prefix: str) -> Optional[FrozenTrie]:
+        """
+        Consumes the given prefix verbatim and returns the resulting descendant node,
+        if any. Otherwise, None is returned.
+
+        Assumes that the prefix is already normalized.
+        """
+        labels, first, node = self.__labels, self.__first, self.__node
+        for symbol in prefix:
+            # Most nodes have a single child, and for many others it's the first child that we
+            # want. So try that before we search among the node's children.
+            begin, end = first[node], first[node + 1]
+            if labels[begin] == symbol and begin < end:
+                node = begin
+            else:
+                node = labels.find(symbol, begin + 1, end)
+                if node < 0:
+                    return None
+        return self if node == self.__node else self.__handle(node)
+
+    def child(self, transition: str) -> Optional[FrozenTrie]:
+        """
+        Returns the immediate child node, given a transition symbol. Returns None if the transition
+        symbol is invalid.
+
+        Assumes that the transition symbol is already normalized.
+        """
+        if len(transition) != 1:
+            return None
+        node = self.__labels.find(transition, self.__first[self.__node], self.__first[self.__node + 1])
+        return None if node < 0 else self.__handle(node)
+
+    def strings(self) -> Iterator[str]:
+        """
+        Yields all strings that are found in or below this node. The returned strings are emitted
+        back in lexicographical order.
+        """
+        return (string for string, _ in self.__traverse(False))
+
+    def strings2(self) -> Iterator[Tuple[str, Optional[Any]]]:
+        """
+        Yields all (string, meta) pairs that are found in or below this node. The returned pairs are
+        emitted back in lexicographical order.
+        """
+        return self.__traverse(self.__metas is not None)
+
+    def __traverse(self, with_metas: bool) -> Iterator[Tuple[str, Optional[Any]]]:
+        """
+        Internal helper method, does a depth-first traversal below this node and yields the (string, meta)
+        pairs found. Looking up the meta data values is optional.
+        """
+        labels, first, finals, ranks, metas = self.__labels, self.__first, self.__finals, self.__ranks, self.__metas
+        stack = [(self.__node, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if finals[node]:
+                yield (prefix, metas[ranks[node >> 6] + finals.count(1, node & ~63, node)] if with_metas else None)
+            for child in reversed(range(first[node], first[node + 1])):
+                stack.append((child, prefix + labels[child]))
+
+    def transitions(self) -> List[str]:
+        """
+        Returns the set of symbols that are valid outgoing transitions. The returned transitions
+        are emitted back in lexicographical order.
+        """
+        return list(self.__labels[self.__first[self.__node]:self.__first[self.__node + 1]])
+
+    def is_final(self) -> bool:
+        """
+        Returns True iff the current node is a final/terminal state in the trie/automaton.
+        """
+        return self.__finals[self.__node] != 0
+
+    def has_meta(self) -> bool:
+        """
+        Returns True iff the current node is a final/terminal state that has meta data associated
+        with it.
+        """
+        return self.get_meta() is not None
+
+    def get_meta(self) -> Optional[Any]:
+        """
+        Returns the meta data associated with the final/terminal state, or None if no such meta
+        data exists.
+        """
+        node = self.__node
+        if self.__metas is None or not self.__finals[node]:
+            return None
+        return self.__metas[self.__ranks[node >> 6] + self.__finals.count(1, node & ~63, node)]
+
+    def get_node_count(self) -> int:
+        """
+        Returns the number of nodes in the trie, including the root.
+        """
+        return len(self.__finals)
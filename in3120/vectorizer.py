@@ -49,7 +49,7 @@ class Vectorizer:
         # If we did, then we could easily include field weights, e.g., indicate
         # things like the 'title' field being twice as important as the 'body'
         # field and as eight times as important as the 'footnotes' field.
-        all_terms = chain.from_iterable(self._inverted_index.get_terms(buffer or "") for buffer in buffers)
+        all_terms = chain.from_iterable(self._inverted_index.get_terms_many(buffer or "" for buffer in buffers))
         known_terms = filter(lambda t: self._inverted_index.get_document_frequency(t) > 0 and t not in self._stopwords, all_terms)
         term_frequencies = Counter(known_terms)
         return {term: self._tfidf(term, term_frequency) for term, term_frequency in term_frequencies.items()}
@@ -0,0 +1,213 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=line-too-long
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-locals
+# pylint: disable=too-many-branches
+
+import math
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterator, Dict, Any, List, Optional, Tuple
+import numpy as np
+from .sieve import Sieve
+from .ranker import Ranker
+from .corpus import Corpus
+from .posting import Posting
+from .invertedindex import InvertedIndex
+
+
+class WandSearchEngine:
+    """
+    Realizes the same N-of-M matching as SimpleSearchEngine, with the same options and output, but uses
+    dynamic pruning so that documents that cannot possibly make it into the result set are never scored.
+
+    Using per-term score upper bounds derived from statistics precomputed at indexing time, we can use
+    the WAND ("weak AND") algorithm to skip over documents whose score cannot exceed the score of the
+    currently worst document in the sieve. Block-Max WAND (BMW) refines this further by also using
+    upper bounds computed per block of postings, which are typically much tighter than the per-term
+    upper bounds.
+
+    See "Efficient Query Evaluation using a Two-Level Retrieval Process" by Broder et al. and "Faster
+    Top-k Document Retrieval Using Block-Max Indexes" by Ding and Suel for details.
+
+    The top K results are identical to what exhaustive document-at-a-time evaluation would yield,
+    also with respect to how ties are resolved. Pruning requires that the ranker can supply upper
+    bounds, see Ranker.get_upper_bound. If it can't, every candidate document gets scored.
+
+    If pruning is disabled, matching documents are scored in blocks using the ranker's vectorized block
+    scoring, see Ranker.score_block, if it has one.
+
+    Note that our posting iterators offer no way of skipping ahead other than by stepping through
+    the postings one by one. With skip pointers we would also avoid decoding many of the postings
+    that we now just step past.
+    """
+
+    class Cursor:
+        """
+        Keeps track of where we are in a posting list, and what the posting list's current
+        contribution to a document's score can at most be.
+        """
+
+        def __init__(self, rank: int, term: str, multiplicity: int, inverted_index: InvertedIndex, ranker: Ranker):
+            self.rank = rank  # The term's position among the unique query terms.
+            self.term = term
+            self.multiplicity = multiplicity
+            self.__iterator = inverted_index.get_postings_iterator(term)
+            self.posting: Optional[Posting] = next(self.__iterator, None)
+            bound = ranker.get_upper_bound(term, multiplicity, inverted_index.get_max_term_frequency(term))
+            self.upper_bound = math.inf if bound is None else bound
+            blocks = inverted_index.get_block_maxima(term)
+            self.__block_ends = [end for end, _ in blocks]
+            self.__block_bounds = [ranker.get_upper_bound(term, multiplicity, m) for _, m in blocks]
+            self.__block = 0
+            self.block_end = self.__block_ends[0] if blocks else math.inf
+
+        def advance(self, target: int) -> None:
+            """
+            Moves the cursor to the first posting having a document identifier no less than the target.
+            """
+            while self.posting and self.posting.document_id < target:
+                self.posting = next(self.__iterator, None)
+
+        def block_upper_bound(self, target: int) -> float:
+            """
+            Moves the cursor's block pointer (but not the cursor itself) to the block that would contain
+            the target document, and returns the upper bound for that block. Also updates the last document
+            identifier covered by that block.
+            """
+            if self.__block < len(self.__block_ends) and self.__block_ends[self.__block] < target:
+                self.__block = bisect_left(self.__block_ends, target, self.__block)
+            if self.__block >= len(self.__block_ends):
+                self.block_end = math.inf
+                return 0.0
+            self.block_end = self.__block_ends[self.__block]
+            bound = self.__block_bounds[self.__block]
+            return math.inf if bound is None else bound
+
+    # How many documents to score at a time, if we can defer scoring.
+    _block_size = 256
+
+    def __init__(self, corpus: Corpus, inverted_index: InvertedIndex):
+        self.__corpus = corpus
+        self.__inverted_index = inverted_index
+
+    @staticmethod
+    def __score_block(terms: List[Tuple[str, int]], document_ids: List[int], term_frequencies: List[List[int]], ranker: Ranker, sieve: Sieve) -> None:
+        """
+        Scores a block of matching documents and sifts them through the sieve. Uses the ranker's vectorized
+        block scoring if it has one, and falls back to scoring one document at a time otherwise.
+        """
+        if not document_ids:
+            return
+        frequencies = np.array(term_frequencies, dtype=np.int64)[:, :len(document_ids)]
+        scores = ranker.score_block(terms, np.array(document_ids, dtype=np.int64), frequencies)
+        if scores is not None:
+            sieve.sift_array(scores, document_ids)
+            return
+        for i, document_id in enumerate(document_ids):
+            ranker.reset(document_id)
+            for (term, multiplicity), row in zip(terms, term_frequencies):
+                if row[i]:
+                    ranker.update(term, multiplicity, Posting(document_id, row[i]))
+            sieve.sift(ranker.evaluate(), document_id)
+
+    def evaluate(self, query: str, options: Dict[str, Any], ranker: Ranker) -> Iterator[Dict[str, Any]]:
+        """
+        Evaluates the given query, doing N-out-of-M ranked retrieval with dynamic pruning.
+
+        The matching documents, if any, are ranked by the supplied ranker, and only the "best" matches are yielded
+        back to the client as dictionaries having the keys "score" (float) and "document" (Document).
+
+        The client can supply a dictionary of options that controls the query evaluation process: The value of
+        N is inferred from the query via the "match_threshold" (float) option, and the maximum number of documents
+        to return to the client is controlled via the "hit_count" (int) option. The pruning strategy can be set
+        via the "pruning" (str) option, and should be one of "none", "wand" or "bmw". The default is "bmw".
+        """
+        # Unique query terms, in order of first appearance, and their multiplicities.
+        multiplicities = Counter(self.__inverted_index.get_terms(query))
+        m = len(multiplicities)
+        if m == 0:
+            return
+        n = max(1, min(m, int(options.get("match_threshold", 0.5) * m)))
+        hit_count = max(1, options.get("hit_count", 10))
+        pruning = options.get("pruning", "bmw")
+        assert pruning in ("none", "wand", "bmw")
+
+        # One cursor per query term, but drop empty posting lists right away.
+        cursors = [__class__.Cursor(i, t, c, self.__inverted_index, ranker) for i, (t, c) in enumerate(multiplicities.items())]
+        cursors = [cursor for cursor in cursors if cursor.posting]
+        if pruning == "none":
+            for cursor in cursors:
+                cursor.upper_bound = math.inf
+
+        # For keeping track of the best-scoring documents. Also tells us the bar that a document must clear.
+        sieve = Sieve(hit_count)
+
+        # Documents that have been found to match but that are yet to be scored, if we score in blocks. We keep
+        # one row of term frequencies per query term, where a zero means that the document doesn't contain it.
+        terms = list(multiplicities.items())
+        block_ids, block_frequencies = [], [[0] * self._block_size for _ in terms]
+
+        # Each round either scores a document or moves at least one cursor forward.
+        while len(cursors) >= n:
+            cursors.sort(key=lambda c: c.posting.document_id)
+            threshold = sieve.threshold()
+            threshold = -math.inf if threshold is None else threshold
+
+            # Locate the pivot, i.e., the first document that has a chance of beating the threshold
+            # and that at least N of the posting lists might contain. Everything before the pivot
+            # document can be skipped. Include all cursors that are already positioned at the pivot.
+            pivot = None
+            accumulated = 0.0
+            for i, cursor in enumerate(cursors):
+                accumulated += cursor.upper_bound
+                if i + 1 >= n and accumulated > threshold:
+                    pivot = i
+                    break
+            if pivot is None:
+                break
+            document_id = cursors[pivot].posting.document_id
+            while pivot + 1 < len(cursors) and cursors[pivot + 1].posting.document_id == document_id:
+                pivot += 1
+            candidates = cursors[:pivot + 1]
+
+            # Block-Max WAND: If the tighter block-level bounds show that the pivot cannot beat the threshold,
+            # then neither can anything else up until the first block boundary or the next cursor.
+            if pruning == "bmw" and sum(c.block_upper_bound(document_id) for c in candidates) <= threshold:
+                target = min(c.block_end for c in candidates) + 1
+                if pivot + 1 < len(cursors):
+                    target = min(target, cursors[pivot + 1].posting.document_id)
+                for cursor in candidates:
+                    cursor.advance(target)
+
+            # All candidates are positioned at the pivot document. Score it! Visit the terms in query order
+            # so that the floating point arithmetic is deterministic. Without pruning nothing depends on the
+            # sieve's threshold, so we can defer the scoring and do it a block of documents at a time.
+            elif cursors[0].posting.document_id == document_id:
+                if pruning == "none":
+                    block_ids.append(document_id)
+                    for cursor in candidates:
+                        block_frequencies[cursor.rank][len(block_ids) - 1] = cursor.posting.term_frequency
+                    if len(block_ids) == self._block_size:
+                        self.__score_block(terms, block_ids, block_frequencies, ranker, sieve)
+                        block_ids, block_frequencies = [], [[0] * self._block_size for _ in terms]
+                else:
+                    ranker.reset(document_id)
+                    for cursor in sorted(candidates, key=lambda c: c.rank):
+                        ranker.update(cursor.term, cursor.multiplicity, cursor.posting)
+                    sieve.sift(ranker.evaluate(), document_id)
+                for cursor in candidates:
+                    cursor.advance(document_id + 1)
+
+            # Nothing before the pivot document can be a match, so catch up.
+            else:
+                for cursor in candidates:
+                    cursor.advance(document_id)
+
+            # Drop exhausted posting lists.
+            cursors = [cursor for cursor in cursors if cursor.posting]
+
+        # Score whatever is left over, and emit the best matches!
+        self.__score_block(terms, block_ids, block_frequencies, ranker, sieve)
+        for score, document_id in sieve.winners():
+            yield {"score": score, "document": self.__corpus[self.__inverted_index.get_document_id(document_id)]}
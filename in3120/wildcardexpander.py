@@ -1,8 +1,9 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=line-too-long
 
-from typing import Iterable, Tuple, Set, List
-from .trie import Trie
+from itertools import chain
+from typing import Iterable, Iterator, Tuple, Set, List
+from .trie import FrozenTrie
 from .normalizer import DummyNormalizer
 from .tokenizer import DummyTokenizer
 
@@ -20,9 +21,9 @@ class WildcardExpander:
     def __init__(self, terms: Iterable[str]):
         # We're going to need prefix lookups, so store the permuterm rotations in a trie.
         # We could have used other prefix-friendly data structures here, too, such as a
-        # B-tree or even just a simple sorted array with binary search on top.
-        self._rotations = Trie()
-
+        # B-tree or even just a simple sorted array with binary search on top. There are
+        # lots of rotations, so we use a compact trie that we build once and for all.
+        #
         # Assume that the provided terms are already properly normalized tokens.
         normalizer = DummyNormalizer()
         tokenizer = DummyTokenizer()
@@ -31,10 +32,10 @@ class WildcardExpander:
         # ['hello$', 'ello$h', 'llo$he', 'lo$hel', 'o$hell', '$hello'] where '$' is
         # a magic sentinel symbol. Associate each rotation with the original term
         # that gave rise to the rotation.
-        for term in terms:
+        def rotations(term: str) -> Iterator[Tuple[str, str]]:
             padded = term + self.get_sentinel()
-            rotations = (padded[i:] + padded[:i] for i in range(len(padded)))
-            self._rotations.add2(((rotation, term) for rotation in rotations), normalizer, tokenizer)
+            return ((padded[i:] + padded[:i], term) for i in range(len(padded)))
+        self._rotations = FrozenTrie.from_strings2(chain.from_iterable(map(rotations, terms)), normalizer, tokenizer)
 
     def _lookup(self, key: str, is_prefix: bool) -> Set[str]:
         """
@@ -49,7 +50,7 @@ class WildcardExpander:
             return set()
         if not is_prefix:
             return set() if not node.is_final() else {node.get_meta()}
-        return set(node.consume(tail).get_meta() for tail in node.strings())
+        return set(term for _, term in node.strings2())
 
     def get_sentinel(self) -> str:
         """
@@ -61,8 +61,8 @@ class WindowFinder:
         # The individual normalized query terms, including their counts if they are not distinct.
         query_terms = Counter(self.__normalizer.normalize(t) for t in self.__tokenizer.strings(query))
 
-        # The buffer terms and their surface-form ranges. Generated lazily, scanned once.
-        buffer_terms = ((self.__normalizer.normalize(t), _) for t, _ in self.__tokenizer.tokens(buffer))
+        # The buffer terms and their character spans. Generated lazily, scanned once.
+        buffer_terms = ((self.__normalizer.normalize(t), span) for t, span in self.__tokenizer.tokens(buffer))
 
         # Bookkeeping.
         infinity = 99999999    # Just a really large value.
@@ -70,8 +70,8 @@ class WindowFinder:
         counts = {}            # Our current distribution of query terms within the sliding window.
         covered = 0            # How many of the query terms that we have fully covered within the sliding window.
         smallest_w = infinity  # The width of the smallest window seen so far, that covers all query terms.
-        smallest_b = 0         # Where the smallest window seen so far begins, if found.
-        smallest_e = 0         # Where the smallest window seen so far ends, if found.
+        smallest_b = 0         # The character position where the smallest window seen so far begins, if found.
+        smallest_e = 0         # The character position where the smallest window seen so far ends, if found.
 
         # Scan, keeping a sliding window!
         for buffer_term, span in buffer_terms:
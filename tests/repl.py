@@ -4,14 +4,11 @@
 # pylint: disable=line-too-long
 # pylint: disable=broad-exception-caught
 
-import json
 import os
 import pprint
 import sys
 from timeit import default_timer as timer
 from typing import Callable, Any
-from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
-from urllib.parse import unquote
 from context import in3120
 
 
@@ -61,44 +58,16 @@ def simple_repl(prompt: str, evaluator: Callable[[str], Any]):
 
 
 # Define a small REPL to query from localhost:8000 on a per keypress basis.
-# Coordinated with index.html.
+# Coordinated with index.html. Queries are evaluated by a pool of worker
+# processes that inherit the already built engines.
 def simple_ajax(evaluator: Callable[[str], Any]):
-    class MyEncoder(json.JSONEncoder):
-        """
-        Custom JSON encoder, so that we can serialize custom IN3120 objects.
-        """
-        def default(self, o):
-            if hasattr(o, 'to_dict') and callable(getattr(o, 'to_dict')):
-                return o.to_dict()
-            return json.JSONEncoder.default(self, o)
-    class MyHandler(SimpleHTTPRequestHandler):
-        """
-        Custom HTTP handler. Supports GET only, suppresses all log messages.
-        """
-        def do_GET(self):
-            if self.path.startswith("/query"):
-                query = unquote(self.path.split('=')[1])
-                start = timer()
-                matches = evaluator(query)
-                end = timer()
-                results = {"duration": end - start, "matches": matches}
-                self.send_response(200)
-                self.send_header("Content-type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps(results, cls=MyEncoder).encode())
-            else:
-                super().do_GET()
-        def log_message(self, format, *args):
-            pass
     port = 8000
-    with ThreadingHTTPServer(("", port), MyHandler) as httpd:
-        print(f"{Fore.GREEN}Server running on localhost:{port}, open your browser.{Style.RESET_ALL}")
+    def started(bound: int):
+        print(f"{Fore.GREEN}Server running on localhost:{bound}, open your browser.{Style.RESET_ALL}")
         print(f"{Fore.LIGHTYELLOW_EX}Ctrl-C to exit.{Style.RESET_ALL}")
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print(f"{Fore.LIGHTYELLOW_EX}Bye!{Style.RESET_ALL}")
-            httpd.server_close()
+    with in3120.QueryServer(evaluator, root=os.path.dirname(os.path.abspath(__file__))) as server:
+        server.run("", port, started)
+    print(f"{Fore.LIGHTYELLOW_EX}Bye!{Style.RESET_ALL}")
 
 
 def repl_a_1():
@@ -124,6 +93,20 @@ def repl_a_2():
     simple_repl("query", lambda e: list(engine.evaluate(e, options)))
 
 
+def repl_a_3():
+    print("Building static score ordered inverted index from Pantheon corpus...")
+    normalizer = in3120.SimpleNormalizer()
+    tokenizer = in3120.SimpleTokenizer()
+    pipeline = in3120.DocumentPipeline([lambda d: d.set_field("static_quality_score", d.get_field("HPI", "")) or d])
+    corpus = in3120.InMemoryCorpus(data_path("pantheon.tsv"), pipeline=pipeline)
+    index = in3120.StaticScoreOrderedInvertedIndex(corpus, ["name", "occupation", "countryName"], normalizer, tokenizer)
+    engine = in3120.BooleanSearchEngine(corpus, index)
+    options = {"optimize": True, "hit_count": 5}
+    print("Enter a complex Boolean query expression and find the most notable matching people.")
+    print(f"Lookup options are {options}.")
+    simple_repl("query", lambda e: list(engine.evaluate(e, options)))
+
+
 def repl_b_1():
     print("Building suffix array from Cranfield corpus...")
     normalizer = in3120.SimpleNormalizer()
@@ -258,7 +241,7 @@ def repl_d_2():
 
 def repl_d_3():
     print("Indexing English news corpus...")
-    normalizer = in3120.PorterNormalizer()
+    normalizer = in3120.CachingNormalizer(in3120.PorterNormalizer())
     tokenizer = in3120.SimpleTokenizer()
     corpus = in3120.InMemoryCorpus(data_path("en.txt"))
     index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, tokenizer)
@@ -418,7 +401,7 @@ def repl_x_7():
 
 def repl_x_8():
     print("Loading Frankenstein...")
-    normalizer = in3120.PorterNormalizer()
+    normalizer = in3120.CachingNormalizer(in3120.PorterNormalizer())
     tokenizer = in3120.SimpleTokenizer()
     finder = in3120.WindowFinder(normalizer, tokenizer)
     with open(data_path("frankenstein.txt"), "r", encoding="utf-8") as f:
@@ -444,6 +427,7 @@ def main():
     repls = {
         "a-1": repl_a_1,  # A.
         "a-2": repl_a_2,  # A.
+        "a-3": repl_a_3,  # A.
         "b-1": repl_b_1,  # B-1.
         "b-2": repl_b_2,  # B-1.
         "b-3": repl_b_3,  # B-1.
@@ -0,0 +1,109 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from types import GeneratorType
+from context import in3120
+
+
+class TestAhoCorasickFinder(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+
+    def __finder(self, strings, tokenizer=None):
+        trie = in3120.Trie.from_strings(strings, self.__normalizer, self.__tokenizer)
+        return in3120.AhoCorasickFinder(trie, self.__normalizer, tokenizer or self.__tokenizer)
+
+    def __simple_verify(self, finder, text, expected, leftmost_longest=False):
+        matches = list(finder.scan(text, leftmost_longest))
+        self.assertListEqual([(m["surface"], m["match"]) for m in matches], expected)
+
+    def test_scan_matches_and_surface_forms_only(self):
+        finder = self.__finder(["romerike", "apple computer", "norsk", "norsk ørret", "sverige", "ørret", "banan", "a", "a b"])
+        self.__simple_verify(finder, "en Norsk     ØRRET fra romerike likte abba fra Sverige",
+                             [("Norsk", "norsk"), ("Norsk ØRRET", "norsk ørret"), ("ØRRET", "ørret"), ("romerike", "romerike"), ("Sverige", "sverige")])
+        self.__simple_verify(finder, "the apple is red", [])
+        self.__simple_verify(finder, "", [])
+        self.__simple_verify(finder, "a a b", [("a", "a"), ("a", "a"), ("a b", "a b")])
+
+    def test_scan_matches_and_spans(self):
+        finder = self.__finder(["eple", "drue", "appelsin", "drue appelsin rosin banan papaya"])
+        results = list(finder.scan("et EPLE og en drue   appelsin  rosin banan papaya frukt"))
+        self.assertListEqual(results, [{'surface': 'EPLE', 'span': (3, 7), 'match': 'eple', 'meta': None},
+                                       {'surface': 'drue', 'span': (14, 18), 'match': 'drue', 'meta': None},
+                                       {'surface': 'appelsin', 'span': (21, 29), 'match': 'appelsin', 'meta': None},
+                                       {'surface': 'drue appelsin rosin banan papaya', 'span': (14, 49),
+                                        'match': 'drue appelsin rosin banan papaya', 'meta': None}])
+
+    def test_failure_links(self):
+        finder = self.__finder(["a b c d", "b c", "c", "b c e"])
+        self.__simple_verify(finder, "a b c e", [("b c", "b c"), ("c", "c"), ("b c e", "b c e")])
+        self.__simple_verify(finder, "a b a b c d", [("b c", "b c"), ("c", "c"), ("a b c d", "a b c d")])
+        self.assertEqual(9, finder.get_state_count())
+
+    def test_leftmost_longest(self):
+        finder = self.__finder(["a", "a b c", "b", "b c d e", "c d", "e"])
+        self.__simple_verify(finder, "a b d", [("a", "a"), ("b", "b")], True)
+        self.__simple_verify(finder, "a b c d e", [("a b c", "a b c"), ("e", "e")], True)
+        self.__simple_verify(finder, "x b c d e a", [("b c d e", "b c d e"), ("a", "a")], True)
+        self.__simple_verify(finder, "", [], True)
+        self.assertEqual(6, len(list(finder.scan("a b c d e"))))
+
+    def test_with_phonetic_normalizer_and_meta(self):
+        normalizer = in3120.SoundexNormalizer()
+        strings = ["Benedikt Richardson", "Smith"]
+        trie = in3120.Trie.from_strings2(((x, x) for x in strings), normalizer, self.__tokenizer)
+        finder = in3120.AhoCorasickFinder(trie, normalizer, self.__tokenizer)
+        results = list(finder.scan("The Benedict  Richards and Smithe conjecture was proven false!"))
+        self.assertListEqual(results, [{'surface': 'Benedict Richards', 'span': (4, 22), 'match': 'B532 R263', 'meta': 'Benedikt Richardson'},
+                                       {'surface': 'Smithe', 'span': (27, 33), 'match': 'S530', 'meta': 'Smith'}])
+
+    def test_with_unigram_tokenizer_for_finding_arbitrary_substrings(self):
+        finder = self.__finder(["needle", "banana", "nana", "pine apple"], in3120.UnigramTokenizer())
+        results = list(finder.scan("thereisaneEdleinthishaystacksomewherebananapineapple"))
+        self.assertListEqual(results, [{'surface': 'neEdle', 'span': (8, 14), 'match': 'needle', 'meta': None},
+                                       {'surface': 'banana', 'span': (37, 43), 'match': 'banana', 'meta': None},
+                                       {'surface': 'nana', 'span': (39, 43), 'match': 'nana', 'meta': None}])
+        self.__simple_verify(finder, "bananana", [("banana", "banana")], True)
+
+    def test_uses_yield(self):
+        finder = self.__finder(["foo"])
+        self.assertIsInstance(finder.scan("the foo bar"), GeneratorType)
+        self.assertIsInstance(finder.scan("the foo bar", True), GeneratorType)
+
+    def test_mesh_terms_in_cran_corpus(self):
+        mesh = in3120.InMemoryCorpus("../data/mesh.txt")
+        cran = in3120.InMemoryCorpus("../data/cran.xml")
+        trie = in3120.Trie.from_strings((d["body"] or "" for d in mesh), self.__normalizer, self.__tokenizer)
+        for compiled in (trie, in3120.FrozenTrie.from_trie(trie), in3120.Dawg.from_trie(trie)):
+            finder = in3120.AhoCorasickFinder(compiled, self.__normalizer, self.__tokenizer)
+            self.__simple_verify(finder, cran[0]["body"], [("wing", "wing"), ("wing", "wing")])
+            self.__simple_verify(finder, cran[3]["body"], [("solutions", "solutions"), ("skin", "skin"), ("friction", "friction")])
+            self.__simple_verify(finder, cran[1254]["body"], [("electrons", "electrons"), ("ions", "ions")])
+
+    def test_same_as_restarting_trie_walks(self):
+        mesh = in3120.InMemoryCorpus("../data/mesh.txt")
+        cran = in3120.InMemoryCorpus("../data/cran.xml")
+        trie = in3120.Trie.from_strings((d["body"] or "" for d in mesh), self.__normalizer, self.__tokenizer)
+        finder = in3120.AhoCorasickFinder(trie, self.__normalizer, self.__tokenizer)
+        for document in list(cran)[:100]:
+            tokens = list(self.__tokenizer.tokens(document["body"]))
+            expected = []
+            for begin in range(len(tokens)):
+                node = trie
+                for end in range(begin, len(tokens)):
+                    node = node.consume(("" if end == begin else " ") + self.__normalizer.normalize(tokens[end][0]))
+                    if node is None:
+                        break
+                    if node.is_final():
+                        expected.append((end, begin, tokens[begin][1][0], tokens[end][1][1]))
+            expected.sort()
+            self.assertListEqual([m["span"] for m in finder.scan(document["body"])], [(b, e) for _, _, b, e in expected])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
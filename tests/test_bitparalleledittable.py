@@ -0,0 +1,63 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest
+from context import in3120
+
+
+class TestBitParallelEditTable(unittest.TestCase):
+
+    def test_stringify(self):
+        stringified = in3120.BitParallelEditTable("elephant", "relevant").stringify()
+        lines = [line for line in stringified.split("\n") if line]
+        self.assertEqual(2 + len("elephant"), len(lines))
+        self.assertEqual(lines[0].replace(" ", ""), "relevant")
+        self.assertListEqual([int(v) for v in lines[1].split()], list(range(9)))
+        self.assertListEqual([int(v) for v in lines[-1].split()[1:]], [8, 8, 7, 7, 6, 6, 5, 4, 3])
+
+    def test_distance(self):
+        self.assertEqual(3, in3120.BitParallelEditTable("cat", "dog").distance())
+        self.assertEqual(1, in3120.BitParallelEditTable("elephant", "elephnat").distance())
+        self.assertEqual(3, in3120.BitParallelEditTable("elephant", "relevant").distance())
+        self.assertEqual(2, in3120.BitParallelEditTable("object", "inject").distance())
+        self.assertEqual(7, in3120.BitParallelEditTable("bullfrog", "frogger").distance())
+        self.assertEqual(0, in3120.BitParallelEditTable("same", "same").distance())
+        self.assertEqual(3, in3120.BitParallelEditTable("ca", "abc").distance())
+        self.assertEqual(4, in3120.BitParallelEditTable("", "abcd").distance())
+        self.assertEqual(4, in3120.BitParallelEditTable("abcd", "").distance())
+        self.assertEqual(7, in3120.BitParallelEditTable("elephant", "relevant").distance(3))
+
+    def test_long_query(self):
+        query = "pneumonoultramicroscopicsilicovolcanoconiosis" * 2
+        self.assertEqual(0, in3120.BitParallelEditTable(query, query).distance())
+        self.assertEqual(2, in3120.BitParallelEditTable(query, query[1:-1]).distance())
+        self.assertEqual(1, in3120.BitParallelEditTable(query, query[:50] + query[51] + query[50] + query[52:]).distance())
+
+    def test_update2_and_backtracking(self):
+        table = in3120.BitParallelEditTable("elephant", "", False)
+        for j, symbol in enumerate("elephnat", 1):
+            table.update2(j, symbol)
+        self.assertEqual(1, table.distance(8))
+        self.assertEqual("elephnat", table.prefix(8))
+        self.assertEqual(0, table.update2(6, "a"))
+        self.assertEqual(0, table.update2(7, "n"))
+        self.assertEqual(0, table.update2(8, "t"))
+        self.assertEqual(0, table.distance(8))
+        self.assertEqual(1, table.update2(9, "s"))
+        self.assertEqual(1, table.distance(9))
+        self.assertEqual("elephants", table.prefix(9))
+
+    def test_same_as_dynamic_programming(self):
+        strings = ["", "a", "ab", "ba", "abc", "bca", "cab", "abab", "baba", "aabbc", "cbaab", "abcabc", "bacbca"]
+        for query in strings:
+            for candidate in strings:
+                table = in3120.BitParallelEditTable(query, candidate)
+                self.assertEqual(in3120.LevenshteinAutomaton(query, 10).match(candidate), table.distance(), (query, candidate))
+                minimums = [table.update(j) for j in range(1, len(candidate) + 1)]
+                for j, minimum in enumerate(minimums, 1):
+                    self.assertEqual(min(in3120.LevenshteinAutomaton(query[:i], 10).match(candidate[:j]) for i in range(len(query) + 1)), minimum)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -68,6 +68,34 @@ class TestBooleanSearchEngine(unittest.TestCase):
                 counts[optimize] = len(index.get_history())
             self.assertGreater(counts[False], counts[True])
 
+    def test_hit_count(self):
+        options = {"optimize": True, "hit_count": 2}
+        self._verify_matches("OR(AND(mary, smith), AND(OR(peter, xzyds), lee))", [849, 1356], options)
+        options = {"optimize": True, "hit_count": 0}
+        self._verify_matches("OR(AND(mary, smith), AND(OR(peter, xzyds), lee))", [], options)
+
+    def test_static_score_ordering(self):
+        normalizer = in3120.SimpleNormalizer()
+        tokenizer = in3120.SimpleTokenizer()
+        corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        fields = ["title", "description"]
+        inner = in3120.StaticScoreOrderedInvertedIndex(corpus, fields, normalizer, tokenizer)
+        expression = "OR(love, war, AND(young, man))"
+        unordered = in3120.BooleanSearchEngine(corpus, in3120.InMemoryInvertedIndex(corpus, fields, normalizer, tokenizer))
+        everything = [m["document"] for m in unordered.evaluate(expression, {})]
+        expected = [d.document_id for d in sorted(everything, key=lambda d: (-inner.get_static_score(d), d.document_id))]
+        self.assertGreater(len(expected), 50)
+        ordered = in3120.BooleanSearchEngine(corpus, inner)
+        self.assertListEqual(expected, [m["document"].document_id for m in ordered.evaluate(expression, {})])
+        counts = {}
+        for hit_count in (5, len(expected)):
+            index = in3120.AccessLoggedInvertedIndex(inner)
+            engine = in3120.BooleanSearchEngine(corpus, index)
+            results = [m["document"].document_id for m in engine.evaluate(expression, {"hit_count": hit_count})]
+            self.assertListEqual(expected[:hit_count], results)
+            counts[hit_count] = len(index.get_history())
+        self.assertGreater(counts[len(expected)], 3 * counts[5])
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
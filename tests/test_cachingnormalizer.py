@@ -0,0 +1,54 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestCachingNormalizer(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.CachingNormalizer(in3120.PorterNormalizer(), 3)
+
+    def test_normalize_same_as_wrapped(self):
+        porter = in3120.PorterNormalizer()
+        tokens = "such an analysis can reveal features that are not easily visible from the variations in the individual genes".split()
+        for token in tokens + tokens:
+            self.assertEqual(porter.normalize(token), self.__normalizer.normalize(token))
+        self.assertEqual(in3120.SimpleNormalizer().canonicalize("ﬁ"), self.__normalizer.canonicalize("ﬁ"))
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.__normalizer.normalize("")
+        self.assertEqual(0, self.__normalizer.get_statistics()["size"])
+
+    def test_statistics_and_eviction(self):
+        self.assertEqual(0.0, self.__normalizer.get_hit_rate())
+        for token in ["genes", "genes", "features", "genes", "visible", "variations", "genes", "features"]:
+            self.__normalizer.normalize(token)
+        self.assertDictEqual({"hits": 3, "misses": 5, "size": 3, "capacity": 3}, self.__normalizer.get_statistics())
+        self.assertAlmostEqual(3 / 8, self.__normalizer.get_hit_rate())
+        self.__normalizer.clear()
+        self.assertDictEqual({"hits": 0, "misses": 0, "size": 0, "capacity": 3}, self.__normalizer.get_statistics())
+
+    def test_unbounded(self):
+        normalizer = in3120.CachingNormalizer(in3120.SimpleNormalizer(), None)
+        for i in range(1000):
+            self.assertEqual(f"x{i}", normalizer.normalize(f"X{i}"))
+        self.assertDictEqual({"hits": 0, "misses": 1000, "size": 1000, "capacity": 0}, normalizer.get_statistics())
+
+    def test_indexing_with_cache(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"body": "the genes and the features of the genes"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"body": "the feature of the gene"}))
+        normalizer = in3120.CachingNormalizer(in3120.PorterNormalizer())
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], normalizer, in3120.SimpleTokenizer())
+        self.assertListEqual([0, 1], [p.document_id for p in index["gene"]])
+        self.assertEqual(6, normalizer.get_statistics()["hits"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
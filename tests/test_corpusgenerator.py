@@ -0,0 +1,89 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import os
+import tempfile
+import unittest
+from collections import Counter
+from context import in3120
+
+
+class TestCorpusGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self._generator = in3120.CorpusGenerator(vocabulary_size=500, document_length=20, seed=42)
+
+    def test_vocabulary(self):
+        vocabulary = self._generator.get_vocabulary()
+        self.assertEqual(500, len(vocabulary))
+        self.assertEqual(500, len(set(vocabulary)))
+        self.assertTrue(all(len(w1) <= len(w2) for w1, w2 in zip(vocabulary, vocabulary[1:])))
+        self.assertAlmostEqual(1.0, sum(self._generator.get_probability(w) for w in vocabulary))
+
+    def test_is_deterministic(self):
+        other = in3120.CorpusGenerator(vocabulary_size=500, document_length=20, seed=42)
+        self.assertListEqual(list(self._generator.documents(20)), list(other.documents(20)))
+        self.assertListEqual(list(self._generator.documents(10)), list(other.documents(20))[:10])
+        self.assertListEqual(list(self._generator.queries("boolean", 10)), list(other.queries("boolean", 10)))
+        different = in3120.CorpusGenerator(vocabulary_size=500, document_length=20, seed=43)
+        self.assertNotEqual(list(self._generator.documents(5)), list(different.documents(5)))
+
+    def test_follows_zipfs_law(self):
+        counts = Counter(w for d in self._generator.documents(1000) for w in d["body"].split())
+        vocabulary = self._generator.get_vocabulary()
+        self.assertGreater(counts[vocabulary[0]], counts[vocabulary[1]])
+        self.assertGreater(counts[vocabulary[1]], counts[vocabulary[9]])
+        self.assertGreater(counts[vocabulary[9]], counts[vocabulary[99]])
+        total = sum(counts.values())
+        self.assertAlmostEqual(self._generator.get_probability(vocabulary[0]), counts[vocabulary[0]] / total, delta=0.01)
+
+    def test_corpus(self):
+        corpus = self._generator.corpus(10)
+        self.assertEqual(10, corpus.size())
+        for document, fields in zip(corpus, self._generator.documents(10)):
+            self.assertEqual(fields["body"], document.get_field("body", None))
+            self.assertEqual(fields["title"], document.get_field("title", None))
+            self.assertTrue(0.0 <= document.get_field("static_quality_score", None) <= 1.0)
+
+    def test_write_and_load_all_formats(self):
+        documents = list(self._generator.documents(25))
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ("txt", "xml", "json", "csv", "tsv"):
+                filename = os.path.join(directory, f"synthetic.{extension}")
+                self._generator.write(filename, 25)
+                corpus = in3120.InMemoryCorpus(filename)
+                self.assertEqual(25, corpus.size())
+                self.assertListEqual([d["body"] for d in documents], [d.get_field("body", None) for d in corpus])
+            with self.assertRaises(IOError):
+                self._generator.write(os.path.join(directory, "synthetic.pdf"), 25)
+
+    def test_boolean_queries(self):
+        corpus = self._generator.corpus(50)
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+        engine = in3120.BooleanSearchEngine(corpus, index)
+        for query in self._generator.queries("boolean", 50):
+            for match in engine.evaluate(query, {}):
+                self.assertIn("document", match)
+
+    def test_wildcard_and_fuzzy_queries(self):
+        vocabulary = self._generator.get_vocabulary()
+        expander = in3120.WildcardExpander(vocabulary)
+        for query in self._generator.queries("wildcard", 50):
+            self.assertEqual(1, query.count("*"))
+            self.assertGreater(len(query), 1)
+            self.assertTrue(expander.expand(query))
+        for query in self._generator.queries("fuzzy", 50):
+            self.assertTrue(query)
+
+    def test_write_queries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "queries.txt")
+            self._generator.write_queries(filename, "n_of_m", 30)
+            with open(filename, mode="r", encoding="utf-8") as file:
+                self.assertListEqual(list(self._generator.queries("n_of_m", 30)), file.read().splitlines())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
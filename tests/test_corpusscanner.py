@@ -0,0 +1,53 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from types import GeneratorType
+from context import in3120
+
+
+class TestCorpusScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+        mesh = in3120.InMemoryCorpus("../data/mesh.txt")
+        trie = in3120.FrozenTrie.from_strings((d["body"] or "" for d in mesh), self.__normalizer, self.__tokenizer)
+        self.__finder = in3120.AhoCorasickFinder(trie, self.__normalizer, self.__tokenizer)
+        self.__corpus = in3120.InMemoryCorpus("../data/cran.xml")
+
+    def __expected(self, fields):
+        return [dict(match, document_id=document.document_id, field=field)
+                for document in self.__corpus for field in fields for match in self.__finder.scan(document.get_field(field, None) or "")]
+
+    def test_same_as_scanning_one_buffer_at_a_time(self):
+        expected = self.__expected(["title", "body"])
+        self.assertGreater(len(expected), 1000)
+        for processes, batch_size in ((1, 64), (2, 7), (3, 1000)):
+            with in3120.CorpusScanner(self.__finder, processes, batch_size) as scanner:
+                self.assertListEqual(expected, list(scanner.scan_corpus(self.__corpus, ["title", "body"])))
+
+    def test_missing_and_empty_fields(self):
+        corpus = [in3120.InMemoryDocument(0, {"a": "wing skin"}), in3120.InMemoryDocument(1, {"a": ""}), in3120.InMemoryDocument(2, {"b": "ions"})]
+        with in3120.CorpusScanner(self.__finder, 2) as scanner:
+            results = [(m["document_id"], m["field"], m["match"]) for m in scanner.scan_corpus(corpus, ["a", "b", "c"])]
+            self.assertListEqual(results, [(0, "a", "wing"), (0, "a", "skin"), (2, "b", "ions")])
+            self.assertListEqual(list(scanner.scan_corpus([], ["a"])), [])
+
+    def test_uses_yield(self):
+        with in3120.CorpusScanner(self.__finder, 1) as scanner:
+            self.assertIsInstance(scanner.scan_corpus(self.__corpus, ["body"]), GeneratorType)
+
+    def test_tagging_at_load_time(self):
+        with in3120.CorpusScanner(self.__finder, 1) as scanner:
+            pipeline = in3120.DocumentPipeline([scanner.processor("body", "mesh")])
+            corpus = in3120.InMemoryCorpus("../data/cran.xml", pipeline=pipeline)
+            self.assertListEqual([m["match"] for m in corpus[3]["mesh"]], ["solutions", "skin", "friction"])
+            for document in corpus:
+                self.assertListEqual(document["mesh"], list(self.__finder.scan(document["body"] or "")))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,79 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestDawg(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+        self.__root = in3120.Dawg.from_strings(["tap", "taps", "top", "tops"], self.__normalizer, self.__tokenizer)
+
+    def test_is_minimal(self):
+        self.assertEqual(5, self.__root.get_node_count())
+        self.assertEqual(5, self.__root.get_edge_count())
+        self.assertEqual(8, in3120.FrozenTrie.from_strings(["tap", "taps", "top", "tops"], self.__normalizer, self.__tokenizer).get_node_count())
+
+    def test_consume_and_final(self):
+        root = self.__root
+        self.assertFalse(root.is_final())
+        self.assertIsNone(root.consume("tip"))
+        self.assertIsNone(root.consume("tapx"))
+        node = root["ta"]
+        self.assertFalse(node.is_final())
+        node = node.consume("p")
+        self.assertIs(node, node.consume(""))
+        self.assertTrue(node.is_final())
+        self.assertEqual(node, root.consume("tap"))
+        self.assertNotEqual(node, root.consume("top"))
+        self.assertListEqual(node.transitions(), root.consume("top").transitions())
+
+    def test_containment(self):
+        self.assertTrue("taps" in self.__root)
+        self.assertFalse("ta" in self.__root)
+        self.assertFalse("tapss" in self.__root)
+        self.assertTrue("ops" in self.__root.child("t"))
+        self.assertIsNone(self.__root.child("ta"))
+        self.assertIsNone(self.__root.child(""))
+
+    def test_dump_strings(self):
+        self.assertListEqual(list(self.__root.strings()), ["tap", "taps", "top", "tops"])
+        self.assertListEqual(list(self.__root.consume("to")), ["p", "ps"])
+        self.assertListEqual(list(self.__root.consume("tops").strings()), [""])
+
+    def test_with_meta_data(self):
+        root = in3120.Dawg.from_strings2([("tops", 4), ("tap", 1), ("taps", 2), ("top", 3), ("top", 3), ("nei", None)], self.__normalizer, self.__tokenizer)
+        self.assertFalse(root.has_meta())
+        self.assertIsNone(root.consume("ta").get_meta())
+        self.assertEqual(root.consume("tap").get_meta(), 1)
+        self.assertEqual(root.consume("taps").get_meta(), 2)
+        self.assertEqual(root.consume("top").get_meta(), 3)
+        self.assertEqual(root.consume("tops").get_meta(), 4)
+        self.assertTrue(root.consume("nei").is_final())
+        self.assertFalse(root.consume("nei").has_meta())
+        self.assertListEqual(list(root.consume("t").strings2()), [("ap", 1), ("aps", 2), ("op", 3), ("ops", 4)])
+        with self.assertRaises(AssertionError):
+            in3120.Dawg.from_strings2([("abba", 74), ("ABBA", 99)], self.__normalizer, self.__tokenizer)
+
+    def test_same_as_trie(self):
+        strings = [d["body"] for d in in3120.InMemoryCorpus("../data/mesh.txt")][:2000]
+        trie = in3120.Trie.from_strings2(((s, len(s)) for s in strings), self.__normalizer, self.__tokenizer)
+        frozen = in3120.FrozenTrie.from_trie(trie)
+        for dawg in (in3120.Dawg.from_trie(trie), in3120.Dawg.from_strings2(((s, len(s)) for s in strings), self.__normalizer, self.__tokenizer)):
+            self.assertListEqual(list(trie.strings2()), list(dawg.strings2()))
+            self.assertLess(3 * dawg.get_node_count(), 2 * frozen.get_node_count())
+            for string in trie.strings():
+                for i in range(0, len(string) + 1, 3):
+                    node1, node2 = trie.consume(string[:i]), dawg.consume(string[:i])
+                    self.assertListEqual(node1.transitions(), node2.transitions())
+                    self.assertEqual(node1.is_final(), node2.is_final())
+                    self.assertEqual(node1.get_meta(), node2.get_meta())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
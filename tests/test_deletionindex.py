@@ -0,0 +1,59 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import random
+import unittest
+from context import in3120
+
+
+class TestDeletionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+
+    def test_lookup(self):
+        index = in3120.DeletionIndex.from_strings(["elephant", "Relevant", "elegant", "ELEPHANTS", "bullfrog", "elephnat"], self.__normalizer, self.__tokenizer, 2)
+        self.assertEqual(6, len(index))
+        self.assertEqual(2, index.get_upper_bound())
+        self.assertListEqual(list(index.lookup("elephant")), [(2, "elegant", None), (0, "elephant", None), (1, "elephants", None), (1, "elephnat", None)])
+        self.assertListEqual(list(index.lookup("elephant", 1)), [(0, "elephant", None), (1, "elephants", None), (1, "elephnat", None)])
+        self.assertListEqual(list(index.lookup("elephant", 0)), [(0, "elephant", None)])
+        self.assertListEqual(list(index.lookup("relevnat")), [(1, "relevant", None)])
+        self.assertListEqual(list(index.lookup("fish")), [])
+        with self.assertRaises(AssertionError):
+            list(index.lookup("elephant", 3))
+
+    def test_with_meta_data(self):
+        index = in3120.DeletionIndex.from_strings2([("abba", 1), ("abbor", 2), ("ørret", None), ("abba", 1)], self.__normalizer, self.__tokenizer, 1)
+        self.assertEqual(3, len(index))
+        self.assertListEqual(list(index.lookup("abbo")), [(1, "abba", 1), (1, "abbor", 2)])
+        self.assertListEqual(list(index.lookup("ørre")), [(1, "ørret", None)])
+        with self.assertRaises(AssertionError):
+            in3120.DeletionIndex.from_strings2([("abba", 1), ("ABBA", 2)], self.__normalizer, self.__tokenizer, 1)
+
+    def test_prefix_length_trades_memory_for_candidates(self):
+        trie = in3120.Trie.from_strings([d["body"] for d in in3120.InMemoryCorpus("../data/mesh.txt")][:1000], self.__normalizer, self.__tokenizer)
+        full = in3120.DeletionIndex.from_trie(trie, 2)
+        prefixed = in3120.DeletionIndex.from_trie(trie, 2, 6)
+        self.assertLess(3 * prefixed.get_entry_count(), full.get_entry_count())
+        self.assertLess(prefixed.get_memory_size(), full.get_memory_size())
+        with self.assertRaises(AssertionError):
+            in3120.DeletionIndex.from_trie(trie, 2, 2)
+
+    def test_same_as_automaton(self):
+        trie = in3120.Trie.from_strings([d["body"] for d in in3120.InMemoryCorpus("../data/mesh.txt")][:1000], self.__normalizer, self.__tokenizer)
+        generator = random.Random(1234)
+        queries = generator.sample(list(trie.strings()), 20)
+        queries = [query[:i] + generator.choice("aeiou") + query[i + 2:] for query, i in ((q, generator.randrange(len(q))) for q in queries)]
+        for prefix_length in (None, 4):
+            index = in3120.DeletionIndex.from_trie(trie, 2, prefix_length)
+            for upper_bound in (0, 1, 2):
+                for query in queries:
+                    self.assertListEqual(list(in3120.LevenshteinAutomaton(query, upper_bound).intersect(trie)), list(index.lookup(query, upper_bound)))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
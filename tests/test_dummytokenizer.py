@@ -23,6 +23,14 @@ class TestDummyTokenizer(unittest.TestCase):
         result = list(self.__tokenizer.spans(" Dette  er en\nprøve!"))
         self.assertListEqual(result, [(0, 20)])
 
+    def test_offsets(self):
+        self.assertListEqual(self.__tokenizer.offsets(" Dette  er en\nprøve!").tolist(), [0, 20])
+        self.assertEqual(0, len(self.__tokenizer.offsets("")))
+
+    def test_tokenize_many(self):
+        buffers = [" Dette  er en\nprøve!", "", "foo"]
+        self.assertListEqual(self.__tokenizer.tokenize_many(buffers), [list(self.__tokenizer.strings(buffer)) for buffer in buffers])
+
     def test_empty_input(self):
         self.assertListEqual(list(self.__tokenizer.strings("")), [])
         self.assertListEqual(list(self.__tokenizer.tokens("")), [])
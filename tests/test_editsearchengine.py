@@ -85,5 +85,53 @@ class TestEditSearchEngine(unittest.TestCase):
                 for result in results:
                     self.assertTrue(result["match"].startswith(query[:max(0, n)]))
 
+    def test_automaton(self):
+        for (k, hits) in [(0, 1), (1, 2), (2, 3), (3, 4), (8, 6), (9, 7)]:
+            options = {"upper_bound": k, "automaton": True}
+            results = list(self._engine.evaluate("  ALEKSANdER ", options))
+            self.assertEqual(hits, len(results))
+            self.assertEqual("aleksander", results[0]["match"])
+            self.assertEqual("rednaskela", results[0]["meta"])
+            self.assertEqual(0, results[0]["distance"])
+        results = list(self._engine.evaluate("aleksnader", {"upper_bound": 1, "automaton": True}))
+        self.assertListEqual([(r["match"], r["distance"]) for r in results], [("aleksander", 1)])
+        for (n, received) in [(0, 7), (1, 1), (2, 0)]:
+            options = {"upper_bound": 10, "first_n": n, "automaton": True}
+            results = list(self._engine.evaluate("øleksander", options))
+            self.assertEqual(received, len(results))
+        for (requested, received) in [(1, 1), (3, 3), (8, 7)]:
+            options = {"upper_bound": 10, "candidate_count": requested, "automaton": True}
+            self.assertEqual(received, len(list(self._engine.evaluate("aleksander", options))))
+
+    def test_deletions(self):
+        normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+        trie = in3120.Trie.from_strings2([("aleksander", "rednaskela"), ("abba", None), ("ørret", None), ("abbor", None),
+                                          ("alleksander", None), ("allekander", None), ("aleksanderrrr", None)], normalizer, tokenizer)
+        engine = in3120.EditSearchEngine(trie, normalizer, tokenizer, in3120.DeletionIndex.from_trie(trie, 10))
+        for query in ["  ALEKSANdER ", "aleksnader", "øleksander", "abbba", "alexander"]:
+            for options in [{"upper_bound": k, "first_n": n} for k in (0, 1, 2, 10) for n in (0, 1, 2)]:
+                expected = list(self._engine.evaluate(query, dict(options, automaton=True)))
+                self.assertListEqual(expected, list(engine.evaluate(query, dict(options, deletions=True))))
+        for (requested, received) in [(1, 1), (3, 3), (8, 7)]:
+            options = {"upper_bound": 10, "candidate_count": requested, "deletions": True}
+            self.assertEqual(received, len(list(engine.evaluate("aleksander", options))))
+        engine = in3120.EditSearchEngine(trie, normalizer, tokenizer, in3120.DeletionIndex.from_trie(trie, 1))
+        self.assertEqual(4, len(list(engine.evaluate("aleksander", {"upper_bound": 3, "deletions": True, "automaton": True}))))
+
+    def test_automaton_terminates_early(self):
+        normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+        trie = in3120.FrozenTrie.from_strings((d["body"] for d in in3120.InMemoryCorpus("../data/mesh.txt")), normalizer, tokenizer)
+        engine = in3120.EditSearchEngine(trie, normalizer, tokenizer)
+        for scoring in ["negated", "normalized", "lopresti"]:
+            tracer = in3120.Tracer()
+            options = {"upper_bound": 3, "hit_count": 3, "scoring": scoring, "automaton": True}
+            results = list(engine.evaluate("hypertension", dict(options, tracer=tracer)))
+            exhaustive = list(engine.evaluate("hypertension", dict(options, hit_count=100)))[:3]
+            self.assertListEqual(results, exhaustive)
+            self.assertEqual("hypertension", results[0]["match"])
+            self.assertLess(tracer.get_counters()["candidates"], 10)
+            self.assertListEqual(["normalize", "search"], sorted(tracer.to_dict()["spans"].keys()))
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
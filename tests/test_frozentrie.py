@@ -0,0 +1,104 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+import tracemalloc
+import inspect
+from context import in3120
+
+
+class TestFrozenTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+        self.__root = in3120.FrozenTrie.from_strings(["abba", "ØRRET", "abb", "abbab", "abbor"], self.__normalizer, self.__tokenizer)
+
+    def test_consume_and_final(self):
+        root = self.__root
+        self.assertFalse(root.is_final())
+        self.assertIsNone(root.consume("snegle"))
+        self.assertIsNone(root.consume("abbx"))
+        node = root["ab"]
+        self.assertFalse(node.is_final())
+        node = node.consume("b")
+        self.assertIs(node, node.consume(""))
+        self.assertTrue(node.is_final())
+        self.assertEqual(node, root.consume("abb"))
+        self.assertNotEqual(node, root.consume("ab"))
+        self.assertEqual(13, root.get_node_count())
+
+    def test_containment(self):
+        self.assertTrue("ørret" in self.__root)
+        self.assertFalse("ørr" in self.__root)
+        self.assertTrue("abbor" in self.__root)
+        self.assertFalse("abborrrr" in self.__root)
+        self.assertTrue("bbor" in self.__root.child("a"))
+
+    def test_child_and_transitions(self):
+        root = self.__root
+        self.assertListEqual(root.transitions(), ["a", "ø"])
+        self.assertListEqual(root.consume("abb").transitions(), ["a", "o"])
+        self.assertListEqual(root.consume("abbor").transitions(), [])
+        self.assertIsNone(root.child("ab"))
+        self.assertIsNone(root.child(""))
+        self.assertIsNone(root.consume("abbor").child("\0"))
+        self.assertEqual(root.child("ø").child("r"), root.consume("ør"))
+
+    def test_dump_strings(self):
+        root = in3120.FrozenTrie.from_strings(["elle", "eller", "ELLEN", "hurra   FOR deg"], self.__normalizer, self.__tokenizer)
+        self.assertListEqual(list(root.strings()), ["elle", "ellen", "eller", "hurra for deg"])
+        self.assertListEqual(list(root.consume("el")), ["le", "len", "ler"])
+        self.assertListEqual(list(root.consume("eller").strings()), [""])
+
+    def test_with_meta_data(self):
+        root = in3120.FrozenTrie.from_strings2([("julaften", 2412), ("aleksander", 2104), ("nei", None), ("nei", None)], self.__normalizer, self.__tokenizer)
+        self.assertFalse(root.has_meta())
+        self.assertIsNone(root.consume("aleks").get_meta())
+        self.assertEqual(root.consume("aleksander").get_meta(), 2104)
+        self.assertEqual(root.consume("julaften").get_meta(), 2412)
+        self.assertTrue(root.consume("nei").is_final())
+        self.assertFalse(root.consume("nei").has_meta())
+        self.assertListEqual(list(root.strings2()), [("aleksander", 2104), ("julaften", 2412), ("nei", None)])
+        with self.assertRaises(AssertionError):
+            in3120.FrozenTrie.from_strings2([("abba", 74), ("ABBA", 99)], self.__normalizer, self.__tokenizer)
+
+    def test_many_final_nodes_with_meta_data(self):
+        strings = [f"{i:b}" for i in range(1000)]
+        root = in3120.FrozenTrie.from_strings2(((s, i) for i, s in enumerate(strings)), in3120.DummyNormalizer(), in3120.DummyTokenizer())
+        for i, string in enumerate(strings):
+            self.assertEqual(i, root.consume(string).get_meta())
+        self.assertListEqual(sorted(strings), [s for s, _ in root.strings2()])
+
+    def test_same_as_trie(self):
+        strings = [d["body"] for d in in3120.InMemoryCorpus("../data/mesh.txt")][:2000]
+        trie = in3120.Trie.from_strings2(((s, len(s)) for s in strings), self.__normalizer, self.__tokenizer)
+        for frozen in (in3120.FrozenTrie.from_trie(trie), in3120.FrozenTrie.from_strings2(((s, len(s)) for s in strings), self.__normalizer, self.__tokenizer)):
+            self.assertListEqual(list(trie.strings2()), list(frozen.strings2()))
+            for string in trie.strings():
+                for i in range(0, len(string) + 1, 3):
+                    node1, node2 = trie.consume(string[:i]), frozen.consume(string[:i])
+                    self.assertListEqual(node1.transitions(), node2.transitions())
+                    self.assertEqual(node1.is_final(), node2.is_final())
+                    self.assertEqual(node1.get_meta(), node2.get_meta())
+
+    def test_memory_usage(self):
+        strings = [d["body"] for d in in3120.InMemoryCorpus("../data/mesh.txt")][:5000]
+        tracemalloc.start()
+        snapshot_baseline = tracemalloc.take_snapshot()
+        trie = in3120.Trie.from_strings(strings, self.__normalizer, self.__tokenizer)
+        snapshot_trie = tracemalloc.take_snapshot()
+        frozen = in3120.FrozenTrie.from_trie(trie)
+        snapshot_frozen = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        filename = inspect.getfile(in3120.Trie)
+        size_trie = sum(s.size_diff for s in snapshot_trie.compare_to(snapshot_baseline, "filename") if s.traceback[0].filename == filename)
+        size_frozen = sum(s.size_diff for s in snapshot_frozen.compare_to(snapshot_trie, "filename") if s.traceback[0].filename == filename)
+        self.assertIsNotNone(frozen)
+        self.assertGreater(size_trie / size_frozen, 15)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
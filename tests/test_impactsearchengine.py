@@ -0,0 +1,96 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import math
+import unittest
+from context import in3120
+
+
+class TestImpactSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+
+    def __evaluate(self, engine, query, options, ranker):
+        return [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, ranker)]
+
+    def test_impacts(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"title": "the foo", "static_quality_score": 0.2}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"title": "the foo foo", "static_quality_score": 0.9}))
+        corpus.add_document(in3120.InMemoryDocument(2, {"title": "the bar"}))
+        corpus.add_document(in3120.InMemoryDocument(3, {"title": "the baz", "static_quality_score": ""}))
+        index = in3120.ImpactOrderedInvertedIndex(corpus, ["title"], self.__normalizer, self.__tokenizer, bits=8)
+        self.assertListEqual([0.9, 0.2, 0.0, 0.0], index.get_static_scores().tolist())
+        self.assertListEqual([1, 0, 2, 3], [index.get_document_id(i) for i in range(4)])
+        self.assertEqual(0, index.get_impact("the", 1))
+        self.assertEqual(0, index.get_impact("xxx", 1))
+        self.assertEqual(255, index.get_impact("bar", 1))
+        self.assertEqual(255, index.get_impact("baz", 1))
+        self.assertGreater(index.get_impact("foo", 2), index.get_impact("foo", 1))
+        self.assertAlmostEqual(math.log10(4), 255 * index.get_impact_scale())
+        self.assertAlmostEqual(math.log10(2) * (1 + math.log10(2)), index.get_impact("foo", 2) * index.get_impact_scale(), 2)
+        self.assertListEqual([(index.get_impact("foo", 2), [0]), (index.get_impact("foo", 1), [1])], [(i, o.tolist()) for i, o in index.get_impact_segments("foo")])
+        self.assertListEqual([(0, [0, 1, 2, 3])], [(i, o.tolist()) for i, o in index.get_impact_segments("the")])
+        self.assertListEqual([], index.get_impact_segments("xxx"))
+
+    def test_ranker(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"title": "the foo", "static_quality_score": 0.9}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"title": "the foo", "static_quality_score": 0.2}))
+        corpus.add_document(in3120.InMemoryDocument(2, {"title": "the foo foo", "static_quality_score": 0.2}))
+        corpus.add_document(in3120.InMemoryDocument(3, {"title": "the bar"}))
+        corpus.add_document(in3120.InMemoryDocument(4, {"title": "the baz"}))
+        corpus.add_document(in3120.InMemoryDocument(5, {"title": "the baz"}))
+        index = in3120.ImpactOrderedInvertedIndex(corpus, ["title"], self.__normalizer, self.__tokenizer)
+        ranker = in3120.ImpactRanker(corpus, index)
+        ordinals = {index.get_document_id(i): i for i in range(corpus.size())}
+
+        def score(document_id, term, term_frequency):
+            ranker.reset(ordinals[document_id])
+            ranker.update(term, 1, in3120.Posting(ordinals[document_id], term_frequency))
+            return ranker.evaluate()
+        self.assertGreater(score(2, "foo", 2), score(1, "foo", 1))
+        self.assertGreater(score(0, "foo", 1), score(1, "foo", 1))
+        self.assertGreater(score(3, "bar", 1), score(4, "baz", 1))
+        self.assertAlmostEqual(0.0, score(3, "the", 1))
+        ranker.reset(0)
+        with self.assertRaises(AssertionError):
+            ranker.update("foo", 1, in3120.Posting(42, 1))
+
+    def test_exhaustive_evaluation(self):
+        corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        index = in3120.ImpactOrderedInvertedIndex(corpus, ["title", "description"], self.__normalizer, self.__tokenizer)
+        ranker = in3120.ImpactRanker(corpus, index)
+        reference = in3120.WandSearchEngine(corpus, index)
+        engine = in3120.ImpactSearchEngine(corpus, index)
+        for query in ("love", "love love war", "the young man and the sea", "a story about a family of killers in los angeles", "xyzzy"):
+            for match_threshold in (0.1, 0.5, 1.0):
+                for hit_count in (1, 5, 50):
+                    options = {"match_threshold": match_threshold, "hit_count": hit_count}
+                    expected = self.__evaluate(reference, query, dict(options, pruning="none"), ranker)
+                    self.assertListEqual(expected, self.__evaluate(engine, query, options, ranker))
+                    self.assertListEqual(expected, self.__evaluate(engine, query, dict(options, postings_budget=len(corpus) * 100), ranker))
+
+    def test_early_termination(self):
+        corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        index = in3120.ImpactOrderedInvertedIndex(corpus, ["title", "description"], self.__normalizer, self.__tokenizer)
+        ranker = in3120.ImpactRanker(corpus, index)
+        engine = in3120.ImpactSearchEngine(corpus, index)
+        query = "a story about a family of killers in los angeles"
+        options = {"match_threshold": 0.1, "hit_count": 10}
+        exhaustive = self.__evaluate(engine, query, options, ranker)
+        self.assertListEqual([], self.__evaluate(engine, query, dict(options, postings_budget=0), ranker))
+        approximate = self.__evaluate(engine, query, dict(options, postings_budget=100), ranker)
+        self.assertEqual(10, len(approximate))
+        self.assertGreaterEqual(len({d for _, d in approximate} & {d for _, d in exhaustive}), 5)
+        self.assertEqual(exhaustive[0][1], approximate[0][1])
+        total = sum(len(o) for t in set(index.get_terms(query)) for _, o in index.get_impact_segments(t))
+        self.assertGreater(total, 100)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -30,6 +30,9 @@ class TestInMemoryInvertedIndexWithCompression(unittest.TestCase):
     def test_multiple_fields(self):
         self._tester.test_multiple_fields()
 
+    def test_statistics(self):
+        self._tester.test_statistics()
+
     def test_memory_usage(self):
         corpus = in3120.InMemoryCorpus("../data/cran.xml")
         tracemalloc.start()
@@ -45,6 +45,24 @@ class TestInMemoryInvertedIndexWithoutCompression(unittest.TestCase):
         self.assertEqual(len(list(index["hydrogen"])), 8)
         self.assertEqual(len(list(index["hydrocephalus"])), 2)
 
+    def test_get_terms_many(self):
+        corpus = in3120.InMemoryCorpus()
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed)
+        buffers = ["PRøvE wtf tesT", "", "!!", "ﾘﾝｸ Ç"]
+        self.assertListEqual(index.get_terms_many(buffers), [list(index.get_terms(buffer)) for buffer in buffers])
+        self.assertListEqual(in3120.AccessLoggedInvertedIndex(index).get_terms_many(iter(buffers)), index.get_terms_many(buffers))
+
+    def test_batched_indexing(self):
+        corpus = in3120.InMemoryCorpus()
+        for i in range(2500):
+            corpus.add_document(in3120.InMemoryDocument(i, {"title": f"Title {i % 7}", "body": f"body {i % 3} body"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["title", "body"], self._normalizer, self._tokenizer, self._compressed)
+        self.assertEqual(2500, index.get_document_frequency("body"))
+        self.assertEqual(5000, index.get_collection_frequency("body"))
+        self.assertListEqual([(p.document_id, p.term_frequency) for p in index["6"]][:3], [(6, 1), (13, 1), (20, 1)])
+        self.assertEqual(len(range(5, 2500, 7)), index.get_document_frequency("5"))
+        self.assertEqual(len(range(2, 2500, 3)), index.get_collection_frequency("2") - len(range(2, 2500, 7)))
+
     def test_multiple_fields(self):
         document = in3120.InMemoryDocument(0, {
             'felt1': 'Dette er en test. Test, sa jeg. TEST!',
@@ -58,6 +76,29 @@ class TestInMemoryInvertedIndexWithoutCompression(unittest.TestCase):
         self.assertEqual(posting.document_id, 0)
         self.assertEqual(posting.term_frequency, 5)
 
+    def test_statistics(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self._normalizer, self._tokenizer, self._compressed)
+        before = index.get_statistics()
+        self.assertDictEqual({"lookups": 0, "lists": 0, "postings": 0, "bytes": 0}, before)
+        self.assertEqual(8, len(list(index["hydrogen"])))
+        iterator = index["water"]
+        for _ in range(3):
+            next(iterator)
+        del iterator
+        self.assertListEqual([], list(index["xyzzy"]))
+        after = index.get_statistics()
+        self.assertEqual(3, after["lookups"])
+        self.assertEqual(2, after["lists"])
+        self.assertEqual(8 + 3, after["postings"])
+        if self._compressed:
+            self.assertGreaterEqual(after["bytes"], 2 * (8 + 3))
+        else:
+            self.assertEqual(0, after["bytes"])
+        accessed = in3120.AccessLoggedInvertedIndex(index)
+        self.assertEqual(2, len(list(accessed["hydrocephalus"])))
+        self.assertEqual(after["postings"] + 2, accessed.get_statistics()["postings"])
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
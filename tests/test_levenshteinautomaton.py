@@ -0,0 +1,92 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from context import in3120
+
+
+class TestLevenshteinAutomaton(unittest.TestCase):
+
+    def test_match(self):
+        automaton = in3120.LevenshteinAutomaton("elephant", 3)
+        self.assertEqual(0, automaton.match("elephant"))
+        self.assertEqual(1, automaton.match("elephnat"))
+        self.assertEqual(1, automaton.match("elepant"))
+        self.assertEqual(1, automaton.match("eelephant"))
+        self.assertEqual(3, automaton.match("relevant"))
+        self.assertEqual(4, automaton.match("bullfrog"))
+        self.assertEqual(4, automaton.match(""))
+        self.assertEqual(2, in3120.LevenshteinAutomaton("object", 2).match("inject"))
+        self.assertEqual(3, in3120.LevenshteinAutomaton("cat", 3).match("dog"))
+        self.assertEqual(0, in3120.LevenshteinAutomaton("", 0).match(""))
+        self.assertEqual(1, in3120.LevenshteinAutomaton("", 0).match("a"))
+
+    def test_transpositions(self):
+        self.assertEqual(1, in3120.LevenshteinAutomaton("abcd", 2).match("acbd"))
+        self.assertEqual(2, in3120.LevenshteinAutomaton("abcd", 2, False).match("acbd"))
+        self.assertEqual(3, in3120.LevenshteinAutomaton("ca", 3).match("abc"))
+
+    def test_same_as_dynamic_programming(self):
+        def distance(query, candidate):
+            table = [[i + j if i * j == 0 else 0 for j in range(len(candidate) + 1)] for i in range(len(query) + 1)]
+            for i in range(1, len(query) + 1):
+                for j in range(1, len(candidate) + 1):
+                    table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1, table[i - 1][j - 1] + (query[i - 1] != candidate[j - 1]))
+                    if i > 1 and j > 1 and query[i - 1] == candidate[j - 2] and query[i - 2] == candidate[j - 1]:
+                        table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+            return table[-1][-1]
+        strings = ["", "a", "ab", "ba", "abc", "bca", "cab", "abab", "baba", "aabbc", "cbaab", "abcabc", "bacbca"]
+        for upper_bound in (0, 1, 2, 3):
+            for query in strings:
+                automaton = in3120.LevenshteinAutomaton(query, upper_bound)
+                for candidate in strings:
+                    self.assertEqual(min(distance(query, candidate), upper_bound + 1), automaton.match(candidate), (query, candidate))
+
+    def test_states_are_memoized(self):
+        automaton = in3120.LevenshteinAutomaton("abc", 1)
+        state = automaton.step(automaton.get_start(), "x")
+        count = automaton.get_state_count()
+        self.assertEqual(state, automaton.step(automaton.get_start(), "y"))
+        self.assertEqual(count, automaton.get_state_count())
+        self.assertEqual(-1, automaton.step(automaton.step(state, "x"), "x"))
+        self.assertEqual(2, automaton.distance(automaton.step(automaton.get_start(), "a")))
+
+    def test_intersect(self):
+        normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+        strings = [("aleksander", 1), ("alexander", 2), ("aleksandra", 3), ("alexandra", 4), ("sander", 5), ("leksander", 6)]
+        trie = in3120.Trie.from_strings2(strings, normalizer, tokenizer)
+        for root in (trie, in3120.FrozenTrie.from_trie(trie), in3120.Dawg.from_trie(trie)):
+            automaton = in3120.LevenshteinAutomaton("aleksander", 1)
+            self.assertListEqual(list(automaton.intersect(root)), [(0, "aleksander", 1), (1, "leksander", 6)])
+            automaton = in3120.LevenshteinAutomaton("aleksander", 2)
+            self.assertListEqual([m for _, m, _ in automaton.intersect(root)], ["aleksander", "aleksandra", "alexander", "leksander"])
+            self.assertListEqual(list(in3120.LevenshteinAutomaton("ander", 2).intersect(root.consume("alex"))), [(0, "ander", 2), (2, "andra", 4)])
+
+    def test_intersect_same_as_brute_force(self):
+        normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+        strings = [d["body"] for d in in3120.InMemoryCorpus("../data/names.txt")]
+        root = in3120.FrozenTrie.from_strings(strings, normalizer, tokenizer)
+        candidates = list(root.strings())
+        for query in ("jon smiht", "ashley jones", "ana"):
+            for upper_bound in (1, 2, 3):
+                automaton = in3120.LevenshteinAutomaton(query, upper_bound)
+                expected = [(d, c) for d, c in ((in3120.LevenshteinAutomaton(query, upper_bound).match(c), c) for c in candidates) if d <= upper_bound]
+                self.assertListEqual([(d, c) for d, c, _ in automaton.intersect(root)], expected)
+
+    def test_search_is_best_first(self):
+        normalizer, tokenizer = in3120.SimpleNormalizer(), in3120.SimpleTokenizer()
+        root = in3120.FrozenTrie.from_strings((d["body"] for d in in3120.InMemoryCorpus("../data/names.txt")), normalizer, tokenizer)
+        for query in ("jon smiht", "ashley jones", "ana"):
+            for upper_bound in (1, 2, 3):
+                expected = list(in3120.LevenshteinAutomaton(query, upper_bound).intersect(root))
+                results = list(in3120.LevenshteinAutomaton(query, upper_bound).search(root))
+                self.assertListEqual([d for d, _, _ in results], sorted(d for d, _, _ in expected))
+                self.assertListEqual(sorted(results), sorted(expected))
+        results = in3120.LevenshteinAutomaton("", 0).search(in3120.Trie.from_strings(["a"], normalizer, tokenizer))
+        self.assertListEqual(list(results), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
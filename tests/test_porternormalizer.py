@@ -33,6 +33,19 @@ class TestPorterNormalizer(unittest.TestCase):
         self.assertEqual(self.__normalizer.normalize("a"), "a")
         self.assertEqual(self.__normalizer.normalize("aa"), "aa")
 
+    def test_normalize_tricky_inputs(self):
+        expected = {
+            "yyying": "yy", "sayyed": "sayi", "toying": "toy", "crying": "cri", "syzygy": "syzygi",
+            "happily": "happili", "generalizations": "gener", "rationally": "ration", "traditionalli": "tradit",
+            "hopping": "hop", "hoping": "hope", "falling": "fall", "fizzed": "fizz", "filed": "file",
+            "agreed": "agre", "ponies": "poni", "ties": "tie", "cries": "cri", "dies": "die",
+            "electricity": "electr", "electrical": "electr", "hopefulness": "hope", "adjustment": "adjust",
+            "adoption": "adopt", "archaeology": "archaeolog", "Naïve": "naïv", "cafés": "café",
+            "1990s": "1990", "x-rays": "x-ray",
+        }
+        for token, term in expected.items():
+            self.assertEqual(term, self.__normalizer.normalize(token), token)
+
     def test_normalize_textbook_example(self):
         buffer = """
         Such an analysis can reveal features that are not easily visible from
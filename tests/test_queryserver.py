@@ -0,0 +1,132 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import asyncio
+import json
+import os
+import time
+import unittest
+from context import in3120
+
+
+def evaluate(query):
+    if query.startswith("slow"):
+        time.sleep(0.5)
+    if query == "fail":
+        raise ValueError("failing on purpose")
+    if query == "crash":
+        os._exit(1)  # pylint: disable=protected-access
+    return [{"score": 1.0, "document": in3120.InMemoryDocument(0, {"body": query})}]
+
+
+async def request(reader, writer, target, keep_alive=True):
+    connection = "" if keep_alive else "Connection: close\r\n"
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n{connection}\r\n".encode())
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+    headers = {k.lower(): v.strip() for k, v in (line.split(":", 1) for line in head[1:] if ":" in line)}
+    body = await reader.readexactly(int(headers["content-length"]))
+    return int(head[0].split(" ")[1]), headers, body
+
+
+class TestQueryServer(unittest.TestCase):
+
+    def setUp(self):
+        self.__server = in3120.QueryServer(evaluate, processes=2, root=os.path.dirname(os.path.abspath(__file__)))
+
+    def tearDown(self):
+        self.__server.close()
+
+    def __run(self, scenario):
+        async def wrapper():
+            port = await self.__server.start("127.0.0.1", 0)
+            try:
+                await scenario(port)
+            finally:
+                await self.__server.stop()
+        asyncio.run(wrapper())
+
+    def test_keep_alive(self):
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for query in ("foo", "bar%20baz", "foo"):
+                status, headers, body = await request(reader, writer, f"/query?q={query}")
+                self.assertEqual(200, status)
+                self.assertEqual("application/json", headers["content-type"])
+                self.assertEqual("keep-alive", headers["connection"])
+                results = json.loads(body)
+                self.assertGreaterEqual(results["duration"], 0.0)
+                self.assertListEqual([{"score": 1.0, "document": {"document_id": 0, "fields": {"body": query.replace("%20", " ")}}}], results["matches"])
+            status, headers, _ = await request(reader, writer, "/query?q=foo", False)
+            self.assertEqual(200, status)
+            self.assertEqual("close", headers["connection"])
+            self.assertEqual(b"", await reader.read())
+            writer.close()
+        self.__run(scenario)
+        statistics = self.__server.get_statistics()
+        self.assertEqual(1, statistics["connections"])
+        self.assertEqual(4, statistics["requests"])
+
+    def test_coalescing(self):
+        async def client(port, query):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            _, _, body = await request(reader, writer, f"/query?q={query}", False)
+            writer.close()
+            return body
+
+        async def scenario(port):
+            bodies = await asyncio.gather(*(client(port, q) for q in ["slow"] * 5 + ["slower"] * 3))
+            self.assertEqual(1, len(set(bodies[:5])))
+            self.assertEqual(1, len(set(bodies[5:])))
+        start = time.perf_counter()
+        self.__run(scenario)
+        self.assertLess(time.perf_counter() - start, 2 * 0.5 + 0.4)
+        statistics = self.__server.get_statistics()
+        self.assertEqual(8, statistics["requests"])
+        self.assertEqual(2, statistics["evaluations"])
+        self.assertEqual(6, statistics["coalesced"])
+
+    def test_errors_and_static_files(self):
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, _, body = await request(reader, writer, "/query?q=fail")
+            self.assertEqual(500, status)
+            self.assertEqual("ValueError: failing on purpose", json.loads(body)["error"])
+            status, headers, body = await request(reader, writer, "/")
+            self.assertEqual(200, status)
+            self.assertEqual("text/html", headers["content-type"])
+            self.assertIn(b"AJAX REPL", body)
+            for target in ("/nonexistent.html", "/../README.md", "/%2e%2e/README.md"):
+                status, _, _ = await request(reader, writer, target)
+                self.assertEqual(404, status)
+            writer.write(b"POST /query HTTP/1.1\r\nContent-Length: 3\r\n\r\nabc")
+            await writer.drain()
+            self.assertTrue((await reader.readuntil(b"\r\n\r\n")).startswith(b"HTTP/1.1 405"))
+            await reader.readexactly(len(b"Method not allowed"))
+            status, _, body = await request(reader, writer, "/query?q=c%2B%2B%20%26%20x%23y")
+            self.assertEqual(200, status)
+            self.assertEqual("c++ & x#y", json.loads(body)["matches"][0]["document"]["fields"]["body"])
+            writer.write(b"GET /query?q=foo HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+            await writer.drain()
+            self.assertTrue((await reader.readuntil(b"\r\n\r\n")).startswith(b"HTTP/1.1 400"))
+            await reader.readexactly(len(b"Bad request"))
+            self.assertEqual(b"", await reader.read())
+            writer.close()
+        self.__run(scenario)
+
+    def test_broken_worker_pool(self):
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, headers, body = await request(reader, writer, "/query?q=crash")
+            self.assertEqual(500, status)
+            self.assertEqual("close", headers["connection"])
+            self.assertIn("BrokenProcessPool", json.loads(body)["error"])
+            self.assertEqual(b"", await reader.read())
+            writer.close()
+        self.__run(scenario)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
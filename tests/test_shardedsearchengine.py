@@ -0,0 +1,137 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import math
+import unittest
+from context import in3120
+
+
+class TfIdfRanker(in3120.Ranker):
+    """
+    A ranker that depends on collection-wide statistics, like BetterRanker does.
+    """
+
+    def __init__(self, corpus, inverted_index):
+        self.__corpus = corpus
+        self.__inverted_index = inverted_index
+        self.__document_id = None
+        self.__score = 0.0
+
+    def reset(self, document_id):
+        self.__document_id = document_id
+        self.__score = float(self.__corpus[document_id].get_field("static_quality_score", 0.0) or 0.0)
+
+    def update(self, term, multiplicity, posting):
+        assert self.__document_id == posting.document_id
+        idf = math.log10(self.__corpus.size() / self.__inverted_index.get_document_frequency(term))
+        self.__score += multiplicity * (1.0 + math.log10(posting.term_frequency)) * idf
+
+    def evaluate(self):
+        return self.__score
+
+
+class CollectionFrequencyRanker(in3120.Ranker):
+    """
+    A ranker that scores documents by the collection frequencies of the matching terms.
+    """
+
+    def __init__(self, corpus, inverted_index):
+        self.__inverted_index = inverted_index
+        self.__score = 0.0
+
+    def reset(self, document_id):
+        self.__score = 0.0
+
+    def update(self, term, multiplicity, posting):
+        self.__score += multiplicity * self.__inverted_index.get_collection_frequency(term)
+
+    def evaluate(self):
+        return self.__score
+
+
+class FailingRanker(CollectionFrequencyRanker):
+    """
+    A ranker that fails whenever the query contains a given term.
+    """
+
+    def update(self, term, multiplicity, posting):
+        if term == "war":
+            raise ValueError(term)
+        super().update(term, multiplicity, posting)
+
+
+class TestShardedSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+        self.__corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        self.__fields = ["title", "description"]
+        self.__queries = ("love", "love love war", "the young man and the sea", "a story about a family of killers in los angeles", "xyzzy", "")
+
+    def __compare(self, engine):
+        index = in3120.InMemoryInvertedIndex(self.__corpus, self.__fields, self.__normalizer, self.__tokenizer)
+        reference = in3120.WandSearchEngine(self.__corpus, index)
+        for query in self.__queries:
+            for match_threshold in (0.1, 0.5, 1.0):
+                for hit_count in (1, 5, 50):
+                    options = {"match_threshold": match_threshold, "hit_count": hit_count}
+                    expected = [(m["score"], m["document"].document_id) for m in reference.evaluate(query, options, TfIdfRanker(self.__corpus, index))]
+                    matches = [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options)]
+                    self.assertListEqual(expected, matches)
+
+    def test_in_process_shards(self):
+        for shards in (1, 3, 7):
+            with in3120.ShardedSearchEngine(self.__corpus, self.__fields, self.__normalizer, self.__tokenizer, TfIdfRanker, shards) as engine:
+                self.__compare(engine)
+
+    def test_worker_processes(self):
+        with in3120.ShardedSearchEngine(self.__corpus, self.__fields, self.__normalizer, self.__tokenizer, TfIdfRanker, 3, processes=True) as engine:
+            self.__compare(engine)
+
+    def test_ties_at_the_cut(self):
+        corpus = in3120.InMemoryCorpus()
+        for document_id in range(16):
+            corpus.add_document(in3120.InMemoryDocument(document_id, {"a": "foo foo" if document_id == 7 else "foo" if document_id < 12 else "bar"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["a"], self.__normalizer, self.__tokenizer)
+        reference = in3120.WandSearchEngine(corpus, index)
+        for pruning in ("none", "wand", "bmw"):
+            options = {"hit_count": 3, "pruning": pruning}
+            expected = [m["document"].document_id for m in reference.evaluate("foo", options, TfIdfRanker(corpus, index))]
+            self.assertListEqual([7, 1, 0], expected)
+            for shards in (1, 3, 4):
+                with in3120.ShardedSearchEngine(corpus, ["a"], self.__normalizer, self.__tokenizer, TfIdfRanker, shards) as engine:
+                    self.assertListEqual(expected, [m["document"].document_id for m in engine.evaluate("foo", options)])
+
+    def test_collection_frequencies(self):
+        index = in3120.InMemoryInvertedIndex(self.__corpus, self.__fields, self.__normalizer, self.__tokenizer)
+        reference = in3120.WandSearchEngine(self.__corpus, index)
+        with in3120.ShardedSearchEngine(self.__corpus, self.__fields, self.__normalizer, self.__tokenizer, CollectionFrequencyRanker, 3) as engine:
+            for query in self.__queries:
+                options = {"match_threshold": 0.5, "hit_count": 5, "pruning": "none"}
+                expected = [(m["score"], m["document"].document_id) for m in reference.evaluate(query, options, CollectionFrequencyRanker(self.__corpus, index))]
+                self.assertListEqual(expected, [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options)])
+
+    def test_failing_shards(self):
+        for processes in (False, True):
+            with in3120.ShardedSearchEngine(self.__corpus, self.__fields, self.__normalizer, self.__tokenizer, FailingRanker, 3, processes=processes) as engine:
+                with self.assertRaises(ValueError):
+                    list(engine.evaluate("war", {}))
+                self.assertGreater(len(list(engine.evaluate("love", {}))), 0)
+
+    def test_more_shards_than_documents(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"a": "foo bar"}))
+        corpus.add_document(in3120.InMemoryDocument(1, {"a": "foo"}))
+        with in3120.ShardedSearchEngine(corpus, ["a"], self.__normalizer, self.__tokenizer, TfIdfRanker, 5) as engine:
+            matches = [(m["score"], m["document"].document_id) for m in engine.evaluate("bar foo", {"match_threshold": 0.1})]
+            self.assertListEqual([(math.log10(2), 0), (0.0, 1)], matches)
+            statistics = engine.get_statistics()
+            self.assertEqual(3, statistics["lists"])
+            self.assertEqual(3, statistics["postings"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -4,7 +4,8 @@
 # pylint: disable=line-too-long
 
 import unittest
-from random import sample
+from random import sample, choices
+import numpy as np
 from context import in3120
 
 
@@ -29,6 +30,69 @@ class TestSieve(unittest.TestCase):
         sieve.sift2((i, i + 0.5) for i in sample(range(11), k=11))
         self.assertListEqual(list(sieve.winners()), [(10, 10.5), (9, 9.5), (8, 8.5)])
 
+    def test_sifting_array(self):
+        for size in (1, 3, 7, 50):
+            for _ in range(50):
+                sieve1 = in3120.Sieve(size)
+                sieve2 = in3120.Sieve(size)
+                for offset in range(0, 40, 10):
+                    scores = choices([0.0, 1.0, 1.5, 2.0, 3.0], k=10)
+                    items = [offset + i for i in sample(range(10), k=10)]
+                    sieve1.sift2(zip(scores, items))
+                    sieve2.sift_array(np.array(scores), items)
+                    self.assertListEqual(list(sieve1.winners()), list(sieve2.winners()))
+        sieve = in3120.Sieve(3)
+        sieve.sift_array(np.array([5, 1, 4, 2, 3]), np.array([50, 10, 40, 20, 30]))
+        sieve.sift_array(np.array([]), [])
+        self.assertListEqual(list(sieve.winners()), [(5, 50), (4, 40), (3, 30)])
+
+    def test_winners_idempotent(self):
+        sieve = in3120.Sieve(3)
+        sieve.sift2((i, i + 0.5) for i in sample(range(11), k=11))
+        self.assertListEqual(list(sieve.winners()), [(10, 10.5), (9, 9.5), (8, 8.5)])
+        self.assertListEqual(list(sieve.winners()), [(10, 10.5), (9, 9.5), (8, 8.5)])
+        sieve.sift(9.2, "foo")
+        self.assertListEqual(list(sieve.winners()), [(10, 10.5), (9.2, "foo"), (9, 9.5)])
+
+    def test_merge(self):
+        for _ in range(100):
+            pairs = [(score, i) for i, score in enumerate(choices(range(20), k=60))]
+            sieves = [in3120.Sieve(5) for _ in range(3)]
+            for i, pair in enumerate(pairs):
+                sieves[i // 20].sift(*pair)
+            reference = in3120.Sieve(5)
+            reference.sift2(pairs)
+            sieves[0].merge(sieves[1])
+            sieves[0].merge(sieves[2])
+            self.assertListEqual(list(reference.winners()), list(sieves[0].winners()))
+            self.assertEqual(5, len(list(sieves[1].winners())))
+        sieve1 = in3120.Sieve(2)
+        sieve1.sift(1.0, "a")
+        sieve2 = in3120.Sieve(2)
+        sieve2.merge(sieve1)
+        sieve2.merge(in3120.Sieve(7))
+        self.assertListEqual(list(sieve2.winners()), [(1.0, "a")])
+
+    def test_ties_favor_first_arrivals(self):
+        sieve = in3120.Sieve(2)
+        sieve.sift2([(1, 0), (1, 1), (1, 2), (5, 3)])
+        self.assertListEqual(list(sieve.winners()), [(5, 3), (1, 0)])
+        sieve = in3120.Sieve(3)
+        sieve.sift_array(np.array([2, 1, 1]), [10, 11, 12])
+        sieve.sift_array(np.array([1, 3, 1]), [13, 14, 15])
+        self.assertListEqual(list(sieve.winners()), [(3, 14), (2, 10), (1, 11)])
+        first, second = in3120.Sieve(2), in3120.Sieve(2)
+        first.sift2([(1, "b"), (0, "x")])
+        second.sift2([(1, "a"), (1, "c"), (2, "d")])
+        first.merge(second)
+        self.assertListEqual(list(first.winners()), [(2, "d"), (1, "b")])
+        third = in3120.Sieve(2)
+        third.sift(1, "e")
+        second.merge(third)
+        self.assertListEqual(list(second.winners()), [(2, "d"), (1, "a")])
+        third.merge(second)
+        self.assertListEqual(list(third.winners()), [(2, "d"), (1, "e")])
+
     def test_invalid_size(self):
         for i in [-1, 0]:
             with self.assertRaises(AssertionError):
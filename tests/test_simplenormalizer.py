@@ -24,9 +24,19 @@ class TestSimpleNormalizer(unittest.TestCase):
         self.assertEqual(self.__normalizer.canonicalize("\u00C7"), "\u00C7")
         self.assertEqual(self.__normalizer.canonicalize("\u0043\u0327"), "\u00C7")
 
+    def test_canonicalize_already_canonical(self):
+        for buffer in ["Dette ER en\nprøve!", "Dette ER en\nprØve!", "リンク", ""]:
+            self.assertIs(buffer, self.__normalizer.canonicalize(buffer))
+
     def test_normalize(self):
         self.assertEqual(self.__normalizer.normalize("grÅFustaSJE"), "gråfustasje")
 
+    def test_normalize_many(self):
+        tokens = ["grÅFustaSJE", "ΟΔΟΣ", "Straße", "a\0B", ""]
+        self.assertListEqual(self.__normalizer.normalize_many(tokens), [self.__normalizer.normalize(token) for token in tokens])
+        self.assertListEqual(self.__normalizer.normalize_many(iter(tokens)), [self.__normalizer.normalize(token) for token in tokens])
+        self.assertListEqual(self.__normalizer.normalize_many([]), [])
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -3,6 +3,7 @@
 # pylint: disable=missing-function-docstring
 
 import unittest
+import numpy as np
 from context import in3120
 
 
@@ -21,6 +22,13 @@ class TestSimpleRanker(unittest.TestCase):
         self.__ranker.update("baz", 2, in3120.Posting(42, 2))
         self.assertEqual(self.__ranker.evaluate(), 5)
 
+    def test_score_block(self):
+        terms = [("foo", 2), ("bar", 1), ("baz", 2)]
+        document_ids = np.array([21, 42])
+        term_frequencies = np.array([[4, 1], [3, 0], [0, 2]])
+        self.assertListEqual(self.__ranker.score_block(terms, document_ids, term_frequencies).tolist(), [11.0, 6.0])
+        self.assertListEqual(self.__ranker.score_block(terms, document_ids[:0], term_frequencies[:, :0]).tolist(), [])
+
     def test_document_id_mismatch(self):
         self.__ranker.reset(21)
         with self.assertRaises(AssertionError):
@@ -25,12 +25,23 @@ class TestSimpleTokenizer(unittest.TestCase):
         result = list(self.__tokenizer.spans("Dette  er en\nprøve!"))
         self.assertListEqual(result, [(0, 5), (7, 9), (10, 12), (13, 18)])
 
+    def test_offsets(self):
+        result = self.__tokenizer.offsets("Dette  er en\nprøve!")
+        self.assertListEqual(result.tolist(), [0, 5, 7, 9, 10, 12, 13, 18])
+        self.assertEqual(0, len(self.__tokenizer.offsets("!?")))
+
     def test_join(self):
         tokens = list(self.__tokenizer.tokens("Dette  er en\nprøve"))
         tokens.extend([("!", (18, 19)), ("?", (19, 20))])
         result = self.__tokenizer.join(tokens)
         self.assertEqual(result, "Dette er en prøve!?")
 
+    def test_tokenize_many(self):
+        buffers = ["Dette  er en\nprøve!", "", "!?", "foo bar"]
+        result = self.__tokenizer.tokenize_many(buffers)
+        self.assertListEqual(result, [list(self.__tokenizer.strings(buffer)) for buffer in buffers])
+        self.assertListEqual(self.__tokenizer.tokenize_many(b for b in buffers), result)
+
     def test_empty_input(self):
         self.assertListEqual(list(self.__tokenizer.strings("")), [])
         self.assertListEqual(list(self.__tokenizer.tokens("")), [])
@@ -0,0 +1,67 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from itertools import product, combinations_with_replacement
+from context import in3120
+
+
+class TestTermAtATimeSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+
+    def __evaluate(self, engine, query, options, ranker):
+        return [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, ranker)]
+
+    def __compare(self, corpus, index, queries):
+        reference = in3120.WandSearchEngine(corpus, index)
+        engine = in3120.TermAtATimeSearchEngine(corpus, index)
+        for query in queries:
+            for match_threshold in (0.1, 0.5, 0.7, 1.0):
+                for hit_count in (1, 7, 100):
+                    options = {"match_threshold": match_threshold, "hit_count": hit_count}
+                    expected = self.__evaluate(reference, query, dict(options, pruning="none"), in3120.SimpleRanker())
+                    self.assertListEqual(expected, self.__evaluate(engine, query, options, in3120.SimpleRanker()))
+
+    def test_synthetic_corpus(self):
+        corpus = in3120.InMemoryCorpus()
+        words = ("".join(term) for term in product("bcd", "aei", "jkl"))
+        texts = (" ".join(word) for word in combinations_with_replacement(words, 3))
+        for text in texts:
+            corpus.add_document(in3120.InMemoryDocument(corpus.size(), {"a": text}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["a"], self.__normalizer, self.__tokenizer)
+        self.__compare(corpus, index, ("baj BAJ    baj", "baj caj", "baj caj daj", "baj cek dil", "baj xxx yyy", "dil dil cek bej"))
+
+    def test_long_queries(self):
+        corpus = in3120.InMemoryCorpus("../data/en.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self.__normalizer, self.__tokenizer)
+        words = "the president of the united states says that the war in iraq is over and a tiger escaped from the safari park".split()
+        self.__compare(corpus, index, (" ".join(words[:length]) for length in (1, 2, 4, 8, 16, len(words))))
+
+    def test_scalar_ranker_fallback(self):
+        class ScalarRanker(in3120.SimpleRanker):
+            def score_term(self, term, multiplicity, document_ids, term_frequencies):
+                return in3120.Ranker.score_term(self, term, multiplicity, document_ids, term_frequencies)
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self.__normalizer, self.__tokenizer)
+        engine = in3120.TermAtATimeSearchEngine(corpus, index)
+        options = {"match_threshold": 0.5, "hit_count": 3}
+        expected = self.__evaluate(engine, "water pollution", options, in3120.SimpleRanker())
+        self.assertListEqual(expected, self.__evaluate(engine, "water pollution", options, ScalarRanker()))
+        self.assertListEqual([(2, 25276), (2, 25275), (2, 25274)], expected)
+
+    def test_empty_query(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"a": "foo bar"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["a"], self.__normalizer, self.__tokenizer)
+        engine = in3120.TermAtATimeSearchEngine(corpus, index)
+        self.assertListEqual([], list(engine.evaluate("", {}, in3120.SimpleRanker())))
+        self.assertListEqual([], list(engine.evaluate("baz", {}, in3120.SimpleRanker())))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
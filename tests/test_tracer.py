@@ -0,0 +1,95 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import json
+import unittest
+from context import in3120
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_histograms_and_percentiles(self):
+        tracer = in3120.Tracer()
+        for duration in [0.001] * 98 + [0.1, 0.2]:
+            tracer.record("x", duration)
+        histogram = tracer.get_histogram("x")
+        self.assertEqual(3, len(histogram))
+        self.assertEqual(100, sum(count for _, count in histogram))
+        self.assertListEqual(sorted(histogram), histogram)
+        for upper_bound, duration in zip((u for u, _ in histogram), (0.001, 0.1, 0.2)):
+            self.assertLessEqual(duration, upper_bound)
+            self.assertLess(upper_bound, 1.25 * duration)
+        self.assertAlmostEqual(0.001, tracer.get_percentile("x", 0.5), delta=0.00025)
+        self.assertAlmostEqual(0.1, tracer.get_percentile("x", 0.99), delta=0.025)
+        self.assertEqual(0.2, tracer.get_percentile("x", 1.0))
+        self.assertEqual(0.0, tracer.get_percentile("y", 0.5))
+        summary = tracer.to_dict()["spans"]["x"]
+        self.assertEqual(100, summary["count"])
+        self.assertEqual(0.001, summary["min"])
+        self.assertEqual(0.2, summary["max"])
+        self.assertAlmostEqual(0.398, summary["total"])
+
+    def test_spans_iterators_and_counters(self):
+        tracer = in3120.Tracer()
+        for _ in range(3):
+            with tracer.span("a"):
+                tracer.count("b")
+        tracer.count("b", 2)
+        self.assertListEqual([1, 2, 3], list(tracer.iterate("c", [1, 2, 3])))
+        with self.assertRaises(ValueError):
+            with tracer.span("d"):
+                raise ValueError()
+        summary = tracer.to_dict()
+        self.assertDictEqual({"b": 5}, summary["counters"])
+        self.assertListEqual(["a", "c", "d"], sorted(summary["spans"].keys()))
+        self.assertEqual(3, summary["spans"]["a"]["count"])
+        self.assertEqual(1, summary["spans"]["c"]["count"])
+        self.assertEqual(1, summary["spans"]["d"]["count"])
+        json.dumps(summary)
+        tracer.reset()
+        self.assertDictEqual({"spans": {}, "counters": {}}, tracer.to_dict())
+
+    def test_null_tracer(self):
+        for tracer in (in3120.NullTracer(), in3120.NULL_TRACER):
+            self.assertDictEqual({}, vars(tracer))
+            with tracer.span("a"):
+                tracer.count("b")
+            tracer.record("c", 1.0)
+            self.assertListEqual([1, 2], list(tracer.iterate("d", [1, 2])))
+            self.assertDictEqual({"spans": {}, "counters": {}}, tracer.to_dict())
+            self.assertEqual(0.0, tracer.get_percentile("c", 0.5))
+            tracer.reset()
+
+    def test_boolean_search_engine(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+        engine = in3120.BooleanSearchEngine(corpus, index)
+        tracer = in3120.Tracer()
+        for _ in range(2):
+            untraced = list(engine.evaluate("OR(water, pollution)", {"hit_count": 5}))
+            traced = list(engine.evaluate("OR(water, pollution)", {"hit_count": 5, "tracer": tracer}))
+            self.assertListEqual(untraced, traced)
+        summary = tracer.to_dict()
+        self.assertDictEqual({"matches": 10}, summary["counters"])
+        for name in ("parse", "normalize", "plan", "fetch", "merge"):
+            self.assertEqual(2, summary["spans"][name]["count"])
+
+    def test_term_at_a_time_search_engine(self):
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], in3120.SimpleNormalizer(), in3120.SimpleTokenizer())
+        engine = in3120.TermAtATimeSearchEngine(corpus, index)
+        tracer = in3120.Tracer()
+        options = {"match_threshold": 0.5, "hit_count": 3}
+        untraced = list(engine.evaluate("water pollution", options, in3120.SimpleRanker()))
+        traced = list(engine.evaluate("water pollution", dict(options, tracer=tracer), in3120.SimpleRanker()))
+        self.assertListEqual(untraced, traced)
+        counters = tracer.get_counters()
+        self.assertEqual(index.get_document_frequency("water") + index.get_document_frequency("pollution"), counters["postings"])
+        self.assertEqual(3, counters["matches"])
+        self.assertListEqual(["normalize", "rank", "top-k"], sorted(tracer.to_dict()["spans"].keys()))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
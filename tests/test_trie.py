@@ -79,6 +79,7 @@ class TestTrie(unittest.TestCase):
         self.assertTrue(root.consume("nei").is_final())
         self.assertFalse(root.consume("nei").has_meta())
         self.assertIsNone(root.consume("nei").get_meta())
+        self.assertListEqual(list(root.strings2()), [("aleksander", 2104), ("julaften", 2412), ("nei", None)])
 
     def test_add_is_idempotent_unless_meta_data_differs(self):
         root = in3120.Trie.from_strings2([("abba", 74), ("abba", 74)], self.__normalizer, self.__tokenizer)
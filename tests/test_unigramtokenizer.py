@@ -23,6 +23,14 @@ class TestUnigramTokenizer(unittest.TestCase):
         result = list(self.__tokenizer.spans("A🩷E"))
         self.assertListEqual(result, [(0, 1), (1, 2), (2, 3)])
 
+    def test_offsets(self):
+        self.assertListEqual(self.__tokenizer.offsets("A🩷E").tolist(), [0, 1, 1, 2, 2, 3])
+        self.assertEqual(0, len(self.__tokenizer.offsets("")))
+
+    def test_tokenize_many(self):
+        buffers = ["A🩷E", "", "foo"]
+        self.assertListEqual(self.__tokenizer.tokenize_many(buffers), [list(self.__tokenizer.strings(buffer)) for buffer in buffers])
+
     def test_empty_input(self):
         self.assertListEqual(list(self.__tokenizer.strings("")), [])
         self.assertListEqual(list(self.__tokenizer.tokens("")), [])
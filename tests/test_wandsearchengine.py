@@ -0,0 +1,128 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+
+import unittest
+from itertools import product, combinations_with_replacement
+from context import in3120
+
+
+class CountingRanker(in3120.SimpleRanker):
+
+    def __init__(self):
+        super().__init__()
+        self.updates = 0
+
+    def update(self, term, multiplicity, posting):
+        self.updates += 1
+        super().update(term, multiplicity, posting)
+
+    def score_block(self, terms, document_ids, term_frequencies):
+        self.updates += int((term_frequencies > 0).sum())
+        return super().score_block(terms, document_ids, term_frequencies)
+
+
+class TestWandSearchEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.__normalizer = in3120.SimpleNormalizer()
+        self.__tokenizer = in3120.SimpleTokenizer()
+
+    def __evaluate(self, engine, query, options):
+        ranker = CountingRanker()
+        matches = [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, ranker)]
+        return matches, ranker.updates
+
+    def __brute_force(self, corpus, index, query, match_threshold, hit_count):
+        multiplicities = {}
+        for term in index.get_terms(query):
+            multiplicities[term] = multiplicities.get(term, 0) + 1
+        n = max(1, min(len(multiplicities), int(match_threshold * len(multiplicities))))
+        scores = []
+        for document in corpus:
+            frequencies = {}
+            for term in index.get_terms(document["a"]):
+                frequencies[term] = frequencies.get(term, 0) + 1
+            present = [t for t in multiplicities if t in frequencies]
+            if len(present) >= n:
+                scores.append(sum(multiplicities[t] * frequencies[t] for t in present))
+        return sorted(scores, reverse=True)[:hit_count]
+
+    def test_synthetic_corpus(self):
+        corpus = in3120.InMemoryCorpus()
+        words = ("".join(term) for term in product("bcd", "aei", "jkl"))
+        texts = (" ".join(word) for word in combinations_with_replacement(words, 3))
+        for text in texts:
+            corpus.add_document(in3120.InMemoryDocument(corpus.size(), {"a": text}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["a"], self.__normalizer, self.__tokenizer)
+        engine = in3120.WandSearchEngine(corpus, index)
+        for query in ("baj BAJ    baj", "baj caj", "baj caj daj", "baj cek dil", "baj xxx yyy", "dil dil cek bej"):
+            for match_threshold in (0.1, 0.5, 0.7, 1.0):
+                for hit_count in (1, 7, 100):
+                    options = {"match_threshold": match_threshold, "hit_count": hit_count}
+                    expected = self.__brute_force(corpus, index, query, match_threshold, hit_count)
+                    reference, _ = self.__evaluate(engine, query, dict(options, pruning="none"))
+                    self.assertListEqual(expected, [score for score, _ in reference])
+                    for pruning in ("wand", "bmw"):
+                        matches, _ = self.__evaluate(engine, query, dict(options, pruning=pruning))
+                        self.assertListEqual(reference, matches)
+
+    def test_fewer_postings_scored(self):
+        corpus = in3120.InMemoryCorpus("../data/en.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self.__normalizer, self.__tokenizer)
+        engine = in3120.WandSearchEngine(corpus, index)
+        for query in ("the president of the united states", "obama says the war in iraq is over", "a tiger in a safari park"):
+            options = {"match_threshold": 0.1, "hit_count": 10}
+            reference, scored1 = self.__evaluate(engine, query, dict(options, pruning="none"))
+            matches, scored2 = self.__evaluate(engine, query, dict(options, pruning="wand"))
+            self.assertListEqual(reference, matches)
+            matches, scored3 = self.__evaluate(engine, query, dict(options, pruning="bmw"))
+            self.assertListEqual(reference, matches)
+            self.assertGreater(scored1, scored2)
+            self.assertGreaterEqual(scored2, scored3)
+            self.assertGreater(scored1, 2 * scored3)
+
+    def test_ranker_without_upper_bounds(self):
+        class UnboundedRanker(CountingRanker):
+            def get_upper_bound(self, term, multiplicity, term_frequency):
+                return None
+        corpus = in3120.InMemoryCorpus("../data/mesh.txt")
+        index = in3120.InMemoryInvertedIndex(corpus, ["body"], self.__normalizer, self.__tokenizer)
+        engine = in3120.WandSearchEngine(corpus, index)
+        options = {"match_threshold": 0.5, "hit_count": 3}
+        expected = [(2, 25274), (2, 25275), (2, 25276)]
+        for pruning in ("none", "wand", "bmw"):
+            ranker = UnboundedRanker()
+            matches = [(m["score"], m["document"].document_id) for m in engine.evaluate("water pollution", dict(options, pruning=pruning), ranker)]
+            self.assertListEqual(expected, sorted(matches))
+            self.assertEqual(ranker.updates, 2 * 3 + (index.get_document_frequency("water") + index.get_document_frequency("pollution") - 2 * 3))
+
+    def test_block_scoring(self):
+        class ScalarRanker(in3120.SimpleRanker):
+            def score_block(self, terms, document_ids, term_frequencies):
+                return None
+        corpus = in3120.InMemoryCorpus("../data/imdb.csv")
+        index = in3120.ImpactOrderedInvertedIndex(corpus, ["title", "description"], self.__normalizer, self.__tokenizer)
+        engine = in3120.WandSearchEngine(corpus, index)
+        for query in ("love love war", "the young man and the sea", "a story about a family of killers in los angeles"):
+            for hit_count in (1, 10, 1000):
+                options = {"match_threshold": 0.1, "hit_count": hit_count, "pruning": "none"}
+                expected = [(m["score"], m["document"].document_id) for m in engine.evaluate(query, dict(options, pruning="wand"), in3120.SimpleRanker())]
+                self.assertListEqual(expected, [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, in3120.SimpleRanker())])
+                self.assertListEqual(expected, [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, ScalarRanker())])
+                ranker = in3120.ImpactRanker(corpus, index)
+                expected = [(m["score"], m["document"].document_id) for m in in3120.ImpactSearchEngine(corpus, index).evaluate(query, options, ranker)]
+                self.assertListEqual(expected, [(m["score"], m["document"].document_id) for m in engine.evaluate(query, options, ranker)])
+
+    def test_empty_query(self):
+        corpus = in3120.InMemoryCorpus()
+        corpus.add_document(in3120.InMemoryDocument(0, {"a": "foo bar"}))
+        index = in3120.InMemoryInvertedIndex(corpus, ["a"], self.__normalizer, self.__tokenizer)
+        engine = in3120.WandSearchEngine(corpus, index)
+        self.assertListEqual([], list(engine.evaluate("", {}, in3120.SimpleRanker())))
+        self.assertListEqual([], list(engine.evaluate("baz", {}, in3120.SimpleRanker())))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
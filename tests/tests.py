@@ -26,11 +26,19 @@ from test_simplesearchengine import TestSimpleSearchEngine
 from test_stringfinder import TestStringFinder
 from test_suffixarray import TestSuffixArray
 from test_trie import TestTrie
+from test_frozentrie import TestFrozenTrie
+from test_dawg import TestDawg
+from test_ahocorasickfinder import TestAhoCorasickFinder
+from test_corpusscanner import TestCorpusScanner
+from test_levenshteinautomaton import TestLevenshteinAutomaton
+from test_deletionindex import TestDeletionIndex
 from test_variablebytecodec import TestVariableByteCodec
 from test_soundexnormalizer import TestSoundexNormalizer
 from test_porternormalizer import TestPorterNormalizer
+from test_cachingnormalizer import TestCachingNormalizer
 from test_similaritysearchengine import TestSimilaritySearchEngine
 from test_edittable import TestEditTable
+from test_bitparalleledittable import TestBitParallelEditTable
 from test_editsearchengine import TestEditSearchEngine
 from test_booleansearchengine import TestBooleanSearchEngine
 from test_wildcardexpander import TestWildcardExpander
@@ -47,3 +55,10 @@ from test_unigramtokenizer import TestUnigramTokenizer
 from test_binarylogisticregressionclassifier import TestBinaryLogisticRegressionClassifier
 from test_evaluationmetrics import TestEvaluationMetrics
 from test_pagerank import TestPageRank
+from test_wandsearchengine import TestWandSearchEngine
+from test_termatatimesearchengine import TestTermAtATimeSearchEngine
+from test_impactsearchengine import TestImpactSearchEngine
+from test_shardedsearchengine import TestShardedSearchEngine
+from test_queryserver import TestQueryServer
+from test_tracer import TestTracer
+from test_corpusgenerator import TestCorpusGenerator